@@ -1,6 +1,7 @@
 """Celery application configuration and factory."""
 
 from celery import Celery
+from celery.signals import worker_process_init
 
 from app.config import get_settings
 
@@ -12,7 +13,7 @@ def create_celery_app() -> Celery:
         "product_importer",
         broker=settings.celery_broker_url,
         backend=settings.celery_result_backend,
-        include=["app.tasks.importer", "app.tasks.webhook_sender"],
+        include=["app.tasks.importer", "app.tasks.bulk_delete", "app.tasks.webhook_sender"],
     )
     celery.conf.update(
         task_serializer="json",
@@ -20,8 +21,22 @@ def create_celery_app() -> Celery:
         accept_content=["json"],
         task_track_started=True,
         task_time_limit=60 * 60,  # 1 hour safety cap
+        # Late-acked imports are redelivered after this long unacknowledged;
+        # keep it above the time limit so running tasks are not duplicated.
+        broker_transport_options={"visibility_timeout": 2 * 60 * 60},
+        beat_schedule={
+            "prune-webhook-deliveries": {"task": "app.tasks.prune_webhook_deliveries", "schedule": 60 * 60},
+        },
     )
     return celery
 
 
 celery_app = create_celery_app()
+
+
+@worker_process_init.connect
+def _reset_db_pool(**_) -> None:
+    """Give each forked worker process its own pool instead of connections inherited from the parent."""
+    from app.database import engine
+
+    engine.dispose(close=False)
@@ -1,16 +1,51 @@
 """Application configuration using environment variables."""
 
 from functools import lru_cache
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+ImportMode = Literal["batch", "copy", "parallel"]
+
+
 class Settings(BaseSettings):
     app_name: str = "Product Importer"
     database_url: str = "postgresql+psycopg2://app:app@db:5432/product_importer"
+    async_database_url: str = ""  # API routes; empty derives it from database_url (asyncpg/aiosqlite)
     celery_broker_url: str = "redis://redis:6379/0"
     celery_result_backend: str = "redis://redis:6379/1"
+    db_pool_size: int = 10  # persistent connections per process
+    db_max_overflow: int = 20  # extra connections opened under load, closed when returned
+    db_pool_timeout_seconds: float = 30.0  # wait for a free connection before failing
+    db_pool_recycle_seconds: int = 30 * 60  # replace connections older than this
+    db_pool_pre_ping: bool = True  # test connections on checkout, dropping dead ones
+    db_statement_timeout_ms: int = 0  # Postgres statement_timeout; 0 disables
+    db_null_pool: bool = False  # no app-side pooling, for pgbouncer transaction pooling
+    redis_url: str = "redis://redis:6379/2"  # progress store/pub/sub, breaker; empty keeps them in-process
     temp_upload_dir: str = "./tmp/uploads"
+    upload_part_size_bytes: int = 8 * 1024 * 1024  # chunked upload sessions
+    upload_max_bytes: int = 2 * 1024 * 1024 * 1024
     webhook_timeout_seconds: int = 10
+    webhook_batch_size: int = 1000  # items per event payload
+    webhook_subscription_ttl_seconds: float = 30.0
+    webhook_max_connections: int = 100  # pooled connections per worker process
+    webhook_per_host_concurrency: int = 10  # in-flight requests per destination host
+    webhook_deliveries_per_task: int = 100
+    webhook_max_attempts: int = 5
+    webhook_retry_base_seconds: float = 2.0  # backoff: base * 2^(attempt-1), jittered
+    webhook_retry_max_seconds: float = 300.0
+    webhook_breaker_threshold: int = 5  # consecutive failures before the circuit opens
+    webhook_breaker_cooldown_seconds: float = 60.0
+    webhook_delivery_retention_days: int = 7  # pruned hourly by celery beat
+    import_mode: ImportMode = "batch"  # copy/parallel: Postgres only
+    import_shards: int = 4
+    progress_ttl_seconds: int = 24 * 60 * 60  # lifetime of an import's progress record in Redis
+    progress_update_interval_seconds: float = 0.5  # min gap between stored/published progress updates
+    progress_stream_poll_seconds: float = 1.0  # stream refresh without pub/sub
+    progress_stream_heartbeat_seconds: float = 15.0
+    product_cache_ttl_seconds: float = 30.0  # cached GET /products pages; 0 disables (ETags still apply)
+    product_cache_max_entries: int = 1024  # in-process LRU size per API process
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", case_sensitive=False, extra="allow")
 
@@ -1,22 +1,182 @@
 """Database session and Base configuration."""
 
-from sqlalchemy import create_engine
+import time
+from threading import Lock
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool
 
-from app.config import get_settings
+from app.config import Settings, get_settings
 
 settings = get_settings()
 
-engine = create_engine(settings.database_url, future=True)
+
+class PoolStats:
+    """Connection pool counters of one engine in this process, exposed by ``GET /metrics``."""
+
+    COUNTERS = ("checkouts", "checkins", "connects", "waits", "wait_seconds", "timeouts", "invalidations")
+
+    def __init__(self):
+        self._lock = Lock()
+        self.values: Dict[str, float] = dict.fromkeys(self.COUNTERS, 0)
+
+    def add(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self.values[name] += amount
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self.values)
+
+
+pool_stats = PoolStats()
+async_pool_stats = PoolStats()
+
+
+class _WaitCounting:
+    """Pool mixin counting checkouts that had to wait for a connection to be returned."""
+
+    stats: PoolStats
+
+    def _do_get(self):
+        # Unless every pooled and overflow connection is in use, this checkout does not block.
+        if self._max_overflow < 0 or self.checkedout() < self.size() + self._max_overflow:
+            return super()._do_get()
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.stats.add("timeouts")
+            raise
+        finally:
+            self.stats.add("waits")
+            self.stats.add("wait_seconds", time.perf_counter() - started)
+
+
+# One class per engine: a pool rebuilt by ``dispose()`` keeps its class but not instance attributes.
+class InstrumentedQueuePool(_WaitCounting, QueuePool):
+    stats = pool_stats
+
+
+class InstrumentedAsyncQueuePool(_WaitCounting, AsyncAdaptedQueuePool):
+    stats = async_pool_stats
+
+
+_ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def async_database_url(config: Settings) -> URL:
+    """``async_database_url`` if set, else ``database_url`` with its asyncio driver (asyncpg/aiosqlite)."""
+    if config.async_database_url:
+        return make_url(config.async_database_url)
+    url = make_url(config.database_url)
+    try:
+        return url.set(drivername=_ASYNC_DRIVERS[url.get_backend_name()])
+    except KeyError:
+        raise ValueError(f"No asyncio driver known for '{url.get_backend_name()}'; set ASYNC_DATABASE_URL.") from None
+
+
+def engine_options(config: Settings, asynchronous: bool = False) -> Dict[str, Any]:
+    """
+    Build ``create_engine`` keyword arguments from the ``DB_*`` settings.
+
+    ``db_null_pool`` opens a connection per checkout and closes it on
+    return, leaving pooling to pgbouncer in transaction mode. The statement
+    timeout is then applied per transaction with ``SET LOCAL`` (pgbouncer
+    does not pass startup options through), and asyncpg's prepared
+    statement caches are turned off, since consecutive transactions may
+    land on different server connections. Otherwise the timeout is a
+    connection option. SQLite keeps SQLAlchemy's default pool.
+
+    ``asynchronous`` builds the options for the asyncio engine.
+    """
+    url = async_database_url(config) if asynchronous else make_url(config.database_url)
+    postgres = url.get_backend_name() == "postgresql"
+    options: Dict[str, Any] = {"pool_pre_ping": config.db_pool_pre_ping}
+    if not asynchronous:
+        options["future"] = True
+    if config.db_null_pool:
+        options["poolclass"] = NullPool
+        if asynchronous and postgres:
+            options["connect_args"] = {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+    elif url.get_backend_name() != "sqlite":
+        options.update(
+            poolclass=InstrumentedAsyncQueuePool if asynchronous else InstrumentedQueuePool,
+            pool_size=config.db_pool_size,
+            max_overflow=config.db_max_overflow,
+            pool_timeout=config.db_pool_timeout_seconds,
+            pool_recycle=config.db_pool_recycle_seconds,
+        )
+    if postgres and config.db_statement_timeout_ms and not config.db_null_pool:
+        timeout = str(config.db_statement_timeout_ms)
+        if asynchronous:
+            options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+
+def _instrument(target: Engine, config: Settings, stats: PoolStats) -> None:
+    pool: Pool = target.pool
+    event.listen(pool, "checkout", lambda *args: stats.add("checkouts"))
+    event.listen(pool, "checkin", lambda *args: stats.add("checkins"))
+    event.listen(pool, "connect", lambda *args: stats.add("connects"))
+    event.listen(pool, "invalidate", lambda *args: stats.add("invalidations"))
+    timeout = config.db_statement_timeout_ms
+    if config.db_null_pool and timeout and target.dialect.name == "postgresql":
+
+        @event.listens_for(target, "begin")
+        def _set_statement_timeout(connection) -> None:
+            connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout)}")
+
+
+def create_db_engine(config: Settings) -> Engine:
+    """Create the engine for ``config`` with pool settings and metrics hooks applied."""
+    created = create_engine(config.database_url, **engine_options(config))
+    _instrument(created, config, pool_stats)
+    return created
+
+
+def create_async_db_engine(config: Settings) -> AsyncEngine:
+    """Create the asyncio engine (API routes) for ``config``; Celery tasks keep the sync engine."""
+    created = create_async_engine(async_database_url(config), **engine_options(config, asynchronous=True))
+    _instrument(created.sync_engine, config, async_pool_stats)
+    return created
+
+
+engine = create_db_engine(settings)
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
     bind=engine,
     future=True,
 )
+async_engine = create_async_db_engine(settings)
+# Objects stay loaded after commit: attribute access must not trigger I/O outside an await.
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
 
+def pool_status(target: Engine = engine, stats: PoolStats = pool_stats) -> Dict[str, float]:
+    """Current pool occupancy of an engine plus its cumulative counters in this process."""
+    pool = target.pool
+    counters = stats.snapshot()
+    status: Dict[str, float] = {"checked_out": counters["checkouts"] - counters["checkins"]}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            idle=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),  # negative while the pool is still filling
+        )
+    return {**status, **counters}
+
+
 def get_db():
     """Provide a SQLAlchemy session per request."""
     db = SessionLocal()
@@ -26,8 +186,14 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """Provide an asyncio SQLAlchemy session per request."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def init_db() -> None:
-    """Create database tables based on models."""
+    """Create database tables based on models (search indexes: ``python -m app.manage search-indexes``)."""
     # Import models for metadata registration before create_all
     from app import models  # noqa: F401
 
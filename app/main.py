@@ -7,7 +7,7 @@ from fastapi.templating import Jinja2Templates
 
 from app.config import get_settings
 from app.database import init_db
-from app.routers import admin, products, upload, webhooks
+from app.routers import admin, metrics, products, upload, webhooks
 
 
 def create_app() -> FastAPI:
@@ -19,6 +19,7 @@ def create_app() -> FastAPI:
     application.include_router(products.router)
     application.include_router(webhooks.router)
     application.include_router(admin.router)
+    application.include_router(metrics.router)
 
     application.mount("/static", StaticFiles(directory="static"), name="static")
     # Serve raw HTML templates for simple navigation/testing.
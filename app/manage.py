@@ -0,0 +1,37 @@
+"""One-off administrative commands, run outside the API process.
+
+Usage::
+
+    python -m app.manage search-indexes
+
+``search-indexes`` creates the tables if missing, then builds the Postgres
+full-text and trigram search indexes (``ensure_search_indexes``). The build
+can take minutes on a large catalogue, so it runs here, once per deploy,
+instead of on API startup. It is idempotent and safe to run again, e.g.
+after an interrupted build.
+"""
+
+import argparse
+import sys
+
+from app.database import engine, init_db
+from app.services.search import ensure_search_indexes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["search-indexes"])
+    parser.parse_args()
+
+    init_db()
+    if engine.dialect.name != "postgresql":
+        print(f"search indexes are Postgres only; nothing to do on {engine.dialect.name}")
+        return
+    if not ensure_search_indexes(engine):
+        print("pg_trgm unavailable: built the full-text index only", file=sys.stderr)
+        return
+    print("search indexes ready")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,20 @@
 """SQLAlchemy models."""
 
-from sqlalchemy import Boolean, Column, Integer, String, Text, Numeric, event
-from sqlalchemy.sql import expression
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    Text,
+    event,
+)
+from sqlalchemy.sql import expression, func
 
 from app.database import Base
 
@@ -30,6 +43,43 @@ class Webhook(Base):
     active = Column(Boolean, server_default=expression.true(), nullable=False)
 
 
+class WebhookDelivery(Base):
+    """One delivery attempt of a payload to a webhook."""
+
+    __tablename__ = "webhook_deliveries"
+    __table_args__ = (Index("ix_webhook_deliveries_webhook_id_id", "webhook_id", "id"),)
+
+    id = Column(Integer, primary_key=True)
+    webhook_id = Column(Integer, ForeignKey("webhooks.id", ondelete="CASCADE"), nullable=False)
+    event = Column(String, nullable=True)
+    attempt = Column(Integer, nullable=False)
+    status = Column(String, nullable=False)  # delivered | retrying | failed | skipped
+    status_code = Column(Integer, nullable=True)
+    elapsed_ms = Column(Float, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class ImportCheckpoint(Base):
+    """Last committed position of an import, so a retried task can resume from it."""
+
+    __tablename__ = "import_checkpoints"
+
+    task_id = Column(String, primary_key=True)
+    file_path = Column(Text, nullable=False)
+    mode = Column(String, nullable=False)
+    chunk_size = Column(Integer, nullable=False)
+    total = Column(Integer, nullable=False)
+    byte_offset = Column(BigInteger, nullable=False)  # record boundary after the last committed row
+    processed = Column(Integer, nullable=False)
+    inserted = Column(Integer, nullable=False, default=0)
+    updated = Column(Integer, nullable=False, default=0)
+    unchanged = Column(Integer, nullable=False, default=0)
+    rejected = Column(Integer, nullable=False, default=0)
+    reject_bytes = Column(BigInteger, nullable=False, default=0)  # reject file size covering committed chunks
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
 @event.listens_for(Product, "before_insert")
 @event.listens_for(Product, "before_update")
 def normalize_product_sku(mapper, connection, target) -> None:  # type: ignore[override]
@@ -2,23 +2,34 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from typing import Dict, Optional
 
-from app.database import get_db
-from app.services.product_service import ProductService
+from fastapi import APIRouter, HTTPException, Query, status
+
+from app.tasks.bulk_delete import delete_products_task
 
 router = APIRouter(prefix="/products", tags=["admin"])
 
 
-@router.delete("", status_code=status.HTTP_200_OK)
-def delete_all_products(confirm: bool = Query(False), db: Session = Depends(get_db)):
-    """Delete all products. Requires confirm=true to proceed."""
+@router.delete("", status_code=status.HTTP_202_ACCEPTED)
+def delete_products(
+    confirm: bool = Query(False),
+    sku: Optional[str] = Query(None),
+    name: Optional[str] = Query(None),
+    active: Optional[bool] = Query(None),
+    description: Optional[str] = Query(None),
+    q: Optional[str] = Query(None),
+) -> Dict[str, str]:
+    """
+    Enqueue a batched delete of the products matching the ``GET /products``
+    filters (all products without filters). Requires confirm=true to proceed.
+
+    Returns the ``task_id``; follow it on ``GET /upload/status/{task_id}``.
+    """
     if not confirm:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Confirmation required. Pass confirm=true to delete all products.",
+            detail="Confirmation required. Pass confirm=true to delete products.",
         )
-    service = ProductService(db)
-    deleted = service.delete_all_products()
-    return {"deleted": deleted}
+    task = delete_products_task.delay(sku=sku, name=name, active=active, description=description, q=q)
+    return {"task_id": task.id}
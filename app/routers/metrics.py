@@ -0,0 +1,51 @@
+"""Metrics routes."""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.database import async_engine, async_pool_stats, engine, pool_stats, pool_status
+
+router = APIRouter(tags=["metrics"])
+
+# name in pool_status() -> (metric, type, help)
+_POOL_METRICS = {
+    "size": ("db_pool_size", "gauge", "Configured persistent connections."),
+    "max_overflow": ("db_pool_max_overflow", "gauge", "Configured extra connections allowed under load."),
+    "checked_out": ("db_pool_checked_out", "gauge", "Connections currently in use."),
+    "idle": ("db_pool_idle", "gauge", "Pooled connections waiting to be checked out."),
+    "overflow": ("db_pool_overflow", "gauge", "Overflow connections currently open."),
+    "checkouts": ("db_pool_checkouts_total", "counter", "Connections handed out."),
+    "checkins": ("db_pool_checkins_total", "counter", "Connections returned."),
+    "connects": ("db_pool_connects_total", "counter", "New database connections opened."),
+    "waits": ("db_pool_waits_total", "counter", "Checkouts that found every connection in use and waited."),
+    "wait_seconds": ("db_pool_wait_seconds_total", "counter", "Time spent waiting for a free connection."),
+    "timeouts": ("db_pool_timeouts_total", "counter", "Checkouts that gave up after DB_POOL_TIMEOUT_SECONDS."),
+    "invalidations": ("db_pool_invalidations_total", "counter", "Connections discarded as dead or stale."),
+}
+
+# engine label -> (engine, counters): API routes run on the async engine, the rest on the sync one.
+_ENGINES = {
+    "sync": (engine, pool_stats),
+    "async": (async_engine.sync_engine, async_pool_stats),
+}
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> str:
+    """
+    Connection pool metrics of this process in the Prometheus text format,
+    one series per engine (``engine="sync"`` or ``engine="async"``).
+
+    A steady ``db_pool_waits_total`` rise (or any timeouts) means requests
+    queue for connections and the pool is too small for the load; a
+    ``db_pool_checked_out`` that never nears ``size`` means it can shrink.
+    """
+    samples = {}
+    for label, (target, stats) in _ENGINES.items():
+        for name, value in pool_status(target, stats).items():
+            samples.setdefault(name, []).append(f'{_POOL_METRICS[name][0]}{{engine="{label}"}} {value:g}')
+    lines = []
+    for name, series in samples.items():
+        metric, kind, description = _POOL_METRICS[name]
+        lines += [f"# HELP {metric} {description}", f"# TYPE {metric} {kind}", *series]
+    return "\n".join(lines) + "\n"
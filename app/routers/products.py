@@ -2,62 +2,215 @@
 
 from __future__ import annotations
 
-from typing import Optional
+import json
+from typing import Iterator, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import get_db
-from app.schemas import ProductCreate, ProductRead, ProductUpdate
-from app.services.product_service import ProductService
+from app.database import SessionLocal, get_async_db, get_db
+from app.schemas import ProductBatchRequest, ProductBatchResponse, ProductCreate, ProductRead, ProductUpdate
+from app.services.product_cache import catalogue_version, etag_matches, page_cache, page_key
+from app.services.product_service import AsyncProductService, ProductService
+from app.utils.csv_parser import format_products_csv
+from app.utils.helpers import decode_cursor, encode_cursor, json_bytes, normalize_sku
 
 router = APIRouter(prefix="/products", tags=["products"])
 
+# Per-request routes are async on the asyncio engine. Batch writes and the
+# export stream stay sync (FastAPI runs them in its threadpool): both are
+# long, multi-statement units of work on the sync ProductService.
+
 
 @router.get("", response_model=dict)
-def list_products(
+async def list_products(
     sku: Optional[str] = Query(None),
     name: Optional[str] = Query(None),
     active: Optional[bool] = Query(None),
     description: Optional[str] = Query(None),
+    q: Optional[str] = Query(None, description="Full-text search over sku, name and description (ranked on Postgres)."),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from a previous page; overrides page."),
+    include_total: Optional[bool] = Query(
+        None,
+        description="Run the exact count query (default: true in page mode, false with a cursor); "
+        "false returns an estimate instead.",
+    ),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """List products with filters and pagination."""
-    service = ProductService(db)
-    items, total, total_pages = service.list_products(sku, name, active, description, page, limit)
-    return {
+    """
+    List products with filters and pagination (page/offset or keyset cursor).
+
+    Pages are read as column rows and serialized in one orjson pass
+    (``response_model`` only documents the shape), then served from the
+    read-through cache while the catalogue version is unchanged. The
+    ``ETag`` identifies the page at that version; a matching
+    ``If-None-Match`` gets a 304 without touching the database.
+    """
+    try:
+        after_id = decode_cursor(cursor) if cursor else None
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    if include_total is None:
+        # Cursor paging exists to avoid per-page cost; don't count every page.
+        include_total = cursor is None
+    version = await catalogue_version.current()
+    if version is None:
+        listing = await _list_products_page(db, sku, name, active, description, q, page, limit, after_id, include_total)
+        return Response(content=json_bytes(listing), media_type="application/json")
+
+    # ILIKE filters ignore case, so differently cased requests share an entry.
+    params = (
+        normalize_sku(sku) if sku else None,
+        name.lower() if name else None,
+        description.lower() if description else None,
+        active,
+        q or None,
+        page,
+        limit,
+        after_id,
+        include_total,
+    )
+    key = page_key(version, params)
+    etag = f'"{key}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    body = await page_cache.get(key)
+    if body is None:
+        listing = await _list_products_page(db, sku, name, active, description, q, page, limit, after_id, include_total)
+        body = json_bytes(listing)
+        await page_cache.put(key, body)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def _list_products_page(
+    db: AsyncSession,
+    sku: Optional[str],
+    name: Optional[str],
+    active: Optional[bool],
+    description: Optional[str],
+    q: Optional[str],
+    page: int,
+    limit: int,
+    after_id: Optional[int],
+    include_total: bool,
+) -> dict:
+    service = AsyncProductService(db)
+    items, total, total_pages, next_id = await service.list_products(
+        sku, name, active, description, page, limit, cursor=after_id, include_total=include_total, q=q
+    )
+    response = {
         "items": items,
         "total": total,
         "page": page,
         "total_pages": total_pages,
         "limit": limit,
+        "next_cursor": encode_cursor(next_id) if next_id is not None else None,
     }
+    if not include_total and not any((sku, name, description, q, active is not None)):
+        response["estimated_total"] = await service.estimate_total()
+    return response
+
+
+def _ndjson_lines(rows, batch_size: int = 1000) -> Iterator[str]:
+    lines = []
+    for row in rows:
+        lines.append(
+            json.dumps(
+                {
+                    "id": row.id,
+                    "sku": row.sku,
+                    "name": row.name,
+                    "description": row.description,
+                    "price": float(row.price) if row.price is not None else None,
+                    "active": row.active,
+                }
+            )
+        )
+        if len(lines) >= batch_size:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+@router.get("/export")
+def export_products(
+    export_format: Literal["csv", "ndjson"] = Query("csv", alias="format"),
+    sku: Optional[str] = Query(None),
+    name: Optional[str] = Query(None),
+    active: Optional[bool] = Query(None),
+    description: Optional[str] = Query(None),
+    q: Optional[str] = Query(None),
+) -> StreamingResponse:
+    """Stream the (optionally filtered) catalogue as CSV or NDJSON."""
+
+    def body() -> Iterator[str]:
+        # The session must outlive the request dependency scope, so the
+        # generator owns it for the duration of the stream.
+        with SessionLocal() as db:
+            rows = ProductService(db).stream_products(sku, name, active, description, q)
+            if export_format == "csv":
+                yield from format_products_csv(rows)
+            else:
+                yield from _ndjson_lines(rows)
+
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="products.{export_format}"'},
+    )
 
 
 @router.post("", response_model=ProductRead, status_code=status.HTTP_201_CREATED)
-def create_product(payload: ProductCreate, db: Session = Depends(get_db)) -> ProductRead:
+async def create_product(payload: ProductCreate, db: AsyncSession = Depends(get_async_db)) -> ProductRead:
     """Create a product."""
+    service = AsyncProductService(db)
+    return await service.create_product(payload)
+
+
+@router.post("/batch", response_model=ProductBatchResponse)
+def batch_products(payload: ProductBatchRequest, db: Session = Depends(get_db)) -> ProductBatchResponse:
+    """Apply many create/update/delete operations in one transaction."""
     service = ProductService(db)
-    return service.create_product(payload)
+    results, committed = service.apply_batch(payload.operations, atomic=payload.mode == "atomic")
+    failed = sum(1 for result in results if result.status == "error")
+    response = ProductBatchResponse(
+        mode=payload.mode,
+        committed=committed,
+        succeeded=sum(1 for result in results if result.status == "ok"),
+        failed=failed,
+        results=results,
+    )
+    if payload.mode == "atomic" and failed:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=response.model_dump())
+    return response
 
 
 @router.put("/{product_id}", response_model=ProductRead)
-def update_product(product_id: int, payload: ProductUpdate, db: Session = Depends(get_db)) -> ProductRead:
+async def update_product(
+    product_id: int, payload: ProductUpdate, db: AsyncSession = Depends(get_async_db)
+) -> ProductRead:
     """Update a product."""
-    service = ProductService(db)
-    updated = service.update_product(product_id, payload)
+    service = AsyncProductService(db)
+    updated = await service.update_product(product_id, payload)
     if not updated:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found.")
     return updated
 
 
 @router.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_product(product_id: int, db: Session = Depends(get_db)) -> None:
+async def delete_product(product_id: int, db: AsyncSession = Depends(get_async_db)) -> None:
     """Delete a product."""
-    service = ProductService(db)
-    deleted = service.delete_product(product_id)
+    service = AsyncProductService(db)
+    deleted = await service.delete_product(product_id)
     if not deleted:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found.")
     return None
@@ -1,94 +1,411 @@
 """Upload routes."""
 
-import csv
-import os
+import json
+import logging
+import time
 from pathlib import Path
-from typing import Dict
+from typing import AsyncIterator, Callable, Dict, Optional
 from uuid import uuid4
 
 from celery.result import AsyncResult
-from fastapi import APIRouter, File, HTTPException, UploadFile, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.config import get_settings
 from app.celery_app import celery_app
-from app.schemas import UploadStatus
+from app.database import get_db
+from app.schemas import UploadSessionCreate, UploadSessionRead, UploadStatus
+from app.services import upload_sessions
+from app.services.checkpoints import get_checkpoint
+from app.services.progress import progress_store
+from app.services.progress_stream import ProgressSubscription
+from app.services.rejects import reject_path
 from app.tasks.importer import import_products_task
+from app.utils.compression import (
+    CompressionError,
+    StreamDecompressor,
+    compression_for,
+    open_decompressed,
+    upload_suffixes,
+)
+from app.utils.csv_parser import CsvRowCounter, CsvValidationError
+from app.utils.multipart import MultipartError, MultipartFileReceiver
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/upload", tags=["upload"])
 
 MAX_ROWS = 500_000
 
 
-def _count_rows(file_path: Path) -> int:
-    """Count data rows in CSV file."""
-    with file_path.open(newline="", encoding="utf-8") as csvfile:
-        reader = csv.DictReader(csvfile)
-        return sum(1 for _ in reader)
+def _too_many_rows() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"CSV exceeds max allowed rows ({MAX_ROWS}).")
+
+
+def _check_filename(filename: str) -> None:
+    suffixes = upload_suffixes()
+    if not filename.lower().endswith(suffixes):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Only CSV files ({', '.join(suffixes)}) are accepted."
+        )
+
 
+async def _save_upload(request: Request, temp_dir: Path, counter: CsvRowCounter) -> Path:
+    """
+    Persist the uploaded ``file`` field to a temporary path as the body streams in.
 
-async def _save_upload(upload_file: UploadFile, temp_dir: Path) -> Path:
-    """Persist uploaded file to a temporary path."""
+    The multipart body is parsed incrementally straight from the socket, and
+    the file name, header, encoding and MAX_ROWS limit are checked chunk by
+    chunk, so an oversized or malformed file is rejected without reading the
+    rest of the request. Compressed uploads are stored as sent and
+    decompressed in memory only for these checks.
+    """
     temp_dir.mkdir(parents=True, exist_ok=True)
-    filename = upload_file.filename or "upload.csv"
-    temp_path = temp_dir / f"{uuid4()}_{filename}"
+    temp_path: Optional[Path] = None
+    buffer = None
+    decompressor: Optional[StreamDecompressor] = None
 
-    with temp_path.open("wb") as buffer:
-        while True:
-            chunk = await upload_file.read(1024 * 1024)
-            if not chunk:
-                break
-            buffer.write(chunk)
+    def count(data: bytes) -> None:
+        if counter.feed(data) > MAX_ROWS:
+            raise _too_many_rows()
+
+    def on_start(filename: str) -> None:
+        nonlocal temp_path, buffer, decompressor
+        _check_filename(filename)
+        compression = compression_for(filename)
+        if compression:
+            decompressor = StreamDecompressor(compression, count)
+        temp_path = temp_dir / f"{uuid4()}_{Path(filename).name}"
+        buffer = temp_path.open("wb")
+
+    def on_data(chunk: bytes) -> None:
+        if decompressor is not None:
+            decompressor.write(chunk)
+        else:
+            count(chunk)
+        buffer.write(chunk)
+
+    try:
+        receiver = MultipartFileReceiver(request.headers.get("content-type"), "file", on_start, on_data)
+        async for chunk in request.stream():
+            receiver.feed(chunk)
+        receiver.close()
+        if decompressor is not None:
+            decompressor.close()
+        if counter.close() > MAX_ROWS:
+            raise _too_many_rows()
+    except (CsvValidationError, CompressionError, MultipartError) as exc:
+        _discard(buffer, temp_path)
+        detail = str(exc) if isinstance(exc, MultipartError) else f"Invalid CSV file. {exc}"
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+    except BaseException:
+        _discard(buffer, temp_path)
+        raise
+    buffer.close()
     return temp_path
 
 
-@router.post("", status_code=status.HTTP_202_ACCEPTED)
-async def upload_csv(file: UploadFile = File(...)) -> Dict[str, str]:
-    """Accept CSV file and enqueue background import."""
-    if not file.filename or not file.filename.lower().endswith(".csv"):
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only CSV files are accepted.")
+def _discard(buffer, temp_path: Optional[Path]) -> None:
+    if buffer is not None:
+        buffer.close()
+    if temp_path is not None:
+        temp_path.unlink(missing_ok=True)
+
+
+_UPLOAD_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                }
+            }
+        },
+    }
+}
+
+
+_DRY_RUN = Query(False, description="Validate and diff against the stored products without writing.")
 
+
+@router.post("", status_code=status.HTTP_202_ACCEPTED, openapi_extra=_UPLOAD_BODY)
+async def upload_csv(request: Request, dry_run: bool = _DRY_RUN) -> Dict[str, str]:
+    """Accept a multipart ``file`` CSV upload (optionally ``.csv.gz``/``.csv.zst``) and enqueue background import."""
     settings = get_settings()
     temp_dir = Path(settings.temp_upload_dir)
-    temp_path = await _save_upload(file, temp_dir)
+    counter = CsvRowCounter()
+    temp_path = await _save_upload(request, temp_dir, counter)
+
+    task = import_products_task.delay(str(temp_path), counter.rows, dry_run=dry_run)
+
+    return {"task_id": task.id}
 
+
+def _session_root() -> Path:
+    return Path(get_settings().temp_upload_dir) / "sessions"
+
+
+def _session_read(manifest: dict) -> UploadSessionRead:
+    return UploadSessionRead(**manifest, missing_parts=upload_sessions.missing_parts(_session_root(), manifest))
+
+
+def _load_session(upload_id: str) -> dict:
     try:
-        total_rows = _count_rows(temp_path)
-    except Exception:
-        os.remove(temp_path)
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid CSV file.")
+        return upload_sessions.load_session(_session_root(), upload_id)
+    except upload_sessions.UploadSessionNotFound:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload session not found.")
+
+
+def _count_rows(file_path: Path, chunk_size: int = 1024 * 1024) -> int:
+    """Validate an assembled CSV and return its data row count (stops early past MAX_ROWS)."""
+    counter = CsvRowCounter()
+    with open_decompressed(str(file_path)) as fh:
+        while chunk := fh.read(chunk_size):
+            if counter.feed(chunk) > MAX_ROWS:
+                return counter.rows
+    return counter.close()
+
 
-    if total_rows > MAX_ROWS:
-        os.remove(temp_path)
+@router.post("/sessions", status_code=status.HTTP_201_CREATED, response_model=UploadSessionRead)
+def create_upload_session(payload: UploadSessionCreate) -> UploadSessionRead:
+    """
+    Start a chunked upload.
+
+    Send each part with ``PUT /upload/sessions/{upload_id}/parts/{number}``
+    (1-based, ``part_size`` bytes each, the last one shorter) and its
+    SHA-256 hex digest in ``X-Content-SHA256``, then call ``complete``.
+    Parts may arrive in any order or in parallel; ``GET`` the session to
+    see which are still missing after an interruption.
+    """
+    settings = get_settings()
+    _check_filename(payload.filename)
+    if payload.size > settings.upload_max_bytes:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"CSV exceeds max allowed rows ({MAX_ROWS}).",
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"File exceeds {settings.upload_max_bytes} bytes."
         )
+    manifest = upload_sessions.create_session(
+        _session_root(), payload.filename, payload.size, settings.upload_part_size_bytes
+    )
+    return _session_read(manifest)
+
+
+@router.get("/sessions/{upload_id}", response_model=UploadSessionRead)
+def get_upload_session(upload_id: str) -> UploadSessionRead:
+    """Return the session with the parts still missing."""
+    return _session_read(_load_session(upload_id))
+
 
-    task = import_products_task.delay(str(temp_path), total_rows)
+@router.put("/sessions/{upload_id}/parts/{number}")
+async def upload_part(
+    upload_id: str,
+    number: int,
+    request: Request,
+    sha256: str = Header(..., alias="X-Content-SHA256", min_length=64, max_length=64),
+) -> Dict[str, object]:
+    """Write one part straight to its offset in the target file, verified by its SHA-256."""
+    manifest = _load_session(upload_id)
+    try:
+        await upload_sessions.write_part(_session_root(), manifest, number, request.stream(), sha256)
+    except upload_sessions.UploadSessionError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    return {"part": number, "sha256": sha256.lower()}
+
+
+@router.post("/sessions/{upload_id}/complete", status_code=status.HTTP_202_ACCEPTED)
+async def complete_upload_session(upload_id: str, dry_run: bool = _DRY_RUN) -> Dict[str, str]:
+    """Validate the assembled file and enqueue its import."""
+    root = _session_root()
+    try:
+        _, file_path = upload_sessions.complete_session(root, upload_id)
+    except upload_sessions.UploadSessionNotFound:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload session not found.")
+    except upload_sessions.UploadSessionError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
 
+    try:
+        rows = await run_in_threadpool(_count_rows, file_path)
+    except (CsvValidationError, CompressionError, EOFError, OSError) as exc:
+        upload_sessions.discard_session(root, upload_id)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid CSV file. {exc}")
+    if rows > MAX_ROWS:
+        upload_sessions.discard_session(root, upload_id)
+        raise _too_many_rows()
+
+    task = import_products_task.delay(str(file_path), rows, dry_run=dry_run)
     return {"task_id": task.id}
 
 
-@router.get("/status/{task_id}", response_model=UploadStatus)
-def upload_status(task_id: str) -> UploadStatus:
-    """Return background upload progress."""
+@router.delete("/sessions/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+def abort_upload_session(upload_id: str) -> None:
+    """Abandon a session and delete its parts."""
+    _load_session(upload_id)
+    upload_sessions.discard_session(_session_root(), upload_id)
+
+
+def _import_running(task_id: str) -> bool:
+    """Whether a worker holds the task (executing, prefetched or waiting on an ETA)."""
+    try:
+        replies = celery_app.control.inspect(timeout=1.0).query_task(task_id) or {}
+    except Exception as exc:  # broker unreachable or without broadcast support
+        logger.warning("Could not ask workers about import %s: %s", task_id, exc)
+        return False
+    return any(task_id in tasks for tasks in replies.values())
+
+
+@router.post("/{task_id}/resume", status_code=status.HTTP_202_ACCEPTED)
+def resume_upload(task_id: str, db: Session = Depends(get_db)) -> Dict[str, str]:
+    """
+    Re-enqueue an interrupted import under the same task id so it continues from its checkpoint.
+
+    Refused while a worker still runs (or has prefetched) the import, since a
+    second copy would write the same rows from the same checkpoint.
+    """
+    record = progress_store.get(task_id)
+    if record is not None and record["status"] == "completed":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Import already completed.")
+    state = record["status"] if record is not None else AsyncResult(task_id, app=celery_app).state.lower()
+    if state in ("processing", "pending", "started") and _import_running(task_id):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Import is still running.")
+    checkpoint = get_checkpoint(db, task_id)
+    if checkpoint is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No checkpoint for this import.")
+    if not Path(checkpoint.file_path).is_file():
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail="Uploaded file is no longer available.")
+
+    import_products_task.apply_async(
+        (checkpoint.file_path, checkpoint.total),
+        {"chunk_size": checkpoint.chunk_size, "mode": checkpoint.mode},
+        task_id=task_id,
+    )
+    return {"task_id": task_id}
+
+
+@router.get("/{task_id}/rejects")
+def download_rejects(task_id: str) -> FileResponse:
+    """
+    Download the rows an import rejected as CSV: ``line``, ``reason`` and the
+    raw product columns. Fixed rows can be uploaded again as is.
+    """
+    try:
+        path = reject_path(task_id)
+    except LookupError:
+        path = None
+    if path is None or not path.is_file():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No rejected rows for this import.")
+    return FileResponse(path, media_type="text/csv", filename=f"{task_id}-rejects.csv")
+
+
+def _read_status(task_id: str) -> dict:
+    """
+    Return the task's status payload.
+
+    The progress store answers with one lookup while the import runs and
+    after it ends; the result backend is only consulted for tasks that have
+    not reported yet (queued) or whose record has expired. Failed tasks
+    yield ``status="error"`` with the failure in ``message``.
+    """
+    record = progress_store.get(task_id)
+    if record is not None:
+        if record["status"] == "error":
+            return {**record, "message": record["error"] or record["message"]}
+        return record
+
     result = AsyncResult(task_id, app=celery_app)
     state = result.state
     meta = result.info or {}
 
-    if state == "PENDING":
-        payload = {"status": "processing", "processed": 0, "total": 0, "percent": 0.0, "message": "Queued"}
-    elif state == "SUCCESS":
-        payload = meta if isinstance(meta, dict) else {}
-        payload.setdefault("status", "completed")
-    elif state in {"FAILURE", "REVOKED"}:
+    if state in {"FAILURE", "REVOKED"}:
         detail = meta.get("exc_message") if isinstance(meta, dict) else str(meta)
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=detail or "Task failed")
-    else:
-        payload = meta if isinstance(meta, dict) else {}
-        payload.setdefault("status", "processing")
+        if isinstance(detail, (list, tuple)):
+            detail = " ".join(str(part) for part in detail)
+        return {"status": "error", "processed": 0, "total": 0, "percent": 0.0, "message": detail or "Task failed"}
+    if state == "SUCCESS" and isinstance(meta, dict):
+        return meta
+    message = "Queued" if state == "PENDING" else "Processing"
+    return {"status": "processing", "processed": 0, "total": 0, "percent": 0.0, "message": message}
+
+
+@router.get("/status/{task_id}", response_model=UploadStatus)
+def upload_status(task_id: str) -> UploadStatus:
+    """Return background upload progress."""
+    payload = _read_status(task_id)
+    if payload["status"] == "error":
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=payload["message"])
 
     try:
         return UploadStatus(**payload)
     except Exception:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Invalid task status payload.")
+
+
+async def _watch_progress(task_id: str, disconnected: Optional[Callable] = None) -> AsyncIterator[Optional[dict]]:
+    """
+    Yield the task's status each time it changes, until it completes or fails.
+
+    Updates arrive over Redis pub/sub when available and are coalesced, so a
+    burst of messages produces one update; the status is read once up
+    front and re-read whenever no message arrived for a heartbeat interval,
+    to reconcile anything missed. Without pub/sub it is polled instead.
+    ``None`` is yielded as a keep-alive when nothing changed for a heartbeat.
+    """
+    settings = get_settings()
+    heartbeat = settings.progress_stream_heartbeat_seconds
+    async with ProgressSubscription(task_id) as subscription:
+        # Subscribed before the first read, so no update can fall in between.
+        payload = await run_in_threadpool(_read_status, task_id)
+        last, last_sent = None, time.monotonic()
+        while True:
+            update = UploadStatus(**payload).model_dump()
+            if update != last:
+                yield update
+                last, last_sent = update, time.monotonic()
+            elif time.monotonic() - last_sent >= heartbeat:
+                yield None
+                last_sent = time.monotonic()
+            if update["status"] in {"completed", "error"} or (disconnected and await disconnected()):
+                return
+            if subscription.live:
+                messages = await subscription.next_messages(heartbeat)
+                if messages:
+                    payload = messages[-1]
+                    continue
+            else:
+                await subscription.next_messages(settings.progress_stream_poll_seconds)
+            payload = await run_in_threadpool(_read_status, task_id)
+
+
+@router.get("/stream/{task_id}")
+async def upload_stream(task_id: str, request: Request) -> StreamingResponse:
+    """Stream upload progress as Server-Sent Events (``progress`` events, comments as keep-alives)."""
+
+    async def events() -> AsyncIterator[str]:
+        async for update in _watch_progress(task_id, request.is_disconnected):
+            if update is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"event: progress\ndata: {json.dumps(update)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws/{task_id}")
+async def upload_ws(websocket: WebSocket, task_id: str) -> None:
+    """Push upload progress as JSON messages over a WebSocket, closing when the import ends."""
+    await websocket.accept()
+    try:
+        # A closed socket surfaces as WebSocketDisconnect on the next send.
+        async for update in _watch_progress(task_id):
+            if update is not None:
+                await websocket.send_json(update)
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
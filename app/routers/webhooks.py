@@ -2,56 +2,73 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
-from app.database import get_db
-from app.schemas import WebhookCreate, WebhookRead, WebhookUpdate
-from app.services.webhook_service import WebhookService
+from app.database import get_async_db
+from app.schemas import WebhookCreate, WebhookDeliveryLog, WebhookRead, WebhookUpdate
+from app.services.webhook_service import AsyncWebhookService
 from app.tasks.webhook_sender import send_webhook_task
+from app.utils.helpers import json_bytes
 
 router = APIRouter(prefix="/webhooks", tags=["webhooks"])
 
 
 @router.get("", response_model=list[WebhookRead])
-def list_webhooks(db: Session = Depends(get_db)) -> list[WebhookRead]:
-    """List all webhooks."""
-    service = WebhookService(db)
-    return service.list_webhooks()
+async def list_webhooks(db: AsyncSession = Depends(get_async_db)) -> Response:
+    """List all webhooks (column rows serialized in one orjson pass; ``response_model`` documents the shape)."""
+    service = AsyncWebhookService(db)
+    return Response(content=json_bytes(await service.list_webhooks()), media_type="application/json")
 
 
 @router.post("", response_model=WebhookRead, status_code=status.HTTP_201_CREATED)
-def create_webhook(payload: WebhookCreate, db: Session = Depends(get_db)) -> WebhookRead:
+async def create_webhook(payload: WebhookCreate, db: AsyncSession = Depends(get_async_db)) -> WebhookRead:
     """Create a webhook."""
-    service = WebhookService(db)
-    return service.create_webhook(payload)
+    service = AsyncWebhookService(db)
+    return await service.create_webhook(payload)
 
 
 @router.put("/{webhook_id}", response_model=WebhookRead)
-def update_webhook(webhook_id: int, payload: WebhookUpdate, db: Session = Depends(get_db)) -> WebhookRead:
+async def update_webhook(
+    webhook_id: int, payload: WebhookUpdate, db: AsyncSession = Depends(get_async_db)
+) -> WebhookRead:
     """Update a webhook."""
-    service = WebhookService(db)
-    updated = service.update_webhook(webhook_id, payload)
+    service = AsyncWebhookService(db)
+    updated = await service.update_webhook(webhook_id, payload)
     if not updated:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Webhook not found.")
     return updated
 
 
 @router.delete("/{webhook_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_webhook(webhook_id: int, db: Session = Depends(get_db)) -> None:
+async def delete_webhook(webhook_id: int, db: AsyncSession = Depends(get_async_db)) -> None:
     """Delete a webhook."""
-    service = WebhookService(db)
-    deleted = service.delete_webhook(webhook_id)
+    service = AsyncWebhookService(db)
+    deleted = await service.delete_webhook(webhook_id)
     if not deleted:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Webhook not found.")
     return None
 
 
+@router.get("/{webhook_id}/deliveries", response_model=WebhookDeliveryLog)
+async def list_webhook_deliveries(
+    webhook_id: int,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db),
+) -> WebhookDeliveryLog:
+    """List recent delivery attempts of a webhook with latency and status stats."""
+    service = AsyncWebhookService(db)
+    if not await service.get_webhook(webhook_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Webhook not found.")
+    return await service.list_deliveries(webhook_id, limit)
+
+
 @router.post("/test/{webhook_id}", status_code=status.HTTP_200_OK)
-def test_webhook(webhook_id: int, db: Session = Depends(get_db)) -> dict:
+async def test_webhook(webhook_id: int, db: AsyncSession = Depends(get_async_db)) -> dict:
     """Trigger webhook test task."""
-    service = WebhookService(db)
-    target = service.get_webhook(webhook_id)
+    service = AsyncWebhookService(db)
+    target = await service.get_webhook(webhook_id)
     if not target:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Webhook not found.")
 
@@ -60,5 +77,5 @@ def test_webhook(webhook_id: int, db: Session = Depends(get_db)) -> dict:
         "timestamp": "2025-11-19T14:05:12Z",
         "message": "This is a test webhook fired from your product importer app.",
     }
-    task = send_webhook_task.delay(webhook_id, str(target.url), payload)
+    task = await run_in_threadpool(send_webhook_task.delay, webhook_id, str(target.url), payload)
     return {"task_id": task.id}
@@ -1,8 +1,9 @@
 """Pydantic schemas."""
 
-from typing import Optional
+from datetime import datetime
+from typing import Literal, Optional
 
-from pydantic import BaseModel, ConfigDict, HttpUrl, field_validator
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl, field_validator
 
 
 class ProductBase(BaseModel):
@@ -37,6 +38,37 @@ class ProductRead(ProductBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ProductBatchOperation(BaseModel):
+    """One create/update/delete; update and delete target ``id`` or, failing that, ``sku``."""
+
+    op: Literal["create", "update", "delete"]
+    id: Optional[int] = None
+    sku: Optional[str] = None
+    data: Optional[ProductUpdate] = None
+
+
+class ProductBatchRequest(BaseModel):
+    operations: list[ProductBatchOperation] = Field(..., min_length=1, max_length=10_000)
+    mode: Literal["atomic", "best_effort"] = "atomic"
+
+
+class ProductBatchItemResult(BaseModel):
+    index: int
+    op: str
+    status: Literal["ok", "error", "skipped"]
+    id: Optional[int] = None
+    sku: Optional[str] = None
+    error: Optional[str] = None
+
+
+class ProductBatchResponse(BaseModel):
+    mode: str
+    committed: bool
+    succeeded: int
+    failed: int
+    results: list[ProductBatchItemResult]
+
+
 class WebhookBase(BaseModel):
     url: HttpUrl
     event_type: str
@@ -59,12 +91,46 @@ class WebhookRead(WebhookBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class WebhookDeliveryRead(BaseModel):
+    id: int
+    event: Optional[str] = None
+    attempt: int
+    status: str
+    status_code: Optional[int] = None
+    elapsed_ms: Optional[float] = None
+    error: Optional[str] = None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class WebhookDeliveryStats(BaseModel):
+    attempts: int
+    delivered: int
+    failed: int
+    retrying: int
+    skipped: int
+    success_rate: Optional[float] = None  # delivered / (delivered + failed); pending retries excluded
+    avg_ms: Optional[float] = None
+    p50_ms: Optional[float] = None
+    p95_ms: Optional[float] = None
+    max_ms: Optional[float] = None
+
+
+class WebhookDeliveryLog(BaseModel):
+    webhook_id: int
+    stats: WebhookDeliveryStats
+    items: list[WebhookDeliveryRead]
+
+
 class PaginatedProducts(BaseModel):
     items: list[ProductRead]
-    total: int
+    total: Optional[int] = None
     page: int
-    total_pages: int
+    total_pages: Optional[int] = None
     limit: int
+    next_cursor: Optional[str] = None
+    estimated_total: Optional[int] = None
 
 
 class UploadStatus(BaseModel):
@@ -73,3 +139,22 @@ class UploadStatus(BaseModel):
     total: int
     percent: float
     message: Optional[str] = None
+    phase: Optional[str] = None
+    rejected: int = 0  # rows left out by validation, see GET /upload/{task_id}/rejects
+    inserted: Optional[int] = None
+    updated: Optional[int] = None
+    unchanged: Optional[int] = None
+
+
+class UploadSessionCreate(BaseModel):
+    filename: str = Field(..., min_length=1)
+    size: int = Field(..., gt=0, description="Total file size in bytes.")
+
+
+class UploadSessionRead(BaseModel):
+    upload_id: str
+    filename: str
+    size: int
+    part_size: int
+    part_count: int
+    missing_parts: list[int]
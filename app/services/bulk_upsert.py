@@ -0,0 +1,162 @@
+"""Set-based product upsert helpers."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict, Iterable, List
+
+from sqlalchemy import Float, func, or_, select, type_coerce
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models import Product
+from app.utils.csv_parser import ProductRow
+
+_INSERT_BUILDERS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def merge_duplicate_rows(rows: Iterable[ProductRow]) -> List[Dict]:
+    """
+    Collapse rows sharing a SKU, applying them in file order.
+
+    Mirrors the row-by-row merge rules: name and description are overwritten
+    by the later row, price and active only when the later row provides them.
+    Takes ``ProductRow`` tuples and returns one insert-ready dict per SKU.
+    """
+    merged: Dict[str, Dict] = {}
+    for sku, name, description, price, active in rows:
+        sku = sku.lower()
+        current = merged.get(sku)
+        if current is None:
+            merged[sku] = {"sku": sku, "name": name, "description": description, "price": price, "active": active}
+            continue
+        current["name"] = name
+        current["description"] = description
+        if price is not None:
+            current["price"] = price
+        if active is not None:
+            current["active"] = active
+    return list(merged.values())
+
+
+def _insert_for(session: Session):
+    dialect = session.get_bind().dialect.name
+    try:
+        return _INSERT_BUILDERS[dialect]
+    except KeyError:
+        raise ValueError(f"Bulk upsert is not supported for the '{dialect}' dialect.") from None
+
+
+@dataclass
+class UpsertCounts:
+    """Distinct SKUs handled by an upsert, by outcome."""
+
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    def __add__(self, other: "UpsertCounts") -> "UpsertCounts":
+        return UpsertCounts(
+            self.inserted + other.inserted, self.updated + other.updated, self.unchanged + other.unchanged
+        )
+
+    @property
+    def written(self) -> int:
+        return self.inserted + self.updated
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+def upsert_products(session: Session, rows: Iterable[ProductRow]) -> UpsertCounts:
+    """
+    Insert or update a batch of products with set-based statements.
+
+    Uses ``INSERT ... ON CONFLICT (sku) DO UPDATE`` on Postgres and SQLite.
+    Rows without an ``active`` value are written in a separate statement that
+    leaves the stored flag untouched, since the column is NOT NULL and cannot
+    carry a "missing" marker through ``excluded``. The update only fires when
+    a value ``IS DISTINCT FROM`` the stored one, so re-importing unchanged
+    rows writes nothing. Does not commit.
+    """
+    merged = merge_duplicate_rows(rows)
+    if not merged:
+        return UpsertCounts()
+
+    existing = session.scalar(
+        select(func.count()).select_from(Product).where(Product.sku.in_([row["sku"] for row in merged]))
+    )
+    insert = _insert_for(session)
+    with_active = [row for row in merged if row["active"] is not None]
+    without_active = [{**row, "active": True} for row in merged if row["active"] is None]
+
+    written = 0
+    for batch, update_active in ((with_active, True), (without_active, False)):
+        if not batch:
+            continue
+        stmt = insert(Product)
+        set_ = {
+            "name": stmt.excluded.name,
+            "description": stmt.excluded.description,
+            "price": func.coalesce(stmt.excluded.price, Product.price),
+        }
+        if update_active:
+            set_["active"] = stmt.excluded.active
+        changed = or_(*(getattr(Product, column).is_distinct_from(value) for column, value in set_.items()))
+        upsert = stmt.on_conflict_do_update(index_elements=[Product.sku], set_=set_, where=changed)
+        # RETURNING yields inserted and updated rows only; skipped no-ops return nothing.
+        written += len(session.execute(upsert.returning(Product.id), batch).all())
+
+    inserted = len(merged) - existing
+    updated = written - inserted
+    return UpsertCounts(inserted=inserted, updated=updated, unchanged=existing - updated)
+
+
+_CENTS = Decimal("0.01")
+
+
+def _as_stored_price(price: float) -> float:
+    """The value Postgres' ``Numeric(10, 2)`` keeps for ``price``: its literal, rounded half away from zero."""
+    return float(Decimal(repr(price)).quantize(_CENTS, rounding=ROUND_HALF_UP))
+
+
+def diff_products(session: Session, rows: Iterable[ProductRow]) -> UpsertCounts:
+    """
+    Count what ``upsert_products`` would do with a batch, without writing.
+
+    Existing rows are fetched with one ``sku IN (...)`` lookup and compared
+    under the same merge rules (price and active only count when provided).
+    Prices are compared as stored: rounded to cents on Postgres, as the raw
+    float on SQLite, which has no fixed-point type.
+    """
+    merged = merge_duplicate_rows(rows)
+    if not merged:
+        return UpsertCounts()
+
+    rounded = session.get_bind().dialect.name == "postgresql"
+    query = select(
+        Product.sku, Product.name, Product.description, type_coerce(Product.price, Float).label("price"), Product.active
+    ).where(Product.sku.in_([row["sku"] for row in merged]))
+    stored = {row.sku: row for row in session.execute(query)}
+    counts = UpsertCounts()
+    for row in merged:
+        current = stored.get(row["sku"])
+        if current is None:
+            counts.inserted += 1
+        elif (
+            row["name"] != current.name
+            or row["description"] != current.description
+            or (
+                row["price"] is not None
+                and (_as_stored_price(row["price"]) if rounded else row["price"]) != current.price
+            )
+            or (row["active"] is not None and row["active"] != current.active)
+        ):
+            counts.updated += 1
+        else:
+            counts.unchanged += 1
+    return counts
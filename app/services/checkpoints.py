@@ -0,0 +1,72 @@
+"""Import checkpoint helpers."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlalchemy import delete, update
+from sqlalchemy.orm import Session
+
+from app.models import ImportCheckpoint
+from app.services.bulk_upsert import UpsertCounts
+
+
+def get_checkpoint(session: Session, task_id: str) -> Optional[ImportCheckpoint]:
+    return session.get(ImportCheckpoint, task_id)
+
+
+def start_checkpoint(
+    session: Session, task_id: str, file_path: str, total: int, chunk_size: int, mode: str
+) -> ImportCheckpoint:
+    """
+    Return the task's checkpoint, creating one at the start of the file if absent.
+
+    An existing checkpoint means this is a redelivery or resume of the same
+    import; its position is kept so the caller can seek past committed rows.
+    """
+    checkpoint = get_checkpoint(session, task_id)
+    if checkpoint is None:
+        checkpoint = ImportCheckpoint(
+            task_id=task_id,
+            file_path=file_path,
+            mode=mode,
+            chunk_size=chunk_size,
+            total=total,
+            byte_offset=0,
+            processed=0,
+        )
+        session.add(checkpoint)
+        session.commit()
+    return checkpoint
+
+
+def checkpoint_counts(checkpoint: ImportCheckpoint) -> UpsertCounts:
+    return UpsertCounts(inserted=checkpoint.inserted, updated=checkpoint.updated, unchanged=checkpoint.unchanged)
+
+
+def advance_checkpoint(
+    session: Session,
+    task_id: str,
+    byte_offset: int,
+    processed: int,
+    counts: UpsertCounts,
+    rejected: int = 0,
+    reject_bytes: int = 0,
+) -> None:
+    """Move the checkpoint forward; call before committing the chunk it covers."""
+    session.execute(
+        update(ImportCheckpoint)
+        .where(ImportCheckpoint.task_id == task_id)
+        .values(
+            byte_offset=byte_offset,
+            processed=processed,
+            rejected=rejected,
+            reject_bytes=reject_bytes,
+            **counts.as_dict(),
+        )
+    )
+
+
+def clear_checkpoint(session: Session, task_id: str) -> None:
+    session.execute(delete(ImportCheckpoint).where(ImportCheckpoint.task_id == task_id))
+    session.commit()
@@ -0,0 +1,124 @@
+"""Product event fan-out to webhook subscribers."""
+
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models import Webhook
+from app.tasks.webhook_sender import deliver_webhooks_task
+
+logger = logging.getLogger(__name__)
+
+PRODUCT_CREATED = "product.created"
+PRODUCT_UPDATED = "product.updated"
+PRODUCT_DELETED = "product.deleted"
+PRODUCT_IMPORTED = "product.imported"
+WILDCARD = "*"
+
+Subscription = Tuple[int, str]
+
+
+class SubscriptionCache:
+    """
+    Per-process cache of active webhooks grouped by event type.
+
+    All subscriptions are loaded with one query and reused until ``ttl``
+    seconds pass or ``invalidate`` is called, so emitting an event costs no
+    database round trip. Other processes pick up changes after the TTL.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._by_event: Optional[Dict[str, List[Subscription]]] = None
+        self._loaded_at = 0.0
+        self._lock = Lock()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._by_event = None
+
+    def get(self, event_type: str) -> List[Subscription]:
+        """Return (webhook_id, url) pairs subscribed to ``event_type`` or ``*``."""
+        with self._lock:
+            if self._by_event is None or time.monotonic() - self._loaded_at > self.ttl:
+                self._by_event = self._load()
+                self._loaded_at = time.monotonic()
+            return self._by_event.get(event_type, []) + self._by_event.get(WILDCARD, [])
+
+    @staticmethod
+    def _load() -> Dict[str, List[Subscription]]:
+        grouped: Dict[str, List[Subscription]] = {}
+        with SessionLocal() as session:
+            rows = session.execute(select(Webhook.id, Webhook.url, Webhook.event_type).where(Webhook.active.is_(True)))
+            for webhook_id, url, event_type in rows:
+                grouped.setdefault(event_type, []).append((webhook_id, url))
+        return grouped
+
+
+subscriptions = SubscriptionCache(ttl=get_settings().webhook_subscription_ttl_seconds)
+
+
+def _batches(items: Sequence, size: int) -> Iterable[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _dispatch(targets: List[Subscription], payloads: List[Dict]) -> int:
+    deliveries = [
+        {"webhook_id": webhook_id, "url": url, "payload": payload}
+        for payload in payloads
+        for webhook_id, url in targets
+    ]
+    sent = 0
+    try:
+        # Several deliveries per task so the worker sends them concurrently
+        # over its pooled client instead of one task round trip per POST.
+        for batch in _batches(deliveries, get_settings().webhook_deliveries_per_task):
+            deliver_webhooks_task.delay(list(batch))
+            sent += len(batch)
+    except Exception:  # noqa: BLE001
+        # Events are best effort: a broker hiccup must not fail the write
+        # that already committed.
+        logger.exception("Failed to dispatch %s webhook deliveries", payloads[0]["event"])
+    return sent
+
+
+def emit(event_type: str, key: str, items: Sequence, extra: Optional[Dict] = None) -> int:
+    """
+    Send ``items`` to every active webhook subscribed to ``event_type``.
+
+    Items are split into payloads of ``settings.webhook_batch_size`` under
+    ``key``; returns the number of deliveries queued. Does nothing (not even
+    build payloads) when nobody is subscribed.
+    """
+    targets = subscriptions.get(event_type)
+    if not targets or not items:
+        return 0
+    timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    payloads = [
+        {"event": event_type, "timestamp": timestamp, **(extra or {}), key: list(batch)}
+        for batch in _batches(items, get_settings().webhook_batch_size)
+    ]
+    return _dispatch(targets, payloads)
+
+
+def emit_product_event(event_type: str, products: Sequence[Dict]) -> int:
+    """Emit created/updated/deleted events carrying product dicts."""
+    return emit(event_type, "products", products)
+
+
+def emit_imported(skus: Sequence[str], task_id: Optional[str] = None) -> int:
+    """Emit ``product.imported`` with batches of imported SKUs."""
+    return emit(PRODUCT_IMPORTED, "skus", skus, {"task_id": task_id} if task_id else None)
+
+
+def has_subscribers(event_type: str) -> bool:
+    return bool(subscriptions.get(event_type))
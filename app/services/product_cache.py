@@ -0,0 +1,149 @@
+"""Read-through cache for product listing pages, invalidated by a catalogue version."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Hashable, Optional, Tuple
+
+import redis
+
+from app.config import get_settings
+from app.services.redis_client import get_async_redis, get_redis
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "catalogue:version"
+PAGE_KEY_PREFIX = "products:page:"
+
+
+class CatalogueVersion:
+    """
+    Counter identifying the current state of the product catalogue.
+
+    Every committed product write bumps it. Cached pages and ETags embed
+    it, so one bump invalidates all of them without tracking which pages a
+    write touched. The counter lives in Redis, shared by API processes and
+    Celery workers. Without Redis there is no version (a per-process
+    counter would miss other processes' writes), so listings are neither
+    cached nor tagged. A missing counter (first use, flushed Redis) starts
+    from the current time, so versions handed out before are not reused. A
+    failed bump is logged; pages stay stale until the next write or their TTL.
+    """
+
+    def bump(self) -> None:
+        client = get_redis()
+        if client is None:
+            return
+        try:
+            pipe = client.pipeline()
+            pipe.set(VERSION_KEY, time.time_ns(), nx=True)
+            pipe.incr(VERSION_KEY)
+            pipe.execute()
+        except redis.RedisError as exc:
+            logger.warning("Failed to bump the catalogue version: %s", exc)
+
+    async def current(self) -> Optional[str]:
+        """Return the current version, or None without a reachable Redis (callers then skip caching)."""
+        client = get_async_redis()
+        if client is None:
+            return None
+        try:
+            version = await client.get(VERSION_KEY)
+            if version is None:
+                await client.set(VERSION_KEY, time.time_ns(), nx=True)
+                version = await client.get(VERSION_KEY)
+        except redis.RedisError as exc:
+            logger.warning("Failed to read the catalogue version: %s", exc)
+            return None
+        return version.decode()
+
+
+class PageCache:
+    """
+    Serialized listing pages: an in-process LRU with a TTL in front of Redis.
+
+    Keys start with the catalogue version, so entries of an older version
+    are never read again; they drop out of the LRU as it fills and expire
+    in Redis after ``ttl`` seconds. ``ttl <= 0`` disables the cache.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, Tuple[float, bytes]] = OrderedDict()
+        self._lock = Lock()
+
+    def _remember(self, key: str, body: bytes) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _recall(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        if self.ttl <= 0:
+            return None
+        body = self._recall(key)
+        if body is not None:
+            return body
+        client = get_async_redis()
+        if client is None:
+            return None
+        try:
+            body = await client.get(PAGE_KEY_PREFIX + key)
+        except redis.RedisError as exc:
+            logger.warning("Failed to read a cached product page: %s", exc)
+            return None
+        if body is not None:
+            self._remember(key, body)
+        return body
+
+    async def put(self, key: str, body: bytes) -> None:
+        if self.ttl <= 0:
+            return
+        self._remember(key, body)
+        client = get_async_redis()
+        if client is None:
+            return
+        try:
+            await client.set(PAGE_KEY_PREFIX + key, body, px=int(self.ttl * 1000))
+        except redis.RedisError as exc:
+            logger.warning("Failed to store a cached product page: %s", exc)
+
+
+def page_key(version: str, params: Tuple[Hashable, ...]) -> str:
+    """Cache key (and ETag value) of the page for normalized listing ``params`` at ``version``."""
+    digest = hashlib.blake2b(repr(params).encode(), digest_size=12).hexdigest()
+    return f"{version}-{digest}"
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an ``If-None-Match`` header names ``etag`` (weak comparison, as RFC 9110 requires)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+catalogue_version = CatalogueVersion()
+page_cache = PageCache(get_settings().product_cache_ttl_seconds, get_settings().product_cache_max_entries)
@@ -1,13 +1,160 @@
 """Product service layer."""
 
-from typing import List, Optional, Tuple
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
-from sqlalchemy import func, select
+from sqlalchemy import Row, Select, delete, func, insert, or_, select, text, update
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.models import Product
-from app.schemas import ProductCreate, ProductRead, ProductUpdate
-from app.utils.helpers import apply_pagination, normalize_sku, paginate
+from app.schemas import ProductBatchItemResult, ProductBatchOperation, ProductCreate, ProductRead, ProductUpdate
+from app.services.events import (
+    PRODUCT_CREATED,
+    PRODUCT_DELETED,
+    PRODUCT_UPDATED,
+    emit_product_event,
+    has_subscribers,
+)
+from app.services.product_cache import catalogue_version
+from app.services.search import apply_search, search_rank
+from app.utils.helpers import normalize_sku, paginate
+
+
+class BatchOperationError(ValueError):
+    """Raised when a single batch operation cannot be applied."""
+
+
+# Database errors that belong to the submitted values rather than the
+# connection: constraint conflicts and out-of-range/invalid data.
+_BATCH_WRITE_ERRORS = (IntegrityError, DataError)
+
+
+def _write_error(exc: Exception) -> str:
+    prefix = "Conflicting change" if isinstance(exc, IntegrityError) else "Invalid value"
+    return f"{prefix}: {getattr(exc, 'orig', exc)}"
+
+
+def _announce(event_type: str, products: List[Dict]) -> None:
+    """After a committed write: invalidate cached listings, then notify subscribers."""
+    catalogue_version.bump()
+    emit_product_event(event_type, products)
+
+
+_ESTIMATE_QUERY = text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'products'::regclass")
+
+
+def _filtered(
+    query,
+    dialect: str,
+    sku: Optional[str],
+    name: Optional[str],
+    active: Optional[bool],
+    description: Optional[str],
+    q: Optional[str] = None,
+):
+    """Apply the listing filters to a select."""
+    if sku:
+        sku_norm = normalize_sku(sku)
+        query = query.where(Product.sku.ilike(f"%{sku_norm}%"))
+    if name:
+        query = query.where(Product.name.ilike(f"%{name}%"))
+    if description:
+        query = query.where(Product.description.ilike(f"%{description}%"))
+    if active is not None:
+        query = query.where(Product.active.is_(active))
+    if q:
+        query = apply_search(query, q, dialect)
+    return query
+
+
+# The ``ProductRead`` fields. Listings select these as plain rows: no ORM
+# instances, identity map or change tracking for read-only pages.
+_PRODUCT_COLUMNS = (Product.id, Product.sku, Product.name, Product.description, Product.price, Product.active)
+
+
+@dataclass
+class _Listing:
+    """The queries behind one page of ``list_products``; ``count`` is None without a total."""
+
+    page: Select
+    count: Optional[Select]
+    ranked: bool
+
+    def result(
+        self, rows: Sequence[Row], total_count: Optional[int], page: int, limit: int, cursor: Optional[int]
+    ) -> Tuple[List[Dict], Optional[int], Optional[int], Optional[int]]:
+        next_cursor = rows[limit - 1].id if len(rows) > limit and not self.ranked else None
+        total_pages = None
+        if total_count is not None and cursor is None:
+            _, total_pages, _ = paginate(total_count, page, limit)
+        return [row._asdict() for row in rows[:limit]], total_count, total_pages, next_cursor
+
+
+def _listing(
+    dialect: str,
+    sku: Optional[str],
+    name: Optional[str],
+    active: Optional[bool],
+    description: Optional[str],
+    page: int,
+    limit: int,
+    cursor: Optional[int],
+    include_total: bool,
+    q: Optional[str],
+) -> _Listing:
+    ranked = bool(q) and cursor is None and dialect == "postgresql"
+    # One extra row tells us whether another page follows.
+    page_query = _filtered(select(*_PRODUCT_COLUMNS), dialect, sku, name, active, description, q)
+    if ranked:
+        page_query = page_query.order_by(search_rank(q).desc(), Product.id.desc())
+    else:
+        page_query = page_query.order_by(Product.id.desc())
+    page_query = page_query.limit(limit + 1)
+    if cursor is not None:
+        page_query = page_query.where(Product.id < cursor)
+    else:
+        page_query = page_query.offset((page - 1) * limit)
+    count_query = None
+    if include_total:
+        count_query = _filtered(select(func.count(Product.id)), dialect, sku, name, active, description, q)
+    return _Listing(page_query, count_query, ranked)
+
+
+def _new_product(payload: ProductCreate) -> Product:
+    """A product for ``payload`` with normalized SKU."""
+    return Product(
+        sku=normalize_sku(payload.sku),
+        name=payload.name,
+        description=payload.description,
+        price=payload.price,
+        active=payload.active if payload.active is not None else True,
+    )
+
+
+def _apply_update(product: Product, payload: ProductUpdate) -> None:
+    if payload.sku is not None:
+        product.sku = normalize_sku(payload.sku)
+    if payload.name is not None:
+        product.name = payload.name
+    if payload.description is not None:
+        product.description = payload.description
+    if payload.price is not None:
+        product.price = payload.price
+    if payload.active is not None:
+        product.active = payload.active
+
+
+@dataclass
+class _BatchEntry:
+    """A product as seen by the batch so far (``id`` is None until created)."""
+
+    id: Optional[int]
+    sku: str
+    create: Optional[Dict] = None
+    results: List[ProductBatchItemResult] = field(default_factory=list)
 
 
 class ProductService:
@@ -16,53 +163,52 @@ class ProductService:
     def __init__(self, db: Session):
         self.db = db
 
-    def list_products(
+    def _apply_filters(
         self,
+        query,
         sku: Optional[str],
         name: Optional[str],
         active: Optional[bool],
         description: Optional[str],
-        page: int,
-        limit: int,
-    ) -> Tuple[List[ProductRead], int, int]:
-        """Return paginated products with total count and total pages."""
-        base_query = select(Product)
-        count_query = select(func.count(Product.id))
-
-        if sku:
-            sku_norm = normalize_sku(sku)
-            base_query = base_query.where(Product.sku.ilike(f"%{sku_norm}%"))
-            count_query = count_query.where(Product.sku.ilike(f"%{sku_norm}%"))
-        if name:
-            base_query = base_query.where(Product.name.ilike(f"%{name}%"))
-            count_query = count_query.where(Product.name.ilike(f"%{name}%"))
-        if description:
-            base_query = base_query.where(Product.description.ilike(f"%{description}%"))
-            count_query = count_query.where(Product.description.ilike(f"%{description}%"))
-        if active is not None:
-            base_query = base_query.where(Product.active.is_(active))
-            count_query = count_query.where(Product.active.is_(active))
-
-        total_count = self.db.execute(count_query).scalar_one()
-        _, total_pages, _ = paginate(total_count, page, limit)
-        paginated_query = apply_pagination(base_query.order_by(Product.id.desc()), page, limit)
-        results = self.db.execute(paginated_query).scalars().all()
-
-        return [ProductRead.model_validate(prod) for prod in results], total_count, total_pages
+        q: Optional[str] = None,
+    ):
+        """Apply the listing filters to a select."""
+        return _filtered(query, self.db.get_bind().dialect.name, sku, name, active, description, q)
+
+    def stream_products(
+        self,
+        sku: Optional[str],
+        name: Optional[str],
+        active: Optional[bool],
+        description: Optional[str],
+        q: Optional[str] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Row]:
+        """
+        Yield filtered products as lightweight row tuples in id order.
+
+        Uses a server-side cursor (``stream_results`` + ``yield_per``) and a
+        column projection, so memory stays flat regardless of catalogue size.
+        On Postgres the transaction lifts ``statement_timeout`` (``SET LOCAL``,
+        so pooled connections keep theirs): a full-catalogue export, or the
+        sort before its first filtered row, can outlast the API's timeout.
+        """
+        if self.db.get_bind().dialect.name == "postgresql":
+            self.db.execute(text("SET LOCAL statement_timeout = 0"))
+        query = select(*_PRODUCT_COLUMNS)
+        query = self._apply_filters(query, sku, name, active, description, q).order_by(Product.id)
+        result = self.db.execute(query.execution_options(stream_results=True, yield_per=batch_size))
+        yield from result
 
     def create_product(self, payload: ProductCreate) -> ProductRead:
         """Create a new product with normalized SKU."""
-        product = Product(
-            sku=normalize_sku(payload.sku),
-            name=payload.name,
-            description=payload.description,
-            price=payload.price,
-            active=payload.active if payload.active is not None else True,
-        )
+        product = _new_product(payload)
         self.db.add(product)
         self.db.commit()
         self.db.refresh(product)
-        return ProductRead.model_validate(product)
+        created = ProductRead.model_validate(product)
+        _announce(PRODUCT_CREATED, [created.model_dump()])
+        return created
 
     def update_product(self, product_id: int, payload: ProductUpdate) -> Optional[ProductRead]:
         """Update product if exists."""
@@ -70,32 +216,375 @@ class ProductService:
         if not product:
             return None
 
-        if payload.sku is not None:
-            product.sku = normalize_sku(payload.sku)
-        if payload.name is not None:
-            product.name = payload.name
-        if payload.description is not None:
-            product.description = payload.description
-        if payload.price is not None:
-            product.price = payload.price
-        if payload.active is not None:
-            product.active = payload.active
-
+        _apply_update(product, payload)
         self.db.commit()
         self.db.refresh(product)
-        return ProductRead.model_validate(product)
+        updated = ProductRead.model_validate(product)
+        _announce(PRODUCT_UPDATED, [updated.model_dump()])
+        return updated
 
     def delete_product(self, product_id: int) -> bool:
         """Delete product by id."""
         product = self.db.get(Product, product_id)
         if not product:
             return False
+        deleted = {"id": product.id, "sku": product.sku}
         self.db.delete(product)
         self.db.commit()
+        _announce(PRODUCT_DELETED, [deleted])
         return True
 
-    def delete_all_products(self) -> int:
-        """Delete all products and return count."""
-        count = self.db.query(Product).delete()
-        self.db.commit()
-        return count
+    def count_products(
+        self,
+        sku: Optional[str] = None,
+        name: Optional[str] = None,
+        active: Optional[bool] = None,
+        description: Optional[str] = None,
+        q: Optional[str] = None,
+    ) -> int:
+        """Count the products matching the listing filters."""
+        return self.db.execute(
+            self._apply_filters(select(func.count(Product.id)), sku, name, active, description, q)
+        ).scalar_one()
+
+    def delete_products(
+        self,
+        sku: Optional[str] = None,
+        name: Optional[str] = None,
+        active: Optional[bool] = None,
+        description: Optional[str] = None,
+        q: Optional[str] = None,
+        batch_size: int = 10000,
+        on_progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """
+        Delete the products matching the listing filters and return the count.
+
+        Rows go in id ranges holding at most ``batch_size`` matches, one
+        commit each, so locks and WAL per transaction stay bounded and
+        imports interleave with the delete. When someone subscribes to
+        ``product.deleted``, every batch's ids/SKUs are emitted as it
+        commits. Without filters or subscribers, Postgres truncates the
+        table instead. ``on_progress`` receives the running count after
+        every commit.
+        """
+        filters = (sku, name, active, description, q)
+        announce = has_subscribers(PRODUCT_DELETED)
+        unfiltered = not any((sku, name, description, q)) and active is None
+        if unfiltered and not announce and self.db.get_bind().dialect.name == "postgresql":
+            count = self.count_products()
+            self.db.execute(text("TRUNCATE products"))
+            self.db.commit()
+            catalogue_version.bump()
+            if on_progress:
+                on_progress(count)
+            return count
+
+        count, last_id = 0, 0
+        while True:
+            # Upper id of the next batch; None once fewer than batch_size matches remain.
+            upper = self.db.execute(
+                self._apply_filters(select(Product.id), *filters)
+                .where(Product.id > last_id)
+                .order_by(Product.id)
+                .offset(batch_size - 1)
+                .limit(1)
+            ).scalar_one_or_none()
+            statement = self._apply_filters(delete(Product), *filters).where(Product.id > last_id)
+            if upper is not None:
+                statement = statement.where(Product.id <= upper)
+            statement = statement.execution_options(synchronize_session=False)
+            if announce:
+                rows = self.db.execute(statement.returning(Product.id, Product.sku)).all()
+                deleted = len(rows)
+            else:
+                deleted = self.db.execute(statement).rowcount
+            self.db.commit()
+            count += deleted
+            if deleted:
+                catalogue_version.bump()
+                if announce:
+                    emit_product_event(PRODUCT_DELETED, [{"id": product_id, "sku": sku} for product_id, sku in rows])
+            if on_progress:
+                on_progress(count)
+            if upper is None:
+                return count
+            last_id = upper
+
+    def apply_batch(
+        self, operations: List[ProductBatchOperation], atomic: bool = True
+    ) -> Tuple[List[ProductBatchItemResult], bool]:
+        """
+        Apply mixed create/update/delete operations in one transaction.
+
+        Targets are resolved with a single lookup and operations are replayed
+        in order against that snapshot (so create-then-update or
+        delete-then-recreate of a SKU behave as if applied one by one), then
+        written as at most one DELETE, one bulk UPDATE and one multi-row
+        INSERT. In atomic mode any failure writes nothing and the remaining
+        items are reported as skipped; in best-effort mode failed items are
+        dropped, and a conflict or invalid value in the set-based write falls
+        back to applying the pending writes one at a time under savepoints.
+
+        Returns the per-item results and whether anything was committed.
+        """
+        by_id, by_sku = self._load_batch_targets(operations)
+        results: List[ProductBatchItemResult] = []
+        creates: List[_BatchEntry] = []
+        updates: Dict[int, Dict] = {}
+        deletes: Dict[int, ProductBatchItemResult] = {}
+        touched: Dict[int, List[ProductBatchItemResult]] = {}
+
+        for index, operation in enumerate(operations):
+            result = ProductBatchItemResult(index=index, op=operation.op, status="ok")
+            results.append(result)
+            fields = operation.data.model_dump(exclude_none=True) if operation.data else {}
+            if "sku" in fields:
+                fields["sku"] = normalize_sku(fields["sku"].strip())
+            try:
+                if operation.op == "create":
+                    sku = normalize_sku((operation.sku or fields.get("sku") or "").strip())
+                    if not sku:
+                        raise BatchOperationError("SKU is required to create a product.")
+                    if sku in by_sku:
+                        raise BatchOperationError(f"SKU '{sku}' already exists.")
+                    values = {"name": None, "description": None, "price": None, "active": True, **fields, "sku": sku}
+                    entry = _BatchEntry(id=None, sku=sku, create=values, results=[result])
+                    by_sku[sku] = entry
+                    creates.append(entry)
+                    result.sku = sku
+                    continue
+
+                entry = self._resolve_batch_target(operation, by_id, by_sku)
+                result.id, result.sku = entry.id, entry.sku
+                if operation.op == "update":
+                    new_sku = fields.get("sku")
+                    if new_sku and new_sku != entry.sku:
+                        if new_sku in by_sku:
+                            raise BatchOperationError(f"SKU '{new_sku}' already exists.")
+                        del by_sku[entry.sku]
+                        by_sku[new_sku] = entry
+                        entry.sku = result.sku = new_sku
+                    if entry.create is not None:
+                        entry.create.update(fields)
+                        entry.results.append(result)
+                    elif fields:
+                        updates.setdefault(entry.id, {"id": entry.id}).update(fields)
+                        touched.setdefault(entry.id, []).append(result)
+                else:
+                    del by_sku[entry.sku]
+                    if entry.create is not None:
+                        creates.remove(entry)
+                    else:
+                        del by_id[entry.id]
+                        updates.pop(entry.id, None)
+                        deletes[entry.id] = result
+            except BatchOperationError as exc:
+                result.status, result.error = "error", str(exc)
+
+        if atomic and any(result.status == "error" for result in results):
+            for result in results:
+                if result.status == "ok":
+                    result.status = "skipped"
+            return results, False
+
+        try:
+            self._write_batch(creates, updates, deletes)
+            self.db.commit()
+        except _BATCH_WRITE_ERRORS as exc:
+            self.db.rollback()
+            if atomic:
+                for result in results:
+                    if result.status == "ok":
+                        result.status, result.error = "error", _write_error(exc)
+                return results, False
+            self._write_batch_individually(creates, updates, deletes, touched)
+            self.db.commit()
+        catalogue_version.bump()
+        self._emit_batch_events(creates, updates, deletes, touched)
+        return results, any(result.status == "ok" for result in results)
+
+    def _emit_batch_events(
+        self,
+        creates: List[_BatchEntry],
+        updates: Dict[int, Dict],
+        deletes: Dict[int, ProductBatchItemResult],
+        touched: Dict[int, List[ProductBatchItemResult]],
+    ) -> None:
+        """Emit one batched event per change type for the writes that committed."""
+        created = [{"id": entry.id, **entry.create} for entry in creates if entry.id is not None]
+        emit_product_event(PRODUCT_CREATED, created)
+
+        updated_ids = [pid for pid in updates if all(result.status == "ok" for result in touched[pid])]
+        if updated_ids and has_subscribers(PRODUCT_UPDATED):
+            rows = self.db.execute(select(Product).where(Product.id.in_(updated_ids))).scalars()
+            emit_product_event(PRODUCT_UPDATED, [ProductRead.model_validate(row).model_dump() for row in rows])
+
+        deleted = [{"id": pid, "sku": result.sku} for pid, result in deletes.items() if result.status == "ok"]
+        emit_product_event(PRODUCT_DELETED, deleted)
+
+    def _load_batch_targets(
+        self, operations: List[ProductBatchOperation]
+    ) -> Tuple[Dict[int, _BatchEntry], Dict[str, _BatchEntry]]:
+        """Fetch every product a batch references by id or SKU in one query."""
+        ids = {op.id for op in operations if op.id is not None}
+        skus = {normalize_sku(op.sku.strip()) for op in operations if op.sku}
+        skus |= {normalize_sku(op.data.sku.strip()) for op in operations if op.data and op.data.sku}
+        by_id: Dict[int, _BatchEntry] = {}
+        by_sku: Dict[str, _BatchEntry] = {}
+        if not ids and not skus:
+            return by_id, by_sku
+        query = select(Product.id, Product.sku).where(or_(Product.id.in_(ids), Product.sku.in_(skus)))
+        for product_id, sku in self.db.execute(query):
+            entry = _BatchEntry(id=product_id, sku=sku)
+            by_id[product_id] = by_sku[sku] = entry
+        return by_id, by_sku
+
+    @staticmethod
+    def _resolve_batch_target(
+        operation: ProductBatchOperation, by_id: Dict[int, _BatchEntry], by_sku: Dict[str, _BatchEntry]
+    ) -> _BatchEntry:
+        if operation.id is not None:
+            entry = by_id.get(operation.id)
+        elif operation.sku:
+            entry = by_sku.get(normalize_sku(operation.sku.strip()))
+        else:
+            raise BatchOperationError("Either id or sku is required.")
+        if entry is None:
+            raise BatchOperationError("Product not found.")
+        return entry
+
+    def _write_batch(
+        self, creates: List[_BatchEntry], updates: Dict[int, Dict], deletes: Dict[int, ProductBatchItemResult]
+    ) -> None:
+        """Issue the set-based DELETE, UPDATE and INSERT for a batch (no commit)."""
+        if deletes:
+            self.db.execute(delete(Product).where(Product.id.in_(list(deletes))))
+        if updates:
+            self.db.execute(update(Product), list(updates.values()))
+        if creates:
+            rows = self.db.execute(
+                insert(Product).returning(Product.id, Product.sku), [entry.create for entry in creates]
+            ).all()
+            new_ids = {sku: product_id for product_id, sku in rows}
+            for entry in creates:
+                entry.id = new_ids[entry.create["sku"]]
+                for result in entry.results:
+                    result.id = entry.id
+
+    def _write_batch_individually(
+        self,
+        creates: List[_BatchEntry],
+        updates: Dict[int, Dict],
+        deletes: Dict[int, ProductBatchItemResult],
+        touched: Dict[int, List[ProductBatchItemResult]],
+    ) -> None:
+        """Best-effort fallback: apply each pending write under its own savepoint."""
+        writes = [
+            ([result], delete(Product).where(Product.id == product_id), None, None)
+            for product_id, result in deletes.items()
+        ]
+        writes += [(touched[product_id], update(Product), [values], None) for product_id, values in updates.items()]
+        writes += [(entry.results, insert(Product).returning(Product.id), [entry.create], entry) for entry in creates]
+
+        for item_results, statement, params, created in writes:
+            try:
+                with self.db.begin_nested():
+                    outcome = self.db.execute(statement, params) if params else self.db.execute(statement)
+                    if created is not None:
+                        created.id = outcome.scalar_one()
+                        for result in item_results:
+                            result.id = created.id
+            except _BATCH_WRITE_ERRORS as exc:
+                for result in item_results:
+                    result.status, result.error = "error", _write_error(exc)
+
+
+class AsyncProductService:
+    """
+    The product operations the API serves per request, on an asyncio session.
+
+    Listings exist only here; writes share their helpers with
+    ``ProductService``. Events are emitted from the threadpool, since
+    loading subscriptions and queueing deliveries block. Batch writes,
+    exports and bulk deletes stay on ``ProductService``.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def list_products(
+        self,
+        sku: Optional[str],
+        name: Optional[str],
+        active: Optional[bool],
+        description: Optional[str],
+        page: int,
+        limit: int,
+        cursor: Optional[int] = None,
+        include_total: bool = True,
+        q: Optional[str] = None,
+    ) -> Tuple[List[Dict], Optional[int], Optional[int], Optional[int]]:
+        """
+        Return a page of products, total count, total pages and the next cursor.
+
+        Products are plain dicts with the ``ProductRead`` fields (``price``
+        as stored, a ``Decimal``), ready for ``json_bytes``.
+
+        With ``cursor`` (the last id seen) the page is fetched by keyset
+        (``id < cursor``) instead of OFFSET, so deep pages cost the same as the
+        first. ``include_total=False`` skips the count query; total and total
+        pages are then None. Total pages are only reported in page mode. The
+        next cursor is None on the last page.
+
+        ``q`` is a free-text search over sku, name and description. On
+        Postgres, page-mode results are ordered by relevance (and carry no
+        cursor, since the order is not by id); elsewhere it falls back to
+        ILIKE matching.
+        """
+        dialect = self.db.get_bind().dialect.name
+        listing = _listing(dialect, sku, name, active, description, page, limit, cursor, include_total, q)
+        rows = (await self.db.execute(listing.page)).all()
+        total_count = (await self.db.execute(listing.count)).scalar_one() if listing.count is not None else None
+        return listing.result(rows, total_count, page, limit, cursor)
+
+    async def estimate_total(self) -> Optional[int]:
+        """Return the planner's row estimate for products (Postgres only)."""
+        if self.db.get_bind().dialect.name != "postgresql":
+            return None
+        estimate = (await self.db.execute(_ESTIMATE_QUERY)).scalar_one_or_none()
+        return max(int(estimate), 0) if estimate is not None else None
+
+    async def create_product(self, payload: ProductCreate) -> ProductRead:
+        """Create a new product with normalized SKU."""
+        product = _new_product(payload)
+        self.db.add(product)
+        await self.db.commit()
+        await self.db.refresh(product)
+        created = ProductRead.model_validate(product)
+        await run_in_threadpool(_announce, PRODUCT_CREATED, [created.model_dump()])
+        return created
+
+    async def update_product(self, product_id: int, payload: ProductUpdate) -> Optional[ProductRead]:
+        """Update product if exists."""
+        product = await self.db.get(Product, product_id)
+        if not product:
+            return None
+
+        _apply_update(product, payload)
+        await self.db.commit()
+        await self.db.refresh(product)
+        updated = ProductRead.model_validate(product)
+        await run_in_threadpool(_announce, PRODUCT_UPDATED, [updated.model_dump()])
+        return updated
+
+    async def delete_product(self, product_id: int) -> bool:
+        """Delete product by id."""
+        product = await self.db.get(Product, product_id)
+        if not product:
+            return False
+        deleted = {"id": product.id, "sku": product.sku}
+        await self.db.delete(product)
+        await self.db.commit()
+        await run_in_threadpool(_announce, PRODUCT_DELETED, [deleted])
+        return True
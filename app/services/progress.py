@@ -2,27 +2,94 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, asdict
+import logging
 from threading import Lock
 from typing import Dict, Optional
 
+import redis
+
+from app.config import get_settings
+from app.services.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
 
-@dataclass
 class ProgressRecord:
-    status: str  # processing | completed | error
-    processed: int
-    total: int
-    percent: float
-    message: Optional[str] = None
-    error: Optional[str] = None
+    """Compact progress snapshot; ``percent`` is derived, not stored."""
+
+    __slots__ = (
+        "status", "processed", "total", "message", "error", "phase", "rejected", "inserted", "updated", "unchanged"
+    )
+    _COUNTS = ("inserted", "updated", "unchanged")
+
+    def __init__(
+        self,
+        status: str,  # processing | completed | error
+        processed: int,
+        total: int,
+        message: Optional[str] = None,
+        error: Optional[str] = None,
+        phase: Optional[str] = None,
+        rejected: int = 0,
+        inserted: Optional[int] = None,
+        updated: Optional[int] = None,
+        unchanged: Optional[int] = None,
+    ):
+        self.status = status
+        self.processed = processed
+        self.total = total
+        self.message = message
+        self.error = error
+        self.phase = phase
+        self.rejected = rejected
+        self.inserted = inserted
+        self.updated = updated
+        self.unchanged = unchanged
+
+    @property
+    def percent(self) -> float:
+        if self.status == "completed":
+            return 100.0 if self.total else 0.0
+        # Rejected rows are part of ``total`` (every data row) but never of ``processed``.
+        return round(min((self.processed + self.rejected) / self.total, 1.0) * 100, 2) if self.total else 0.0
 
     def as_dict(self) -> Dict[str, Optional[float]]:
         """Return serializable representation."""
-        return asdict(self)
+        return {
+            "status": self.status,
+            "processed": self.processed,
+            "total": self.total,
+            "percent": self.percent,
+            "message": self.message,
+            "error": self.error,
+            "phase": self.phase,
+            "rejected": self.rejected,
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
+        }
+
+    def to_fields(self) -> Dict[str, str]:
+        """Flatten to Redis hash fields (None values are omitted)."""
+        return {name: str(getattr(self, name)) for name in self.__slots__ if getattr(self, name) is not None}
+
+    @classmethod
+    def from_fields(cls, fields: Dict[bytes, bytes]) -> "ProgressRecord":
+        values = {key.decode(): value.decode() for key, value in fields.items()}
+        return cls(
+            status=values.get("status", "processing"),
+            processed=int(values.get("processed", 0)),
+            total=int(values.get("total", 0)),
+            message=values.get("message"),
+            error=values.get("error"),
+            phase=values.get("phase"),
+            rejected=int(values.get("rejected", 0)),
+            **{name: int(values[name]) for name in cls._COUNTS if name in values},
+        )
 
 
 class ProgressStore:
-    """Thread-safe in-memory progress store."""
+    """Thread-safe in-memory progress store (single process and tests)."""
 
     def __init__(self):
         self._store: Dict[str, ProgressRecord] = {}
@@ -37,28 +104,99 @@ class ProgressStore:
             record = self._store.get(task_id)
             return record.as_dict() if record else None
 
+    def increment(self, task_id: str, amount: int, field: str = "processed") -> int:
+        """Atomically add ``amount`` to a counter (``processed`` or ``rejected``) and return the new value."""
+        with self._lock:
+            record = self._store.setdefault(task_id, ProgressRecord("processing", 0, 0))
+            setattr(record, field, getattr(record, field) + amount)
+            return getattr(record, field)
+
     def update_progress(
-        self, task_id: str, processed: int, total: int, message: str
+        self,
+        task_id: str,
+        processed: int,
+        total: int,
+        message: str,
+        phase: Optional[str] = None,
+        rejected: int = 0,
     ) -> None:
-        percent = round((processed / total) * 100, 2) if total else 0.0
-        record = ProgressRecord(
-            status="processing", processed=processed, total=total, percent=percent, message=message
-        )
-        self.set(task_id, record)
+        self.set(task_id, ProgressRecord("processing", processed, total, message, phase=phase, rejected=rejected))
 
-    def mark_complete(self, task_id: str, processed: int, total: int) -> None:
-        percent = 100.0 if total else 0.0
+    def mark_complete(
+        self,
+        task_id: str,
+        processed: int,
+        total: int,
+        counts: Optional[Dict[str, int]] = None,
+        rejected: int = 0,
+        message: str = "Completed",
+    ) -> None:
+        """``counts`` holds the import's ``inserted``/``updated``/``unchanged`` totals."""
         record = ProgressRecord(
-            status="completed", processed=processed, total=total, percent=percent, message="Completed"
+            "completed", processed, total or processed, message, rejected=rejected, **(counts or {})
         )
         self.set(task_id, record)
 
-    def mark_error(self, task_id: str, processed: int, total: int, error: str) -> None:
-        percent = round((processed / total) * 100, 2) if total else 0.0
-        record = ProgressRecord(
-            status="error", processed=processed, total=total, percent=percent, message="Error", error=error
-        )
-        self.set(task_id, record)
+    def mark_error(self, task_id: str, processed: int, total: int, error: str, rejected: int = 0) -> None:
+        self.set(task_id, ProgressRecord("error", processed, total, "Error", error=error, rejected=rejected))
+
+
+class RedisProgressStore(ProgressStore):
+    """
+    Progress store backed by one Redis hash per task, expiring after ``ttl`` seconds.
+
+    Reads are a single ``HGETALL``; parallel import shards add to the same
+    ``processed`` field with ``HINCRBY``, so there is no read-modify-write
+    race between them. Redis errors are logged and swallowed on writes (a
+    lost progress update must not fail an import) and read as "no record".
+    """
+
+    def __init__(self, client: redis.Redis, ttl: int):
+        self._redis = client
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(task_id: str) -> str:
+        return f"progress:{task_id}"
+
+    def set(self, task_id: str, record: ProgressRecord) -> None:
+        key = self._key(task_id)
+        try:
+            pipe = self._redis.pipeline()
+            pipe.delete(key)
+            pipe.hset(key, mapping=record.to_fields())
+            pipe.expire(key, self.ttl)
+            pipe.execute()
+        except redis.RedisError as exc:
+            logger.warning("Failed to store progress for %s: %s", task_id, exc)
+
+    def get(self, task_id: str) -> Optional[Dict[str, Optional[float]]]:
+        try:
+            fields = self._redis.hgetall(self._key(task_id))
+        except redis.RedisError as exc:
+            logger.warning("Failed to read progress for %s: %s", task_id, exc)
+            return None
+        return ProgressRecord.from_fields(fields).as_dict() if fields else None
+
+    def increment(self, task_id: str, amount: int, field: str = "processed") -> int:
+        key = self._key(task_id)
+        try:
+            pipe = self._redis.pipeline()
+            pipe.hincrby(key, field, amount)
+            pipe.expire(key, self.ttl)
+            processed, _ = pipe.execute()
+            return processed
+        except redis.RedisError as exc:
+            logger.warning("Failed to store progress for %s: %s", task_id, exc)
+            return 0
+
+
+def create_progress_store() -> ProgressStore:
+    """Return a Redis-backed store when ``redis_url`` is set, else an in-memory one."""
+    client = get_redis()
+    if client is None:
+        return ProgressStore()
+    return RedisProgressStore(client, get_settings().progress_ttl_seconds)
 
 
-progress_store = ProgressStore()
+progress_store = create_progress_store()
@@ -0,0 +1,118 @@
+"""Import progress notifications over Redis pub/sub."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from typing import Dict, Optional
+
+import redis
+import redis.asyncio as aioredis
+
+from app.config import get_settings
+from app.services.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+def progress_channel(task_id: str) -> str:
+    return f"import-progress:{task_id}"
+
+
+class Throttle:
+    """Allow an action at most once per ``interval`` seconds."""
+
+    __slots__ = ("interval", "_last")
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._last = float("-inf")
+
+    def due(self) -> bool:
+        now = time.monotonic()
+        if now - self._last < self.interval:
+            return False
+        self._last = now
+        return True
+
+
+def publish_progress(task_id: str, message: Dict) -> None:
+    """
+    Publish ``message``, a full status snapshot of ``task_id``; best effort.
+
+    Import and bulk-delete tasks call this right after writing the same
+    state to the progress store: on every (throttled) progress update, on
+    failure, and with the result on completion. Parallel-import shards
+    publish the progress hash as read back after their increment, so every
+    message carries the whole status (``status``, ``processed``, ``total``,
+    ...) and subscribers only need the latest one. Nothing is sent when
+    ``settings.redis_url`` is empty.
+    """
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.publish(progress_channel(task_id), json.dumps(message))
+    except redis.RedisError as exc:
+        # Stream subscribers re-read the progress store after a heartbeat without messages.
+        logger.warning("Failed to publish progress for %s: %s", task_id, exc)
+
+
+class ProgressSubscription:
+    """
+    Async context manager subscribed to one task's progress channel.
+
+    ``next_messages`` waits up to ``timeout`` seconds for a message and then
+    drains everything already queued, so a burst of updates is handed back
+    (and rendered) once. Without Redis it just sleeps for ``timeout`` and
+    returns nothing, leaving the caller to poll.
+    """
+
+    def __init__(self, task_id: str):
+        self.task_id = task_id
+        self._client: Optional[aioredis.Redis] = None
+        self._pubsub = None
+
+    async def __aenter__(self) -> "ProgressSubscription":
+        url = get_settings().redis_url
+        if url:
+            try:
+                self._client = aioredis.Redis.from_url(url)
+                self._pubsub = self._client.pubsub()
+                await self._pubsub.subscribe(progress_channel(self.task_id))
+            except redis.RedisError as exc:
+                logger.warning("Progress pub/sub unavailable, falling back to polling: %s", exc)
+                await self._close()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._close()
+
+    @property
+    def live(self) -> bool:
+        return self._pubsub is not None
+
+    async def _close(self) -> None:
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def next_messages(self, timeout: float) -> list[Dict]:
+        if self._pubsub is None:
+            await asyncio.sleep(timeout)
+            return []
+        messages = []
+        try:
+            message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+            while message is not None:
+                messages.append(json.loads(message["data"]))
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=0)
+        except redis.RedisError as exc:
+            logger.warning("Progress pub/sub lost, falling back to polling: %s", exc)
+            await self._close()
+        return messages
@@ -0,0 +1,49 @@
+"""Shared Redis client for coordination state (progress, circuit breakers)."""
+
+from __future__ import annotations
+
+from threading import Lock
+from typing import Optional
+
+import redis
+import redis.asyncio as aioredis
+
+from app.config import get_settings
+
+_client: Optional[redis.Redis] = None
+_async_client: Optional[aioredis.Redis] = None
+_lock = Lock()
+
+
+def get_redis() -> Optional[redis.Redis]:
+    """
+    Return this process's client for ``settings.redis_url``, or None when unset.
+
+    The connection pool is created lazily and is fork-safe (redis-py resets
+    it in child processes), so Celery prefork workers can share the module.
+    """
+    global _client
+    url = get_settings().redis_url
+    if not url:
+        return None
+    with _lock:
+        if _client is None:
+            _client = redis.Redis.from_url(url)
+    return _client
+
+
+def get_async_redis() -> Optional[aioredis.Redis]:
+    """
+    Return this process's asyncio client for ``settings.redis_url``, or None when unset.
+
+    For the API's event loop; its connections belong to the loop that first
+    uses them.
+    """
+    global _async_client
+    url = get_settings().redis_url
+    if not url:
+        return None
+    with _lock:
+        if _async_client is None:
+            _async_client = aioredis.Redis.from_url(url)
+    return _async_client
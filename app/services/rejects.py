@@ -0,0 +1,103 @@
+"""Reject files: the rows an import left out, with line numbers and reasons."""
+
+from __future__ import annotations
+
+import csv
+import io
+import shutil
+from pathlib import Path
+from typing import BinaryIO, Iterable, Optional, Tuple
+from uuid import UUID
+
+from app.config import get_settings
+from app.utils.csv_parser import PRODUCT_COLUMNS
+
+REJECT_COLUMNS = ("line", "reason") + PRODUCT_COLUMNS
+
+
+def reject_dir() -> Path:
+    return Path(get_settings().temp_upload_dir) / "rejects"
+
+
+def reject_path(task_id: str) -> Path:
+    """Path of a task's reject CSV; raises LookupError for ids that are not UUIDs."""
+    try:
+        # Task ids are UUIDs; parsing keeps the path inside the reject directory.
+        return reject_dir() / f"{UUID(task_id)}.csv"
+    except ValueError:
+        raise LookupError(task_id) from None
+
+
+def shard_reject_path(task_id: str, start: int) -> Path:
+    """Reject rows of the parallel-import shard whose byte range begins at ``start``."""
+    return reject_path(task_id).with_suffix(f".{start}.part")
+
+
+class RejectWriter:
+    """
+    Collect rejected rows into a CSV, as the ``on_reject`` callback of the parser.
+
+    Columns are ``line``, ``reason`` and the raw product cells, so a fixed
+    reject file can be uploaded again as is (the import ignores the extra
+    columns). The file is only created once a row is rejected. Rows are
+    buffered until ``flush``, which returns the file size so a checkpoint
+    can record how much of it belongs to committed chunks; ``size`` reopens
+    an existing file at that point, dropping whatever was written after it.
+    """
+
+    def __init__(self, path: Path, count: int = 0, size: int = 0, header: bool = True):
+        self.path = path
+        self.count = count
+        self.size = size
+        self._header = header
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+        self._file: Optional[BinaryIO] = None
+
+    def __call__(self, line: int, reason: str, values: Tuple[str, ...]) -> None:
+        if self.count == 0 and self.size == 0 and self._header:
+            self._writer.writerow(REJECT_COLUMNS)
+        self._writer.writerow((line, reason, *values))
+        self.count += 1
+
+    def flush(self) -> int:
+        data = self._buffer.getvalue().encode("utf-8")
+        if data:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "r+b" if self.size else "wb")
+                self._file.truncate(self.size)
+                self._file.seek(self.size)
+            self._file.write(data)
+            self._file.flush()
+            self.size += len(data)
+            self._buffer.seek(0)
+            self._buffer.truncate()
+        return self.size
+
+    def close(self) -> int:
+        size = self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        return size
+
+
+def combine_shard_rejects(task_id: str, starts: Iterable[int]) -> None:
+    """Concatenate the shard reject files of a parallel import, in file order, into the task's reject CSV."""
+    parts = [shard_reject_path(task_id, start) for start in sorted(starts)]
+    parts = [part for part in parts if part.is_file()]
+    if not parts:
+        return
+    with open(reject_path(task_id), "w", newline="", encoding="utf-8") as out:
+        csv.writer(out).writerow(REJECT_COLUMNS)
+        out.flush()
+        for part in parts:
+            with open(part, "rb") as fh:
+                shutil.copyfileobj(fh, out.buffer)
+            part.unlink()
+
+
+def discard_shard_rejects(task_id: str, starts: Iterable[int]) -> None:
+    for start in starts:
+        shard_reject_path(task_id, start).unlink(missing_ok=True)
@@ -0,0 +1,118 @@
+"""Product search expressions and Postgres search indexes."""
+
+from __future__ import annotations
+
+import time
+
+from sqlalchemy import func, literal_column, or_, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+
+from app.models import Product
+
+# Text search configuration; must match between the index and the queries.
+SEARCH_CONFIG = "simple"
+
+_FULL_TEXT_INDEX = f"""
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_search_tsv ON products
+USING gin (to_tsvector('{SEARCH_CONFIG}', sku || ' ' || coalesce(name, '') || ' ' || coalesce(description, '')))
+"""
+
+_TRIGRAM_INDEXES = (
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_sku_trgm ON products USING gin (sku gin_trgm_ops)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_name_trgm ON products USING gin (name gin_trgm_ops)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_description_trgm "
+    "ON products USING gin (description gin_trgm_ops)",
+)
+
+SEARCH_INDEXES = (
+    "ix_products_search_tsv",
+    "ix_products_sku_trgm",
+    "ix_products_name_trgm",
+    "ix_products_description_trgm",
+)
+
+# An interrupted CONCURRENTLY build leaves an INVALID index that IF NOT EXISTS
+# would then skip forever; find those so they can be rebuilt. A build still
+# running in another session is INVALID too, hence the advisory lock below.
+_INVALID_INDEXES = text(
+    """
+    SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+    WHERE NOT i.indisvalid AND c.relname = ANY(:names)
+    """
+)
+
+# Advisory lock key serializing index builds across processes.
+_INDEX_BUILD_LOCK = 7_110_046
+_INDEX_BUILD_POLL_SECONDS = 1.0
+
+
+def ensure_search_indexes(engine: Engine) -> bool:
+    """
+    Create the Postgres full-text and trigram indexes if missing.
+
+    ``create_all`` skips indexes on tables that already exist, so these are
+    issued as idempotent DDL by ``python -m app.manage search-indexes``
+    rather than on API startup. They are built ``CONCURRENTLY`` (outside a
+    transaction), so a large existing table keeps taking writes while the
+    indexes build; the connection drops any ``statement_timeout`` so the
+    build is not cancelled, and holds an advisory lock so concurrent runs
+    wait for it instead of dropping each other's in-progress (INVALID) indexes.
+    Returns False when pg_trgm cannot be enabled (extension not installed
+    or insufficient privilege); substring filters then still work, just
+    without index support.
+    """
+    if engine.dialect.name != "postgresql":
+        return False
+    with engine.connect() as base:
+        conn = base.execution_options(isolation_level="AUTOCOMMIT")
+        conn.execute(text("SET statement_timeout = 0"))
+        # Poll rather than block in pg_advisory_lock: CREATE INDEX CONCURRENTLY
+        # waits out every open transaction, including a waiter's, and would deadlock.
+        while not conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": _INDEX_BUILD_LOCK}).scalar():
+            time.sleep(_INDEX_BUILD_POLL_SECONDS)
+        try:
+            for (index,) in conn.execute(_INVALID_INDEXES, {"names": list(SEARCH_INDEXES)}).all():
+                conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index}"))
+            conn.execute(text(_FULL_TEXT_INDEX))
+            try:
+                conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                for ddl in _TRIGRAM_INDEXES:
+                    conn.execute(text(ddl))
+            except DBAPIError:
+                return False
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _INDEX_BUILD_LOCK})
+    return True
+
+
+def _search_vector():
+    # Literal config/separators (not bind params) so Postgres matches the
+    # expression against ix_products_search_tsv.
+    document = (
+        Product.sku
+        + literal_column("' '")
+        + func.coalesce(Product.name, literal_column("''"))
+        + literal_column("' '")
+        + func.coalesce(Product.description, literal_column("''"))
+    )
+    return func.to_tsvector(literal_column(f"'{SEARCH_CONFIG}'"), document)
+
+
+def _search_query(q: str):
+    return func.websearch_to_tsquery(literal_column(f"'{SEARCH_CONFIG}'"), q)
+
+
+def apply_search(query, q: str, dialect: str):
+    """Filter a select by the free-text ``q`` term."""
+    if dialect == "postgresql":
+        return query.where(_search_vector().op("@@")(_search_query(q)))
+    pattern = f"%{q}%"
+    return query.where(
+        or_(Product.sku.ilike(pattern), Product.name.ilike(pattern), Product.description.ilike(pattern))
+    )
+
+
+def search_rank(q: str):
+    """Return the relevance expression for ordering ``q`` matches (Postgres only)."""
+    return func.ts_rank(_search_vector(), _search_query(q))
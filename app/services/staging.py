@@ -0,0 +1,165 @@
+"""Postgres COPY staging-table import helpers."""
+
+from __future__ import annotations
+
+import csv
+import io
+from typing import Callable, Iterable, Iterator, List, Optional
+from uuid import uuid4
+
+from psycopg2 import sql
+
+from app.services.bulk_upsert import UpsertCounts
+from app.utils.csv_parser import ProductRow
+
+ProgressCallback = Callable[[int], None]
+
+_CREATE_STAGING = sql.SQL(
+    """
+    CREATE UNLOGGED TABLE {table} (
+        seq bigint NOT NULL,
+        sku text NOT NULL,
+        name text,
+        description text,
+        price numeric(10, 2),
+        active boolean
+    )
+    """
+)
+
+_COPY_STAGING = sql.SQL(
+    "COPY {table} (seq, sku, name, description, price, active) FROM STDIN WITH (FORMAT csv)"
+)
+
+# Rows sharing a SKU are folded in file order (highest seq wins): name and
+# description come from the last row, price and active from the last row that
+# provided them, falling back to the stored value and then the column default.
+# Conflicting rows identical to the stored one are skipped by the WHERE, and
+# the counts come back as (inserted, updated, unchanged) distinct SKUs.
+_MERGE_STAGING = sql.SQL(
+    """
+    WITH upserted AS (
+        INSERT INTO products (sku, name, description, price, active)
+        SELECT s.sku,
+               s.name,
+               s.description,
+               COALESCE(s.price, p.price),
+               COALESCE(s.active, p.active, TRUE)
+        FROM (
+            SELECT sku,
+                   (array_agg(name ORDER BY seq DESC))[1] AS name,
+                   (array_agg(description ORDER BY seq DESC))[1] AS description,
+                   (array_agg(price ORDER BY seq DESC) FILTER (WHERE price IS NOT NULL))[1] AS price,
+                   (array_agg(active ORDER BY seq DESC) FILTER (WHERE active IS NOT NULL))[1] AS active
+            FROM {table}
+            GROUP BY sku
+        ) AS s
+        LEFT JOIN products AS p ON p.sku = s.sku
+        ON CONFLICT (sku) DO UPDATE SET
+            name = EXCLUDED.name,
+            description = EXCLUDED.description,
+            price = EXCLUDED.price,
+            active = EXCLUDED.active
+        WHERE (products.name, products.description, products.price, products.active)
+              IS DISTINCT FROM (EXCLUDED.name, EXCLUDED.description, EXCLUDED.price, EXCLUDED.active)
+        RETURNING (xmax = 0) AS inserted
+    )
+    SELECT count(*) FILTER (WHERE inserted),
+           count(*) FILTER (WHERE NOT inserted),
+           (SELECT count(DISTINCT sku) FROM {table}) - count(*)
+    FROM upserted
+    """
+)
+
+
+def new_staging_table_name() -> str:
+    """Return a unique staging table name."""
+    return f"import_staging_{uuid4().hex}"
+
+
+class CsvRowStream:
+    """File-like object rendering cleaned ``ProductRow`` tuples as CSV for ``COPY``."""
+
+    def __init__(
+        self,
+        rows: Iterable[ProductRow],
+        start_seq: int = 0,
+        on_progress: Optional[ProgressCallback] = None,
+        progress_every: int = 10000,
+    ):
+        self._rows = iter(rows)
+        self._seq = start_seq
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+        self._pending = ""
+        self._on_progress = on_progress
+        self._progress_every = progress_every
+        self.count = 0
+
+    def _write_row(self, row: ProductRow) -> None:
+        sku, name, description, price, active = row
+        self._writer.writerow(
+            (self._seq, sku.lower(), name, description, price, None if active is None else ("t" if active else "f"))
+        )
+        self._seq += 1
+        self.count += 1
+        if self._on_progress and self.count % self._progress_every == 0:
+            self._on_progress(self.count)
+
+    def read(self, size: int = -1) -> str:
+        """Return up to ``size`` characters of CSV (empty string at EOF)."""
+        while size < 0 or len(self._pending) < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            self._write_row(row)
+            self._pending += self._buffer.getvalue()
+            self._buffer.seek(0)
+            self._buffer.truncate()
+        if size < 0:
+            chunk, self._pending = self._pending, ""
+        else:
+            chunk, self._pending = self._pending[:size], self._pending[size:]
+        return chunk
+
+
+def create_staging_table(cursor, table: str) -> None:
+    """Create an unlogged staging table."""
+    cursor.execute(_CREATE_STAGING.format(table=sql.Identifier(table)))
+
+
+def copy_into_staging(
+    cursor,
+    table: str,
+    rows: Iterable[ProductRow],
+    start_seq: int = 0,
+    on_progress: Optional[ProgressCallback] = None,
+) -> int:
+    """Stream rows into the staging table with ``COPY FROM STDIN`` and return count."""
+    stream = CsvRowStream(rows, start_seq=start_seq, on_progress=on_progress)
+    cursor.copy_expert(_COPY_STAGING.format(table=sql.Identifier(table)), stream, size=64 * 1024)
+    return stream.count
+
+
+def merge_staging(cursor, table: str) -> UpsertCounts:
+    """Merge staged rows into products with one statement and return what it did per SKU."""
+    cursor.execute(_MERGE_STAGING.format(table=sql.Identifier(table)))
+    inserted, updated, unchanged = cursor.fetchone()
+    return UpsertCounts(inserted=inserted, updated=updated, unchanged=unchanged)
+
+
+def iter_staged_skus(connection, table: str, batch_size: int = 10000) -> Iterator[List[str]]:
+    """Yield the distinct staged SKUs in batches via a server-side cursor."""
+    with connection.cursor(name=f"{table}_skus") as cursor:
+        cursor.itersize = batch_size
+        cursor.execute(sql.SQL("SELECT DISTINCT sku FROM {table}").format(table=sql.Identifier(table)))
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield [row[0] for row in rows]
+
+
+def drop_staging_table(cursor, table: str) -> None:
+    """Drop the staging table if it still exists."""
+    cursor.execute(sql.SQL("DROP TABLE IF EXISTS {table}").format(table=sql.Identifier(table)))
@@ -0,0 +1,136 @@
+"""Chunked, resumable upload sessions."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from math import ceil
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Tuple
+from uuid import UUID, uuid4
+
+MANIFEST = "manifest.json"
+COMPLETED_MANIFEST = "manifest.completed.json"
+
+
+class UploadSessionError(ValueError):
+    """Raised when a part or completion request cannot be accepted."""
+
+
+class UploadSessionNotFound(LookupError):
+    """Raised for unknown, malformed or already completed upload ids."""
+
+
+def _session_dir(root: Path, upload_id: str) -> Path:
+    try:
+        # Normalizes the id and keeps it from naming anything outside ``root``.
+        return root / UUID(upload_id).hex
+    except ValueError:
+        raise UploadSessionNotFound(upload_id) from None
+
+
+def create_session(root: Path, filename: str, size: int, part_size: int) -> Dict:
+    """
+    Start a session: write its manifest and preallocate the target file.
+
+    Parts are written in place at ``(number - 1) * part_size``, so the file
+    is assembled as parts arrive and completion needs no second copy.
+    """
+    upload_id = uuid4().hex
+    directory = root / upload_id
+    (directory / "parts").mkdir(parents=True)
+    manifest = {
+        "upload_id": upload_id,
+        "filename": Path(filename).name,
+        "size": size,
+        "part_size": part_size,
+        "part_count": max(ceil(size / part_size), 1),
+    }
+    with open(directory / manifest["filename"], "wb") as fh:
+        fh.truncate(size)
+    (directory / MANIFEST).write_text(json.dumps(manifest))
+    return manifest
+
+
+def load_session(root: Path, upload_id: str) -> Dict:
+    try:
+        return json.loads((_session_dir(root, upload_id) / MANIFEST).read_text())
+    except FileNotFoundError:
+        raise UploadSessionNotFound(upload_id) from None
+
+
+def part_range(manifest: Dict, number: int) -> Tuple[int, int]:
+    """Return ``(offset, length)`` of part ``number`` (1-based)."""
+    if not 1 <= number <= manifest["part_count"]:
+        raise UploadSessionError(f"Part number must be between 1 and {manifest['part_count']}.")
+    offset = (number - 1) * manifest["part_size"]
+    return offset, min(manifest["part_size"], manifest["size"] - offset)
+
+
+def received_parts(root: Path, manifest: Dict) -> Dict[int, str]:
+    """Map each stored part number to its SHA-256."""
+    parts_dir = _session_dir(root, manifest["upload_id"]) / "parts"
+    return {int(marker.stem): marker.read_text() for marker in parts_dir.glob("*.sha256")}
+
+
+def missing_parts(root: Path, manifest: Dict) -> List[int]:
+    received = received_parts(root, manifest)
+    return [number for number in range(1, manifest["part_count"] + 1) if number not in received]
+
+
+async def write_part(root: Path, manifest: Dict, number: int, body: AsyncIterator[bytes], sha256: str) -> None:
+    """
+    Stream one part into its slot of the target file and verify it.
+
+    The part is only recorded once its length and SHA-256 match, so a
+    dropped or corrupted part is simply sent again. Re-sending a stored
+    part overwrites it with identical bytes.
+    """
+    offset, length = part_range(manifest, number)
+    directory = _session_dir(root, manifest["upload_id"])
+    digest = hashlib.sha256()
+    written = 0
+    fd = os.open(directory / manifest["filename"], os.O_WRONLY)
+    try:
+        async for chunk in body:
+            if written + len(chunk) > length:
+                raise UploadSessionError(f"Part {number} must be {length} bytes.")
+            os.pwrite(fd, chunk, offset + written)
+            digest.update(chunk)
+            written += len(chunk)
+    finally:
+        os.close(fd)
+    if written != length:
+        raise UploadSessionError(f"Part {number} must be {length} bytes, got {written}.")
+    if digest.hexdigest() != sha256.lower():
+        raise UploadSessionError(f"Checksum mismatch for part {number}.")
+    marker = directory / "parts" / f"{number}.sha256"
+    pending = marker.with_suffix(".tmp")
+    pending.write_text(digest.hexdigest())
+    pending.replace(marker)
+
+
+def complete_session(root: Path, upload_id: str) -> Tuple[Dict, Path]:
+    """
+    Close a session whose parts have all arrived and return its manifest and file.
+
+    The manifest is renamed away first, so concurrent or repeated completions
+    (and late parts) see the session as gone.
+    """
+    manifest = load_session(root, upload_id)
+    missing = missing_parts(root, manifest)
+    if missing:
+        raise UploadSessionError(f"Missing parts: {', '.join(str(number) for number in missing[:20])}.")
+    directory = _session_dir(root, upload_id)
+    try:
+        (directory / MANIFEST).rename(directory / COMPLETED_MANIFEST)
+    except FileNotFoundError:
+        raise UploadSessionNotFound(upload_id) from None
+    shutil.rmtree(directory / "parts", ignore_errors=True)
+    return manifest, directory / manifest["filename"]
+
+
+def discard_session(root: Path, upload_id: str) -> None:
+    shutil.rmtree(_session_dir(root, upload_id), ignore_errors=True)
@@ -0,0 +1,231 @@
+"""Pooled, concurrency-limited webhook delivery engine."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+import redis
+
+from app.config import get_settings
+from app.services.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookDeliveryEngine:
+    """
+    Deliver webhook payloads over one long-lived ``httpx.AsyncClient``.
+
+    The client (and the event loop it is bound to) is created lazily on first
+    use, i.e. inside each forked Celery worker process, and then kept for the
+    life of the process so connections and TLS sessions are reused across
+    tasks. HTTPS endpoints that support it are spoken to over HTTP/2.
+    Concurrency is capped per destination host so one slow receiver cannot
+    monopolise the pool.
+    """
+
+    def __init__(self, timeout: float, max_connections: int, per_host_limit: int):
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.per_host_limit = per_host_limit
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        # run_until_complete is not reentrant; serialise callers (thread pools).
+        self._lock = Lock()
+
+    def _ensure_client(self) -> None:
+        if self._client is not None:
+            return
+        self._loop = asyncio.new_event_loop()
+        limits = httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections)
+        self._client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=limits,
+            http2=True,  # negotiated via TLS ALPN; plain-http endpoints stay on HTTP/1.1
+        )
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = self._host_limits[host] = asyncio.Semaphore(self.per_host_limit)
+        return limit
+
+    async def _deliver_one(self, delivery: Dict) -> Dict:
+        webhook_id, url = delivery["webhook_id"], delivery["url"]
+        async with self._host_limit(url):
+            start = time.perf_counter()
+            try:
+                resp = await self._client.post(url, json=delivery["payload"])
+                status_code, error = resp.status_code, None
+            except Exception as exc:  # noqa: BLE001
+                status_code, error = None, str(exc)
+            elapsed = (time.perf_counter() - start) * 1000  # ms
+            return {
+                "webhook_id": webhook_id,
+                "status_code": status_code,
+                "elapsed_ms": round(elapsed, 2),
+                "error": error,
+            }
+
+    async def _deliver_all(self, deliveries: List[Dict]) -> List[Dict]:
+        return list(await asyncio.gather(*(self._deliver_one(delivery) for delivery in deliveries)))
+
+    def deliver(self, deliveries: List[Dict]) -> List[Dict]:
+        """
+        Send ``{"webhook_id", "url", "payload"}`` deliveries concurrently.
+
+        Returns one ``{"webhook_id", "status_code", "elapsed_ms", "error"}``
+        result per delivery, in input order.
+        """
+        if not deliveries:
+            return []
+        with self._lock:
+            self._ensure_client()
+            return self._loop.run_until_complete(self._deliver_all(deliveries))
+
+
+class CircuitBreaker:
+    """
+    Per-webhook circuit breaker.
+
+    After ``threshold`` consecutive failures a webhook's circuit opens and
+    ``allow`` returns False for ``cooldown`` seconds. The first call after
+    that lets a single probe through; its success closes the circuit, its
+    failure reopens it for another cooldown.
+
+    This base implementation keeps state in process memory (single worker
+    process, tests); ``RedisCircuitBreaker`` shares it across workers.
+    """
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures: Dict[int, int] = {}
+        self._open_until: Dict[int, float] = {}
+        self._lock = Lock()
+
+    def allow(self, webhook_id: int) -> bool:
+        with self._lock:
+            open_until = self._open_until.get(webhook_id)
+            if open_until is None:
+                return True
+            now = time.time()
+            if now < open_until:
+                return False
+            # Half-open: hold the circuit shut for everyone but this probe.
+            self._open_until[webhook_id] = now + self.cooldown
+            return True
+
+    def retry_after(self, webhook_id: int) -> float:
+        """Seconds until the circuit of ``webhook_id`` admits a probe (0 when closed)."""
+        with self._lock:
+            open_until = self._open_until.get(webhook_id)
+        return max(0.0, open_until - time.time()) if open_until is not None else 0.0
+
+    def record(self, webhook_id: int, ok: bool) -> None:
+        with self._lock:
+            if ok:
+                self._failures.pop(webhook_id, None)
+                self._open_until.pop(webhook_id, None)
+                return
+            failures = self._failures[webhook_id] = self._failures.get(webhook_id, 0) + 1
+            if failures >= self.threshold:
+                self._open_until[webhook_id] = time.time() + self.cooldown
+
+
+class RedisCircuitBreaker(CircuitBreaker):
+    """
+    Circuit breaker whose state lives in Redis, shared by every worker process.
+
+    Per webhook: an ``INCR`` failure counter, an ``open_until`` timestamp and
+    a ``SET NX`` probe lock that lets exactly one worker test a cooled-down
+    endpoint. Redis errors fail open (deliveries proceed) rather than
+    stalling webhooks.
+    """
+
+    def __init__(self, client: redis.Redis, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._redis = client
+
+    @staticmethod
+    def _keys(webhook_id: int) -> Tuple[str, str, str]:
+        prefix = f"webhook-breaker:{webhook_id}"
+        return f"{prefix}:failures", f"{prefix}:open-until", f"{prefix}:probe"
+
+    def _read_open_until(self, webhook_id: int) -> Optional[float]:
+        value = self._redis.get(self._keys(webhook_id)[1])
+        return float(value) if value is not None else None
+
+    def allow(self, webhook_id: int) -> bool:
+        try:
+            open_until = self._read_open_until(webhook_id)
+            if open_until is None:
+                return True
+            if time.time() < open_until:
+                return False
+            probe_key = self._keys(webhook_id)[2]
+            return bool(self._redis.set(probe_key, 1, nx=True, px=int(self.cooldown * 1000)))
+        except redis.RedisError as exc:
+            logger.warning("Circuit breaker unavailable for webhook %s: %s", webhook_id, exc)
+            return True
+
+    def retry_after(self, webhook_id: int) -> float:
+        try:
+            open_until = self._read_open_until(webhook_id)
+        except redis.RedisError:
+            return 0.0
+        return max(0.0, open_until - time.time()) if open_until is not None else 0.0
+
+    def record(self, webhook_id: int, ok: bool) -> None:
+        failures_key, open_key, probe_key = self._keys(webhook_id)
+        try:
+            if ok:
+                self._redis.delete(failures_key, open_key, probe_key)
+                return
+            pipe = self._redis.pipeline()
+            pipe.incr(failures_key)
+            # Stale streaks age out instead of tripping the circuit days later.
+            pipe.expire(failures_key, int(self.cooldown * 10) + 1)
+            failures, _ = pipe.execute()
+            if failures >= self.threshold:
+                self._redis.set(open_key, time.time() + self.cooldown, ex=int(self.cooldown * 10) + 1)
+                self._redis.delete(probe_key)
+        except redis.RedisError as exc:
+            logger.warning("Circuit breaker unavailable for webhook %s: %s", webhook_id, exc)
+
+
+_engine: Optional[WebhookDeliveryEngine] = None
+_breaker: Optional[CircuitBreaker] = None
+
+
+def get_delivery_engine() -> WebhookDeliveryEngine:
+    """Return this process's delivery engine."""
+    global _engine
+    if _engine is None:
+        settings = get_settings()
+        _engine = WebhookDeliveryEngine(
+            timeout=settings.webhook_timeout_seconds,
+            max_connections=settings.webhook_max_connections,
+            per_host_limit=settings.webhook_per_host_concurrency,
+        )
+    return _engine
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """Return the webhook circuit breaker: Redis-backed when ``redis_url`` is set."""
+    global _breaker
+    if _breaker is None:
+        settings = get_settings()
+        client = get_redis()
+        threshold, cooldown = settings.webhook_breaker_threshold, settings.webhook_breaker_cooldown_seconds
+        _breaker = RedisCircuitBreaker(client, threshold, cooldown) if client else CircuitBreaker(threshold, cooldown)
+    return _breaker
@@ -1,56 +1,123 @@
 """Webhook service layer."""
 
-from typing import List, Optional
+import statistics
+from collections import Counter
+from typing import Dict, List, Optional, Sequence
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Webhook
-from app.schemas import WebhookCreate, WebhookRead, WebhookUpdate
+from app.models import Webhook, WebhookDelivery
+from app.schemas import (
+    WebhookCreate,
+    WebhookDeliveryLog,
+    WebhookDeliveryRead,
+    WebhookDeliveryStats,
+    WebhookRead,
+    WebhookUpdate,
+)
+from app.services.events import subscriptions
 
 
-class WebhookService:
-    """Encapsulate webhook operations."""
+def _new_webhook(payload: WebhookCreate) -> Webhook:
+    return Webhook(url=str(payload.url), event_type=payload.event_type, active=payload.active)
 
-    def __init__(self, db: Session):
+
+def _apply_update(webhook: Webhook, payload: WebhookUpdate) -> None:
+    if payload.url is not None:
+        webhook.url = str(payload.url)
+    if payload.event_type is not None:
+        webhook.event_type = payload.event_type
+    if payload.active is not None:
+        webhook.active = payload.active
+
+
+def _deliveries_query(webhook_id: int, limit: int) -> Select:
+    return (
+        select(WebhookDelivery)
+        .where(WebhookDelivery.webhook_id == webhook_id)
+        .order_by(WebhookDelivery.id.desc())
+        .limit(limit)
+    )
+
+
+def _delivery_log(webhook_id: int, deliveries: Sequence[WebhookDelivery]) -> WebhookDeliveryLog:
+    """Latency/status stats over a webhook's recent delivery attempts."""
+    counts = Counter(d.status for d in deliveries)
+    delivered, failed = counts["delivered"], counts["failed"]
+    latencies = sorted(d.elapsed_ms for d in deliveries if d.elapsed_ms is not None)
+    stats = WebhookDeliveryStats(
+        attempts=len(deliveries),
+        delivered=delivered,
+        failed=failed,
+        retrying=counts["retrying"],
+        skipped=counts["skipped"],
+        # Final outcomes only: attempts that will be retried are not failures yet.
+        success_rate=round(delivered / (delivered + failed), 4) if delivered + failed else None,
+    )
+    if latencies:
+        stats.avg_ms = round(statistics.fmean(latencies), 2)
+        stats.p50_ms = latencies[int(0.50 * (len(latencies) - 1))]
+        stats.p95_ms = latencies[int(0.95 * (len(latencies) - 1))]
+        stats.max_ms = latencies[-1]
+    return WebhookDeliveryLog(
+        webhook_id=webhook_id,
+        stats=stats,
+        items=[WebhookDeliveryRead.model_validate(d) for d in deliveries],
+    )
+
+
+# The ``WebhookRead`` fields as plain rows; listings build no ORM instances.
+_LIST_QUERY = select(Webhook.id, Webhook.url, Webhook.event_type, Webhook.active).order_by(Webhook.id.desc())
+
+
+class AsyncWebhookService:
+    """Encapsulate webhook operations on an asyncio session, for the API routes."""
+
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def get_webhook(self, webhook_id: int) -> Optional[WebhookRead]:
+    async def get_webhook(self, webhook_id: int) -> Optional[WebhookRead]:
         """Return a single webhook by id."""
-        webhook = self.db.get(Webhook, webhook_id)
+        webhook = await self.db.get(Webhook, webhook_id)
         if not webhook:
             return None
         return WebhookRead.model_validate(webhook)
 
-    def list_webhooks(self) -> List[WebhookRead]:
-        webhooks = self.db.execute(select(Webhook).order_by(Webhook.id.desc())).scalars().all()
-        return [WebhookRead.model_validate(w) for w in webhooks]
+    async def list_webhooks(self) -> List[Dict]:
+        """Return all webhooks as dicts with the ``WebhookRead`` fields, newest first."""
+        return [row._asdict() for row in await self.db.execute(_LIST_QUERY)]
 
-    def create_webhook(self, payload: WebhookCreate) -> WebhookRead:
-        webhook = Webhook(url=str(payload.url), event_type=payload.event_type, active=payload.active)
+    async def create_webhook(self, payload: WebhookCreate) -> WebhookRead:
+        webhook = _new_webhook(payload)
         self.db.add(webhook)
-        self.db.commit()
-        self.db.refresh(webhook)
+        await self.db.commit()
+        await self.db.refresh(webhook)
+        subscriptions.invalidate()
         return WebhookRead.model_validate(webhook)
 
-    def update_webhook(self, webhook_id: int, payload: WebhookUpdate) -> Optional[WebhookRead]:
-        webhook = self.db.get(Webhook, webhook_id)
+    async def update_webhook(self, webhook_id: int, payload: WebhookUpdate) -> Optional[WebhookRead]:
+        webhook = await self.db.get(Webhook, webhook_id)
         if not webhook:
             return None
-        if payload.url is not None:
-            webhook.url = str(payload.url)
-        if payload.event_type is not None:
-            webhook.event_type = payload.event_type
-        if payload.active is not None:
-            webhook.active = payload.active
-        self.db.commit()
-        self.db.refresh(webhook)
+        _apply_update(webhook, payload)
+        await self.db.commit()
+        await self.db.refresh(webhook)
+        subscriptions.invalidate()
         return WebhookRead.model_validate(webhook)
 
-    def delete_webhook(self, webhook_id: int) -> bool:
-        webhook = self.db.get(Webhook, webhook_id)
+    async def delete_webhook(self, webhook_id: int) -> bool:
+        webhook = await self.db.get(Webhook, webhook_id)
         if not webhook:
             return False
-        self.db.delete(webhook)
-        self.db.commit()
+        # Explicit for SQLite, which does not enforce the ON DELETE CASCADE.
+        await self.db.execute(delete(WebhookDelivery).where(WebhookDelivery.webhook_id == webhook_id))
+        await self.db.delete(webhook)
+        await self.db.commit()
+        subscriptions.invalidate()
         return True
+
+    async def list_deliveries(self, webhook_id: int, limit: int = 100) -> WebhookDeliveryLog:
+        """Return the most recent delivery attempts of a webhook with latency/status stats over them."""
+        deliveries = (await self.db.execute(_deliveries_query(webhook_id, limit))).scalars().all()
+        return _delivery_log(webhook_id, deliveries)
@@ -0,0 +1,67 @@
+"""Bulk product delete Celery task."""
+
+from typing import Dict, Optional
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.celery_app import celery_app
+from app.config import get_settings
+from app.database import SessionLocal
+from app.services.product_service import ProductService
+from app.services.progress import progress_store
+from app.services.progress_stream import Throttle, publish_progress
+
+
+def _meta(status: str, deleted: int, total: int, message: str) -> Dict:
+    total = max(total, deleted)
+    if not total:
+        percent = 0.0
+    else:
+        percent = 100.0 if status == "completed" else round(deleted / total * 100, 2)
+    return {"status": status, "processed": deleted, "total": total, "percent": percent, "message": message}
+
+
+@celery_app.task(bind=True, name="app.tasks.delete_products")
+def delete_products_task(
+    self,
+    sku: Optional[str] = None,
+    name: Optional[str] = None,
+    active: Optional[bool] = None,
+    description: Optional[str] = None,
+    q: Optional[str] = None,
+    batch_size: int = 10000,
+) -> Dict:
+    """
+    Delete the products matching the ``GET /products`` filters, in batches.
+
+    Progress goes to the same store and channel as imports, so
+    ``GET /upload/status/{task_id}`` and the upload stream report it:
+    ``processed`` counts deleted rows, ``total`` the matches counted when
+    the task started (rows added later can push ``processed`` past it).
+    """
+    task_id = self.request.id
+    throttle = Throttle(get_settings().progress_update_interval_seconds)
+    deleted, total = 0, 0
+
+    def report(count: int, force: bool = False) -> None:
+        nonlocal deleted
+        deleted = count
+        if force or throttle.due():
+            progress_store.update_progress(task_id, count, max(total, count), f"Deleted {count} products", "delete")
+            publish_progress(task_id, _meta("processing", count, total, f"Deleted {count} products"))
+
+    try:
+        with SessionLocal() as session:
+            service = ProductService(session)
+            total = service.count_products(sku, name, active, description, q)
+            report(0, force=True)
+            service.delete_products(sku, name, active, description, q, batch_size=batch_size, on_progress=report)
+    except SQLAlchemyError as exc:
+        progress_store.mark_error(task_id, deleted, max(total, deleted), str(exc))
+        publish_progress(task_id, _meta("error", deleted, total, str(exc)))
+        raise
+
+    result = _meta("completed", deleted, total, f"Deleted {deleted} products")
+    progress_store.mark_complete(task_id, deleted, result["total"], message=result["message"])
+    publish_progress(task_id, result)
+    return result
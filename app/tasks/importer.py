@@ -1,36 +1,342 @@
 """CSV importer Celery task."""
 
-from typing import Optional
+from typing import Dict, List, Optional, Tuple, get_args
 
-from sqlalchemy import select
+import psycopg2
+from celery import chord, group, states
+from celery.exceptions import Ignore, SoftTimeLimitExceeded
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.celery_app import celery_app
-from app.database import SessionLocal
-from app.models import Product
-from app.utils.csv_parser import chunk_products
-
-
-def _upsert_products(session, products_chunk) -> int:
-    """Upsert a chunk of products and return count processed."""
-    for product_data in products_chunk:
-        sku = product_data["sku"].lower()
-        existing = session.execute(select(Product).where(Product.sku == sku)).scalars().first()
-        if existing:
-            existing.name = product_data.get("name", existing.name)
-            existing.description = product_data.get("description", existing.description)
-            if product_data.get("price") is not None:
-                existing.price = product_data["price"]
-            if product_data.get("active") is not None:
-                existing.active = product_data["active"]
-        else:
-            session.add(Product(**product_data))
+from app.config import ImportMode, get_settings
+from app.database import SessionLocal, engine
+from app.services.bulk_upsert import UpsertCounts, diff_products, upsert_products
+from app.services.checkpoints import advance_checkpoint, checkpoint_counts, clear_checkpoint, start_checkpoint
+from app.services.events import PRODUCT_IMPORTED, emit_imported, has_subscribers
+from app.services.product_cache import catalogue_version
+from app.services.progress import progress_store
+from app.services.progress_stream import Throttle, publish_progress
+from app.services.rejects import (
+    RejectWriter,
+    combine_shard_rejects,
+    discard_shard_rejects,
+    reject_path,
+    shard_reject_path,
+)
+from app.services.staging import (
+    copy_into_staging,
+    create_staging_table,
+    drop_staging_table,
+    iter_staged_skus,
+    merge_staging,
+    new_staging_table_name,
+)
+from app.utils.compression import compression_for
+from app.utils.csv_parser import chunk_product_rows, iter_product_rows, split_csv
+
+
+def _upsert_products(
+    session,
+    products_chunk,
+    task_id: Optional[str] = None,
+    checkpoint: Optional[Tuple[int, int, UpsertCounts, RejectWriter]] = None,
+) -> UpsertCounts:
+    """
+    Upsert a chunk of ``ProductRow`` tuples in one set-based write and return its counts.
+
+    ``checkpoint`` is the ``(byte_offset, processed, counts, rejects)``
+    position after this chunk, with the counts of the chunks before it; it
+    is saved in the same transaction as the rows, along with how much of the
+    reject file (flushed here) covers them.
+    """
+    counts = upsert_products(session, products_chunk)
+    if checkpoint is not None:
+        byte_offset, processed, previous, rejects = checkpoint
+        advance_checkpoint(
+            session, task_id, byte_offset, processed, previous + counts, rejects.count, rejects.flush()
+        )
     session.commit()
-    return len(products_chunk)
+    if counts.written:
+        catalogue_version.bump()
+    if has_subscribers(PRODUCT_IMPORTED):
+        emit_imported(sorted({row[0].lower() for row in products_chunk}), task_id)
+    return counts
+
+
+def _progress_meta(processed: int, total: int, message: str, phase: Optional[str] = None, rejected: int = 0) -> Dict:
+    """Build the progress payload published to ``/upload/stream`` subscribers."""
+    current_total = total or processed + rejected
+    percent = round(min((processed + rejected) / current_total, 1.0) * 100, 2) if current_total else 0.0
+    meta = {
+        "status": "processing",
+        "processed": processed,
+        "total": current_total,
+        "percent": percent,
+        "message": message,
+        "rejected": rejected,
+    }
+    if phase:
+        meta["phase"] = phase
+    return meta
+
+
+def _report_progress(
+    task_id: str,
+    processed: int,
+    total: int,
+    message: str,
+    phase: Optional[str] = None,
+    throttle: Optional[Throttle] = None,
+    rejected: int = 0,
+) -> None:
+    """Write progress to the progress store and publish it, unless throttled."""
+    if throttle is not None and not throttle.due():
+        return
+    progress_store.update_progress(task_id, processed, total or processed + rejected, message, phase, rejected)
+    publish_progress(task_id, _progress_meta(processed, total, message, phase, rejected))
+
+
+def _report_error(task_id: str, processed: int, total: int, message: str, rejected: int = 0) -> None:
+    progress_store.mark_error(task_id, processed, total or processed + rejected, message, rejected)
+    publish_progress(task_id, _error_meta(processed, total, message, rejected))
+
+
+def _report_complete(
+    task_id: str, processed: int, total: int, counts: UpsertCounts, rejected: int = 0, dry_run: bool = False
+) -> Dict:
+    result = _completed_result(processed, total, counts, rejected, dry_run)
+    progress_store.mark_complete(
+        task_id, processed, result["total"], counts.as_dict(), rejected, message=result["message"]
+    )
+    publish_progress(task_id, result)
+    return result
+
+
+def _error_meta(processed: int, total: int, message: str, rejected: int = 0) -> Dict:
+    current_total = total or processed + rejected or 1
+    return {
+        "status": "error",
+        "processed": processed,
+        "total": current_total,
+        "percent": round(min((processed + rejected) / current_total, 1.0) * 100, 2),
+        "message": message,
+        "rejected": rejected,
+    }
+
+
+def _drop_staging(table: str, announce_for: Optional[str] = None) -> None:
+    """Drop a staging table, first emitting ``product.imported`` for its SKUs if asked."""
+    raw = engine.raw_connection()
+    try:
+        if announce_for and has_subscribers(PRODUCT_IMPORTED):
+            for skus in iter_staged_skus(raw, table):
+                emit_imported(skus, announce_for)
+        with raw.cursor() as cursor:
+            drop_staging_table(cursor, table)
+        raw.commit()
+    finally:
+        raw.close()
+
+
+def _copy_import(
+    task, file_path: str, total: int, counter: Dict[str, int], throttle: Throttle, rejects: RejectWriter
+) -> UpsertCounts:
+    """
+    Import via ``COPY`` into an unlogged staging table and one merge statement.
+
+    Staging and merge share one transaction, so a failure leaves ``products``
+    untouched and the staging table rolled back. The table is dropped after
+    the commit, once its SKUs have been announced to subscribers.
+    """
+    table = new_staging_table_name()
+
+    def on_copy_progress(copied: int) -> None:
+        counter["processed"] = copied
+        _report_progress(
+            task.request.id, copied, total, f"Copied {copied} rows", "copy", throttle, rejected=rejects.count
+        )
+
+    raw = engine.raw_connection()
+    try:
+        with raw.cursor() as cursor:
+            create_staging_table(cursor, table)
+            rows = iter_product_rows(file_path, on_reject=rejects)
+            copied = copy_into_staging(cursor, table, rows, on_progress=on_copy_progress)
+            counter["processed"] = copied
+            _report_progress(
+                task.request.id, copied, total, f"Merging {copied} staged rows", "merge", rejected=rejects.count
+            )
+            counts = merge_staging(cursor, table)
+        raw.commit()
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+    if counts.written:
+        catalogue_version.bump()
+    _drop_staging(table, announce_for=task.request.id)
+    return counts
+
+
+def _completed_result(
+    processed: int, total: int, counts: UpsertCounts, rejected: int = 0, dry_run: bool = False
+) -> Dict:
+    final_total = total or processed + rejected
+    return {
+        "status": "completed",
+        "processed": processed,
+        "total": final_total,
+        "percent": 100.0 if final_total else 0.0,
+        "message": "Dry run completed; nothing was written" if dry_run else "Completed",
+        "rejected": rejected,
+        **counts.as_dict(),
+    }
+
+
+def _fan_out_import(task, file_path: str, total: int, shard_count: int) -> None:
+    """
+    Split the file into record-aligned byte ranges and import them in parallel.
+
+    Each shard COPYs into one shared staging table, tagging rows with a
+    sequence number that increases through the file; the chord callback then
+    merges once, so duplicate SKUs across shards resolve to the last
+    occurrence exactly as in the serial path.
+    """
+    ranges = split_csv(file_path, shard_count)
+    table = new_staging_table_name()
+    raw = engine.raw_connection()
+    try:
+        with raw.cursor() as cursor:
+            create_staging_table(cursor, table)
+        raw.commit()
+    finally:
+        raw.close()
+
+    root_id = task.request.id
+    # Reset the counter before dispatching: shards add to it with HINCRBY and
+    # a fast chord must not have its progress overwritten by this update.
+    _report_progress(root_id, 0, total, f"Importing {len(ranges)} shards", "copy")
+    header = group(
+        import_shard_task.s(file_path, table, start, end, root_id).set(task_id=f"{root_id}-shard-{index}")
+        for index, (start, end) in enumerate(ranges)
+    )
+    starts = [start for start, _ in ranges]
+    callback = merge_shards_task.s(root_id, table, total, starts).on_error(fail_shards_task.s(root_id, table, starts))
+    chord(header)(callback)
+
+
+@celery_app.task(name="app.tasks.import_shard")
+def import_shard_task(file_path: str, table: str, start: int, end: int, root_id: str) -> List[int]:
+    """
+    COPY one byte range of the CSV into the shared staging table, counting into the root's progress.
+
+    Returns ``[copied, rejected]``; rejected rows go to a per-shard reject
+    file that the merge concatenates.
+    """
+    throttle = Throttle(get_settings().progress_update_interval_seconds)
+    rejects = RejectWriter(shard_reject_path(root_id, start), header=False)
+    reported = reported_rejects = 0
+
+    def report(copied: int) -> None:
+        nonlocal reported, reported_rejects
+        progress_store.increment(root_id, copied - reported)
+        if rejects.count > reported_rejects:
+            progress_store.increment(root_id, rejects.count - reported_rejects, "rejected")
+        reported, reported_rejects = copied, rejects.count
+        snapshot = progress_store.get(root_id)
+        if snapshot:
+            publish_progress(root_id, snapshot)
+
+    def on_copy_progress(copied: int) -> None:
+        if throttle.due():
+            report(copied)
+
+    raw = engine.raw_connection()
+    try:
+        with raw.cursor() as cursor:
+            rows = iter_product_rows(file_path, start, end, on_reject=rejects)
+            copied = copy_into_staging(cursor, table, rows, start_seq=start, on_progress=on_copy_progress)
+        raw.commit()
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+        rejects.close()
+    report(copied)
+    return [copied, rejects.count]
+
+
+@celery_app.task(bind=True, name="app.tasks.merge_shards")
+def merge_shards_task(self, shard_counts, root_id: str, table: str, total: int, starts: List[int]) -> Dict:
+    """Chord callback: merge the staging table and publish the root task result."""
+    processed = sum(copied for copied, _ in shard_counts)
+    rejected = sum(count for _, count in shard_counts)
+    combine_shard_rejects(root_id, starts)
+    _report_progress(root_id, processed, total, f"Merging {processed} staged rows", "merge", rejected=rejected)
+    raw = engine.raw_connection()
+    try:
+        with raw.cursor() as cursor:
+            counts = merge_staging(cursor, table)
+        raw.commit()
+    except Exception as exc:
+        raw.rollback()
+        _drop_staging(table)
+        self.backend.mark_as_failure(root_id, exc)
+        _report_error(root_id, processed, total, str(exc), rejected)
+        raise
+    finally:
+        raw.close()
+    if counts.written:
+        catalogue_version.bump()
+    _drop_staging(table, announce_for=root_id)
+    with SessionLocal() as session:
+        clear_checkpoint(session, root_id)
+
+    result = _report_complete(root_id, processed, total, counts, rejected)
+    self.backend.store_result(root_id, result, states.SUCCESS)
+    return result
 
 
-@celery_app.task(bind=True, name="app.tasks.import_products")
-def import_products_task(self, file_path: str, total_rows: Optional[int] = None, chunk_size: int = 10000):
+@celery_app.task(name="app.tasks.fail_shards")
+def fail_shards_task(request, exc, traceback, root_id: str, table: str, starts: List[int]) -> None:
+    """Chord errback: clean up staging and mark the root import as failed."""
+    _drop_staging(table)
+    discard_shard_rejects(root_id, starts)
+    celery_app.backend.mark_as_failure(root_id, exc)
+    snapshot = progress_store.get(root_id) or {}
+    _report_error(
+        root_id, snapshot.get("processed", 0), snapshot.get("total", 0), str(exc), snapshot.get("rejected", 0)
+    )
+
+
+# Imports stop at the soft time limit, a few minutes before the worker's
+# hard one (task_time_limit): batch imports re-enqueue themselves to carry
+# on from their checkpoint; copy/parallel imports and dry runs, which have
+# nothing to resume from, fail. acks_late + reject_on_worker_lost redeliver
+# the message if the worker dies, and acks_on_failure_or_timeout=False does
+# the same for the hard time limit (Celery acks timed-out tasks otherwise),
+# so both resume from the checkpoint rather than being lost.
+IMPORT_SOFT_TIME_LIMIT = 55 * 60
+
+
+@celery_app.task(
+    bind=True,
+    name="app.tasks.import_products",
+    acks_late=True,
+    reject_on_worker_lost=True,
+    acks_on_failure_or_timeout=False,
+    soft_time_limit=IMPORT_SOFT_TIME_LIMIT,
+)
+def import_products_task(
+    self,
+    file_path: str,
+    total_rows: Optional[int] = None,
+    chunk_size: int = 10000,
+    mode: Optional[str] = None,
+    dry_run: bool = False,
+):
     """
     Process CSV import in chunks.
 
@@ -38,51 +344,96 @@ def import_products_task(self, file_path: str, total_rows: Optional[int] = None,
         file_path: Path to uploaded CSV file.
         total_rows: Optional total count for percent calculations.
         chunk_size: Batch size for DB writes.
+        mode: ``batch`` (chunked upserts), ``copy`` (Postgres COPY into a
+            staging table, then one merge) or ``parallel`` (``copy`` fanned
+            out over ``settings.import_shards`` subtasks). Defaults to
+            ``settings.import_mode``; ``copy`` and ``parallel`` fall back to
+            ``batch`` on non-Postgres databases, and ``parallel`` runs as
+            ``copy`` for compressed (``.csv.gz``/``.csv.zst``) files.
+        dry_run: Validate and compare chunks against the stored products
+            (one SKU lookup per chunk) without writing anything.
+
+    The result reports ``inserted``/``updated``/``unchanged`` distinct SKUs
+    (per chunk in batch mode); rows identical to the stored ones are not
+    rewritten. Rows that fail validation are skipped and counted as
+    ``rejected``; they are written with line numbers and reasons to the
+    reject CSV served by ``GET /upload/{task_id}/rejects``.
+
+    Batch imports save a checkpoint (byte offset and processed count) with
+    every committed chunk. A redelivered or resumed task with the same id
+    seeks to it and continues without re-reading committed rows; ``copy``
+    and ``parallel`` imports commit once, so they simply start over.
     """
-    processed = 0
+    settings = get_settings()
+    task_id = self.request.id
+    mode = mode or settings.import_mode
+    counter = {"processed": 0}
     total = total_rows or 0
-    self.update_state(
-        state="PROGRESS",
-        meta={"status": "processing", "processed": processed, "total": total, "percent": 0.0, "message": "Starting"},
-    )
+    # Bounds progress-store writes and pub/sub messages per import.
+    throttle = Throttle(settings.progress_update_interval_seconds)
+    _report_progress(task_id, 0, total, "Starting")
 
+    rejects = RejectWriter(reject_path(task_id))
+    resumable = False
     try:
-        for chunk in chunk_products(file_path, chunk_size=chunk_size):
+        if mode not in get_args(ImportMode):
+            raise ValueError(f"Unknown import mode {mode!r}; expected one of {', '.join(get_args(ImportMode))}.")
+        if dry_run:
+            resume_offset, counts = 0, UpsertCounts()
+            mode = "batch"
+        else:
             with SessionLocal() as session:
-                processed += _upsert_products(session, chunk)
-            current_total = total or processed
-            percent = round((processed / current_total) * 100, 2) if current_total else 0.0
-            self.update_state(
-                state="PROGRESS",
-                meta={
-                    "status": "processing",
-                    "processed": processed,
-                    "total": current_total,
-                    "percent": percent,
-                    "message": f"Processed {processed} rows",
-                },
-            )
+                checkpoint = start_checkpoint(session, task_id, file_path, total, chunk_size, mode)
+                resume_offset, counter["processed"] = checkpoint.byte_offset, checkpoint.processed
+                counts = checkpoint_counts(checkpoint)
+                rejects = RejectWriter(reject_path(task_id), checkpoint.rejected, checkpoint.reject_bytes)
+        if mode == "parallel" and compression_for(file_path):
+            # Shards need byte offsets into the file; a compressed stream has none.
+            mode = "copy"
+        if mode == "parallel" and engine.dialect.name == "postgresql":
+            _fan_out_import(self, file_path, total, settings.import_shards)
+            # merge_shards_task stores the final result under this task's id.
+            raise Ignore()
+        if mode == "copy" and engine.dialect.name == "postgresql":
+            counts = _copy_import(self, file_path, total, counter, throttle, rejects)
+        else:
+            if counter["processed"]:
+                message = f"Resuming after {counter['processed']} rows"
+                _report_progress(task_id, counter["processed"], total, message, rejected=rejects.count)
+            resumable = not dry_run
+            chunks = chunk_product_rows(file_path, chunk_size=chunk_size, start=resume_offset, on_reject=rejects)
+            for chunk, offset in chunks:
+                processed = counter["processed"] + len(chunk)
+                with SessionLocal() as session:
+                    if dry_run:
+                        counts += diff_products(session, chunk)
+                    else:
+                        checkpoint = (offset, processed, counts, rejects)
+                        counts += _upsert_products(session, chunk, task_id, checkpoint=checkpoint)
+                counter["processed"] = processed
+                verb = "Checked" if dry_run else "Processed"
+                _report_progress(
+                    task_id, processed, total, f"{verb} {processed} rows", throttle=throttle, rejected=rejects.count
+                )
+        rejects.close()
 
-        final_total = total or processed
-        return {
-            "status": "completed",
-            "processed": processed,
-            "total": final_total,
-            "percent": 100.0 if final_total else 0.0,
-            "message": "Completed",
-        }
-
-    except (SQLAlchemyError, OSError, ValueError) as exc:
-        current_total = total or processed or 1
-        percent = round((processed / current_total) * 100, 2)
-        self.update_state(
-            state="FAILURE",
-            meta={
-                "status": "error",
-                "processed": processed,
-                "total": current_total,
-                "percent": percent,
-                "message": str(exc),
-            },
-        )
+        if not dry_run:
+            with SessionLocal() as session:
+                clear_checkpoint(session, task_id)
+        return _report_complete(task_id, counter["processed"], total, counts, rejects.count, dry_run)
+
+    except SoftTimeLimitExceeded:
+        rejects.close()
+        if not resumable:
+            _report_error(task_id, counter["processed"], total, "Import exceeded the time limit.", rejects.count)
+            raise
+        message = f"Time limit reached; continuing after {counter['processed']} rows"
+        _report_progress(task_id, counter["processed"], total, message, rejected=rejects.count)
+        # Same id, so the new run picks up the checkpoint of the last committed chunk.
+        self.apply_async(args=self.request.args, kwargs=self.request.kwargs, task_id=task_id)
+        raise Ignore()
+
+    except (SQLAlchemyError, psycopg2.Error, OSError, EOFError, ValueError) as exc:
+        rejects.close()
+        _report_error(task_id, counter["processed"], total, str(exc), rejects.count)
         raise
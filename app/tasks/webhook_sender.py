@@ -1,24 +1,144 @@
-"""Webhook sender Celery task."""
+"""Webhook sender Celery tasks."""
 
-import json
-import time
-from typing import Dict
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
 
-import httpx
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import SQLAlchemyError
 
 from app.celery_app import celery_app
 from app.config import get_settings
+from app.database import SessionLocal
+from app.models import WebhookDelivery
+from app.services.webhook_delivery import get_circuit_breaker, get_delivery_engine
+
+logger = logging.getLogger(__name__)
+
+
+def _is_retryable(result: Dict) -> bool:
+    """Transport errors, 429 and 5xx are worth retrying; other 4xx are not."""
+    code = result["status_code"]
+    return code is None or code == 429 or code >= 500
+
+
+def _backoff(attempt: int) -> float:
+    """Exponential backoff for the retry after ``attempt``, jittered to spread retries."""
+    settings = get_settings()
+    delay = min(settings.webhook_retry_max_seconds, settings.webhook_retry_base_seconds * 2 ** (attempt - 1))
+    return random.uniform(delay / 2, delay)
+
+
+def _record(rows: List[Dict]) -> None:
+    """Append attempts to the delivery log; logging must never fail the delivery."""
+    try:
+        with SessionLocal() as session:
+            session.execute(insert(WebhookDelivery), rows)
+            session.commit()
+    except SQLAlchemyError:
+        logger.exception("Failed to record %d webhook deliveries", len(rows))
+
+
+def _schedule_retries(retries: Dict[int, List[Dict]]) -> None:
+    breaker = get_circuit_breaker()
+    for webhook_id, pending in retries.items():
+        # One task per endpoint, delayed past its backoff and any open circuit.
+        failed_attempt = max(d["attempt"] for d in pending) - 1
+        countdown = max(_backoff(failed_attempt), breaker.retry_after(webhook_id))
+        try:
+            deliver_webhooks_task.apply_async((pending,), countdown=countdown)
+        except Exception:  # noqa: BLE001
+            logger.exception("Failed to schedule %d webhook retries for webhook %s", len(pending), webhook_id)
+
+
+def _deliver(deliveries: List[Dict], retry: bool = True) -> List[Dict]:
+    """
+    Send deliveries, log every attempt and reschedule retryable failures.
+
+    Deliveries to a webhook whose circuit is open are not sent; they are
+    logged as ``skipped`` and retried once the circuit admits a probe. With
+    ``retry=False`` (manual tests) the circuit is bypassed and nothing is
+    rescheduled.
+    """
+    settings = get_settings()
+    breaker = get_circuit_breaker()
+    gate = [not retry or breaker.allow(d["webhook_id"]) for d in deliveries]
+    sent = iter(get_delivery_engine().deliver([d for d, allowed in zip(deliveries, gate) if allowed]))
+
+    results: List[Dict] = []
+    log: List[Dict] = []
+    retries: Dict[int, List[Dict]] = {}
+    for delivery, allowed in zip(deliveries, gate):
+        webhook_id = delivery["webhook_id"]
+        attempt = delivery.get("attempt", 1)
+        if allowed:
+            result = next(sent)
+            delivered = result["status_code"] is not None and 200 <= result["status_code"] < 300
+            retryable = not delivered and _is_retryable(result)
+            # A 4xx still proves the endpoint is up; only outages count against the circuit.
+            breaker.record(webhook_id, not retryable)
+            if delivered:
+                status = "delivered"
+            elif retryable and retry and attempt < settings.webhook_max_attempts:
+                status = "retrying"
+            else:
+                status = "failed"
+        else:
+            result = {"webhook_id": webhook_id, "status_code": None, "elapsed_ms": None, "error": "circuit open"}
+            status = "skipped" if attempt < settings.webhook_max_attempts else "failed"
+        if status in ("retrying", "skipped"):
+            retries.setdefault(webhook_id, []).append({**delivery, "attempt": attempt + 1})
+        results.append(result)
+        log.append(
+            {
+                "webhook_id": webhook_id,
+                "event": delivery["payload"].get("event"),
+                "attempt": attempt,
+                "status": status,
+                "status_code": result["status_code"],
+                "elapsed_ms": result["elapsed_ms"],
+                "error": result["error"],
+            }
+        )
+    if log:
+        _record(log)
+    _schedule_retries(retries)
+    return results
 
 
 @celery_app.task(name="app.tasks.send_webhook")
 def send_webhook_task(webhook_id: int, url: str, payload: Dict) -> Dict:
     """Send webhook payload and capture response metadata."""
-    settings = get_settings()
-    start = time.perf_counter()
-    try:
-        resp = httpx.post(url, json=payload, timeout=settings.webhook_timeout_seconds)
-        elapsed = (time.perf_counter() - start) * 1000  # ms
-        return {"webhook_id": webhook_id, "status_code": resp.status_code, "elapsed_ms": round(elapsed, 2), "error": None}
-    except Exception as exc:  # noqa: BLE001
-        elapsed = (time.perf_counter() - start) * 1000  # ms
-        return {"webhook_id": webhook_id, "status_code": None, "elapsed_ms": round(elapsed, 2), "error": str(exc)}
+    return _deliver([{"webhook_id": webhook_id, "url": url, "payload": payload}], retry=False)[0]
+
+
+@celery_app.task(name="app.tasks.deliver_webhooks")
+def deliver_webhooks_task(deliveries: List[Dict]) -> List[Dict]:
+    """Send a batch of ``{"webhook_id", "url", "payload"[, "attempt"]}`` deliveries concurrently."""
+    return _deliver(deliveries)
+
+
+@celery_app.task(name="app.tasks.prune_webhook_deliveries")
+def prune_webhook_deliveries_task(batch_size: int = 10000) -> int:
+    """Delete delivery log rows older than ``settings.webhook_delivery_retention_days``; return count."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=get_settings().webhook_delivery_retention_days)
+    deleted = 0
+    with SessionLocal() as session:
+        while True:
+            # Expired rows hold the lowest ids, so this walks the primary key and stops early.
+            ids = (
+                session.execute(
+                    select(WebhookDelivery.id)
+                    .where(WebhookDelivery.created_at < cutoff)
+                    .order_by(WebhookDelivery.id)
+                    .limit(batch_size)
+                )
+                .scalars()
+                .all()
+            )
+            if not ids:
+                return deleted
+            session.execute(delete(WebhookDelivery).where(WebhookDelivery.id.in_(ids)))
+            session.commit()
+            deleted += len(ids)
@@ -0,0 +1,129 @@
+"""Streaming decompression for compressed CSV uploads."""
+
+from __future__ import annotations
+
+import gzip
+import io
+import zlib
+from typing import BinaryIO, Callable, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # optional: enables .csv.zst uploads
+    zstandard = None
+
+# Upper bound on each piece of decompressed output handed to a sink, so a
+# small, highly compressed chunk cannot expand into one huge buffer.
+MAX_PIECE_BYTES = 1024 * 1024
+
+_SUFFIXES = {".csv.gz": "gzip", ".csv.zst": "zstd"}
+_DECODE_ERRORS = (zlib.error,) if zstandard is None else (zlib.error, zstandard.ZstdError)
+
+
+class CompressionError(ValueError):
+    """Raised when a compressed upload is corrupt or truncated."""
+
+
+def compression_for(filename: str) -> Optional[str]:
+    """Return ``gzip``/``zstd`` for compressed CSV names, ``None`` for plain ``.csv``."""
+    lowered = filename.lower()
+    for suffix, compression in _SUFFIXES.items():
+        if lowered.endswith(suffix):
+            return compression
+    return None
+
+
+def upload_suffixes() -> Tuple[str, ...]:
+    """File name suffixes accepted for upload; ``.csv.zst`` only with ``zstandard`` installed."""
+    suffixes = [".csv", ".csv.gz"]
+    if zstandard is not None:
+        suffixes.append(".csv.zst")
+    return tuple(suffixes)
+
+
+def open_decompressed(file_path: str) -> BinaryIO:
+    """
+    Open a stored upload for reading its CSV bytes, decompressing on the fly.
+
+    Offsets (``tell``/``seek``) refer to the decompressed stream; seeking
+    forward in a compressed file decompresses and discards up to the target.
+    """
+    compression = compression_for(file_path)
+    if compression == "gzip":
+        return gzip.open(file_path, "rb")
+    if compression == "zstd":
+        if zstandard is None:
+            raise CompressionError("zstd support requires the 'zstandard' package.")
+        reader = zstandard.ZstdDecompressor().stream_reader(open(file_path, "rb"), read_size=MAX_PIECE_BYTES)
+        return io.BufferedReader(reader, buffer_size=MAX_PIECE_BYTES)
+    return open(file_path, "rb")
+
+
+class _Sink:
+    __slots__ = ("write",)
+
+    def __init__(self, write: Callable[[bytes], None]):
+        self.write = write
+
+
+class StreamDecompressor:
+    """
+    Decompress chunks as they arrive, passing the output to ``sink``.
+
+    Used while an upload streams in, so the compressed body can be validated
+    and row-counted without writing (or holding) the uncompressed file.
+    """
+
+    def __init__(self, compression: str, sink: Callable[[bytes], None]):
+        self.compression = compression
+        self._sink = sink
+        if compression == "gzip":
+            self._gzip = zlib.decompressobj(wbits=31)
+            self._member_started = False
+        elif compression == "zstd" and zstandard is not None:
+            self._zstd = zstandard.ZstdDecompressor().stream_writer(
+                _Sink(self._emit), write_size=MAX_PIECE_BYTES, closefd=False
+            )
+        else:
+            raise CompressionError(f"Unsupported compression {compression!r}.")
+
+    def _emit(self, data: bytes) -> int:
+        self._sink(data)
+        return len(data)
+
+    def write(self, chunk: bytes) -> None:
+        try:
+            if self.compression == "gzip":
+                self._write_gzip(chunk)
+            else:
+                self._zstd.write(chunk)
+        except _DECODE_ERRORS as exc:
+            raise CompressionError(f"Invalid {self.compression} data: {exc}") from exc
+
+    def _write_gzip(self, data: bytes) -> None:
+        while data:
+            self._member_started = True
+            piece = self._gzip.decompress(data, MAX_PIECE_BYTES)
+            if piece:
+                self._sink(piece)
+            if self._gzip.eof:
+                # Concatenated gzip members decode as one stream, like gzip.open.
+                data = self._gzip.unused_data
+                self._gzip = zlib.decompressobj(wbits=31)
+                self._member_started = False
+            else:
+                data = self._gzip.unconsumed_tail
+
+    def close(self) -> None:
+        """Flush buffered output; raises CompressionError for a truncated gzip stream."""
+        try:
+            if self.compression == "gzip":
+                piece = self._gzip.flush()
+                if piece:
+                    self._sink(piece)
+                if self._member_started and not self._gzip.eof:
+                    raise CompressionError("Compressed file is truncated.")
+            else:
+                self._zstd.flush()
+        except _DECODE_ERRORS as exc:
+            raise CompressionError(f"Invalid {self.compression} data: {exc}") from exc
@@ -2,19 +2,301 @@
 
 from __future__ import annotations
 
+import codecs
 import csv
-from typing import Dict, Iterable, List, Optional
+import io
+import os
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from app.utils.compression import open_decompressed
+
+PRODUCT_COLUMNS = ("sku", "name", "description", "price", "active")
+# A cleaned product as a plain tuple, in PRODUCT_COLUMNS order.
+ProductRow = Tuple[str, Optional[str], Optional[str], Optional[float], Optional[bool]]
+REQUIRED_COLUMNS = ("sku",)
+MAX_HEADER_BYTES = 64 * 1024
+# ``products.price`` is Numeric(10, 2): anything that rounds to 10^8 or more overflows.
+PRICE_LIMIT = 99_999_999.995
+# Called with the line a rejected record starts on (the header is line 1),
+# the reason, and its raw cells in PRODUCT_COLUMNS order.
+RejectCallback = Callable[[int, str, Tuple[str, ...]], None]
+
+
+class CsvValidationError(ValueError):
+    """Raised when an uploaded CSV is malformed or missing required columns."""
+
+
+def _ends_in_quotes(line: bytes, in_quotes: bool) -> bool:
+    """
+    Whether a CSV line (without its ``\n``) ends inside a quoted field.
+
+    ``in_quotes`` is the state the line starts in. Follows ``csv.reader``'s
+    default dialect: a ``"`` opens a quoted field only at the start of a
+    field (stray quotes elsewhere are literal), ``""`` inside one is an
+    escaped quote, and any other ``"`` closes it. Only the quotes are
+    visited, so lines without any cost a single ``find``.
+    """
+    position = 0
+    while True:
+        quote = line.find(b'"', position)
+        if quote < 0:
+            return in_quotes
+        if in_quotes:
+            if line[quote + 1:quote + 2] == b'"':
+                position = quote + 2
+                continue
+            in_quotes = False
+        elif quote == 0 or line[quote - 1:quote] == b",":
+            in_quotes = True
+        position = quote + 1
+
+
+class CsvRowCounter:
+    """
+    Count CSV data rows incrementally from raw byte chunks.
+
+    Tracks quoted fields line by line (see ``_ends_in_quotes``) so newlines
+    inside them do not start a new record, and skips blank lines the way
+    ``csv.DictReader`` does. The
+    first record is parsed as the header and checked for required columns;
+    the whole stream is validated as UTF-8 as it goes.
+    """
+
+    def __init__(self, required_columns: Sequence[str] = REQUIRED_COLUMNS):
+        self.required_columns = tuple(required_columns)
+        self.header: Optional[List[str]] = None
+        self.rows = 0
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._partial = b""
+        self._in_quotes = False
+        self._header_bytes = bytearray()
+
+    def feed(self, chunk: bytes) -> int:
+        """Consume a chunk and return the number of complete data rows so far."""
+        try:
+            self._decoder.decode(chunk)
+        except UnicodeDecodeError as exc:
+            raise CsvValidationError("CSV must be UTF-8 encoded.") from exc
+
+        lines = (self._partial + chunk).split(b"\n")
+        self._partial = lines.pop()
+        if self.header is not None and not self._in_quotes and not any(b'"' in line for line in lines):
+            # Fast path: no quoting in play, every non-blank line is a record.
+            self.rows += len(lines) - lines.count(b"") - lines.count(b"\r")
+        else:
+            for line in lines:
+                self._consume(line)
+        if self.header is None and len(self._header_bytes) + len(self._partial) > MAX_HEADER_BYTES:
+            raise CsvValidationError("CSV header is too large.")
+        return self.rows
+
+    def close(self) -> int:
+        """Flush the trailing line and return the final data row count."""
+        try:
+            self._decoder.decode(b"", final=True)
+        except UnicodeDecodeError as exc:
+            raise CsvValidationError("CSV must be UTF-8 encoded.") from exc
+        if self._partial:
+            self._consume(self._partial)
+            self._partial = b""
+        if self._in_quotes:
+            # csv's non-strict reader closes an unterminated quoted field at EOF.
+            self._in_quotes = False
+            self._finish_record()
+        if self.header is None:
+            raise CsvValidationError("CSV file is empty.")
+        return self.rows
+
+    def _consume(self, line: bytes) -> None:
+        if not self._in_quotes and line in (b"", b"\r"):
+            return
+        if self.header is None:
+            self._header_bytes += line + b"\n"
+        self._in_quotes = _ends_in_quotes(line, self._in_quotes)
+        if not self._in_quotes:
+            self._finish_record()
+
+    def _finish_record(self) -> None:
+        if self.header is not None:
+            self.rows += 1
+            return
+        text = bytes(self._header_bytes).decode("utf-8")
+        self.header = next(csv.reader([text]), [])
+        missing = [column for column in self.required_columns if column not in self.header]
+        if missing:
+            raise CsvValidationError(f"CSV header is missing required columns: {', '.join(missing)}.")
+
+
+_BOOL_VALUES = {
+    **dict.fromkeys(("1", "true", "yes", "y", "on"), True),
+    **dict.fromkeys(("0", "false", "no", "n", "off"), False),
+}
 
 
 def _parse_bool(value: Optional[str]) -> Optional[bool]:
-    if value is None:
+    """Parse an ``active`` cell; blank is ``None``, anything unrecognized raises ValueError."""
+    value = (value or "").strip().lower()
+    if not value:
         return None
-    normalized = value.strip().lower()
-    if normalized in {"1", "true", "yes", "y", "on"}:
-        return True
-    if normalized in {"0", "false", "no", "n", "off"}:
-        return False
-    return None
+    try:
+        return _BOOL_VALUES[value]
+    except KeyError:
+        raise ValueError(f"invalid active value {value!r}") from None
+
+
+class _Cursor:
+    """Byte offset reached by a line iterator."""
+
+    __slots__ = ("offset",)
+
+    def __init__(self, offset: int = 0):
+        self.offset = offset
+
+
+def _read_lines(fh: BinaryIO, cursor: _Cursor, end: Optional[int] = None) -> Iterator[str]:
+    """Yield decoded lines from a binary file, stopping at byte offset ``end``."""
+    for raw in fh:
+        if end is not None and cursor.offset >= end:
+            return
+        cursor.offset += len(raw)
+        yield raw.decode("utf-8")
+
+
+def _read_header(fh: BinaryIO) -> Tuple[List[str], int, int]:
+    """
+    Return the header columns, the byte offset where data rows begin and
+    the number of lines before it (``fh`` must be at 0).
+    """
+    cursor = _Cursor()
+    reader = csv.reader(_read_lines(fh, cursor))
+    for header in reader:
+        if header:
+            return header, cursor.offset, reader.line_num
+    return [], cursor.offset, reader.line_num
+
+
+def _advance(fh: BinaryIO, position: int, target: int, count_lines: bool = False) -> int:
+    """
+    Move ``fh`` forward from ``position`` to ``target``, reading through streams that cannot seek.
+
+    Returns the number of lines skipped when ``count_lines`` is set (which
+    always reads the bytes in between), else 0.
+    """
+    if fh.seekable() and not count_lines:
+        fh.seek(target)
+        return 0
+    lines = 0
+    remaining = target - position
+    while remaining > 0:
+        piece = fh.read(min(remaining, 1024 * 1024))
+        if not piece:
+            break
+        lines += piece.count(b"\n")
+        remaining -= len(piece)
+    return lines
+
+
+def split_csv(file_path: str, parts: int) -> List[Tuple[int, int]]:
+    """
+    Split the data rows of a CSV into at most ``parts`` byte ranges.
+
+    Ranges end on record boundaries (quoted fields are tracked as in
+    ``CsvRowCounter``), so
+    each one can be parsed on its own with ``iter_products(start=, end=)``.
+    Plain ``.csv`` files only: a compressed file cannot be entered mid-stream.
+    """
+    with open(file_path, "rb") as fh:
+        _, data_start, _ = _read_header(fh)
+        size = fh.seek(0, os.SEEK_END)
+        fh.seek(data_start)
+        target = max((size - data_start) // max(parts, 1), 1)
+        ranges: List[Tuple[int, int]] = []
+        start = offset = data_start
+        in_quotes = False
+        for raw in fh:
+            offset += len(raw)
+            in_quotes = _ends_in_quotes(raw.rstrip(b"\n"), in_quotes)
+            if not in_quotes and offset - start >= target and len(ranges) < parts - 1:
+                ranges.append((start, offset))
+                start = offset
+        if offset > start:
+            ranges.append((start, offset))
+    return ranges
+
+
+def _clean_row(row: Dict) -> Optional[Dict]:
+    """Return the cleaned product, or ``None`` for a row that fails validation."""
+    sku = (row.get("sku") or "").strip()
+    if not sku:
+        return None
+    try:
+        price = _parse_price(row.get("price"))
+        active = _parse_bool(row.get("active"))
+    except ValueError:
+        return None
+    return {
+        "sku": sku,
+        "name": (row.get("name") or "").strip() or None,
+        "description": (row.get("description") or "").strip() or None,
+        "price": price,
+        "active": active,
+    }
+
+
+def iter_products_with_offsets(
+    file_path: str, start: int = 0, end: Optional[int] = None
+) -> Iterator[Tuple[Dict, int]]:
+    """
+    Stream cleaned CSV rows as dicts with the byte offset just past each one.
+
+    The reference parser; imports use the faster ``chunk_product_rows``.
+
+    The offset is a record boundary, so passing it back as ``start`` resumes
+    parsing with the next row. ``start``/``end`` restrict parsing to a byte
+    range (as produced by ``split_csv``); the header is always read from the
+    top of the file. Compressed files (``.csv.gz``/``.csv.zst``) are
+    decompressed as they are read and offsets count decompressed bytes.
+    """
+    with open_decompressed(file_path) as csvfile:
+        fieldnames, data_start, _ = _read_header(csvfile)
+        cursor = _Cursor(max(start, data_start))
+        _advance(csvfile, data_start, cursor.offset)
+        # csv pulls one line at a time until a record is complete, so the
+        # cursor sits at the end of the row just returned.
+        reader = csv.DictReader(_read_lines(csvfile, cursor, end), fieldnames=fieldnames)
+        for row in reader:
+            cleaned = _clean_row(row)
+            if cleaned is not None:
+                yield cleaned, cursor.offset
+
+
+def iter_products(file_path: str, start: int = 0, end: Optional[int] = None) -> Iterator[Dict]:
+    """
+    Stream cleaned CSV rows one at a time.
+
+    Expected columns: sku, name, description, price, active
+
+    ``start``/``end`` restrict parsing to a byte range produced by
+    ``split_csv``; the header is always read from the top of the file.
+    """
+    for cleaned, _ in iter_products_with_offsets(file_path, start, end):
+        yield cleaned
+
+
+def chunk_products_with_offsets(
+    file_path: str, chunk_size: int = 10000, start: int = 0
+) -> Iterator[Tuple[List[Dict], int]]:
+    """Stream CSV rows in chunks, each with the byte offset where the next chunk begins."""
+    buffer: List[Dict] = []
+    offset = start
+    for cleaned, offset in iter_products_with_offsets(file_path, start):
+        buffer.append(cleaned)
+        if len(buffer) >= chunk_size:
+            yield buffer, offset
+            buffer = []
+
+    if buffer:
+        yield buffer, offset
 
 
 def chunk_products(file_path: str, chunk_size: int = 10000) -> Iterable[List[Dict]]:
@@ -23,35 +305,137 @@ def chunk_products(file_path: str, chunk_size: int = 10000) -> Iterable[List[Dic
 
     Expected columns: sku, name, description, price, active
     """
-    with open(file_path, newline="", encoding="utf-8") as csvfile:
-        reader = csv.DictReader(csvfile)
-        buffer: List[Dict] = []
+    for chunk, _ in chunk_products_with_offsets(file_path, chunk_size):
+        yield chunk
+
+
+def chunk_product_rows(
+    file_path: str,
+    chunk_size: int = 10000,
+    start: int = 0,
+    end: Optional[int] = None,
+    on_reject: Optional[RejectCallback] = None,
+) -> Iterator[Tuple[List[ProductRow], int]]:
+    """
+    Stream cleaned rows as ``ProductRow`` tuples, in chunks, with resume offsets.
+
+    The fast path used by imports: ``csv.reader`` with column positions
+    looked up once from the header, and no dict per row. Rows, cleaning and
+    offsets match ``chunk_products_with_offsets`` exactly; each offset is
+    where the next chunk begins. ``start``/``end`` work as in ``iter_products``.
+
+    Rows without a SKU, with a price that is not a number (or does not fit
+    ``products.price``) or with an unrecognized ``active`` value are left
+    out and passed to ``on_reject`` with their line number and reason.
+    """
+    with open_decompressed(file_path) as csvfile:
+        header, data_start, header_lines = _read_header(csvfile)
+        first = max(start, data_start)
+        # Line numbers are only worth a read through the skipped bytes when someone asks for them.
+        lines_before = header_lines + _advance(csvfile, data_start, first, count_lines=on_reject is not None)
+        cursor = _Cursor(first)
+        width = len(header)
+        positions = {column: position for position, column in enumerate(header)}  # duplicates: last wins
+        # Absent columns read index -1, an empty cell appended to every row.
+        columns = tuple(positions.get(c, -1) for c in PRODUCT_COLUMNS)
+        sku_at, name_at, description_at, price_at, active_at = columns
+        bools = _BOOL_VALUES
+
+        def reject(row: List[str], reason: str) -> None:
+            if on_reject is not None:
+                # line_num is the record's last line; step back over newlines inside quoted cells.
+                line = lines_before + reader.line_num - sum(cell.count("\n") for cell in row)
+                on_reject(line, reason, tuple(row[at] for at in columns))
+
+        chunk: List[ProductRow] = []
+        offset = first
+        reader = csv.reader(_read_lines(csvfile, cursor, end))
         for row in reader:
-            sku = (row.get("sku") or "").strip()
+            if not row:
+                continue  # blank line
+            if len(row) < width:
+                row += [""] * (width - len(row))
+            row.append("")
+            sku = row[sku_at].strip()
             if not sku:
-                # Skip invalid rows without SKU
+                reject(row, "missing sku")
                 continue
+            price = row[price_at].strip()
+            if price:
+                try:
+                    price = float(price)
+                except ValueError:
+                    reject(row, f"invalid price {price!r}")
+                    continue
+                if not -PRICE_LIMIT < price < PRICE_LIMIT:  # also false for nan
+                    reject(row, f"price out of range {row[price_at].strip()!r}")
+                    continue
+            else:
+                price = None
+            active = row[active_at].strip().lower()
+            if active:
+                active = bools.get(active)
+                if active is None:
+                    reject(row, f"invalid active value {row[active_at].strip()!r}")
+                    continue
+            else:
+                active = None
+            chunk.append(
+                (
+                    sku,
+                    row[name_at].strip() or None,
+                    row[description_at].strip() or None,
+                    price,
+                    active,
+                )
+            )
+            offset = cursor.offset
+            if len(chunk) >= chunk_size:
+                yield chunk, offset
+                chunk = []
+        if chunk:
+            yield chunk, offset
 
-            cleaned = {
-                "sku": sku,
-                "name": (row.get("name") or "").strip() or None,
-                "description": (row.get("description") or "").strip() or None,
-                "price": _parse_price(row.get("price")),
-                "active": _parse_bool(row.get("active")),
-            }
-            buffer.append(cleaned)
-            if len(buffer) >= chunk_size:
-                yield buffer
-                buffer = []
 
-        if buffer:
-            yield buffer
+def iter_product_rows(
+    file_path: str, start: int = 0, end: Optional[int] = None, on_reject: Optional[RejectCallback] = None
+) -> Iterator[ProductRow]:
+    """Stream cleaned rows as ``ProductRow`` tuples (see ``chunk_product_rows``)."""
+    for chunk, _ in chunk_product_rows(file_path, start=start, end=end, on_reject=on_reject):
+        yield from chunk
 
 
 def _parse_price(value: Optional[str]) -> Optional[float]:
-    if value is None or value == "":
-        return None
-    try:
-        return float(value)
-    except ValueError:
+    """Parse a ``price`` cell; blank is ``None``, anything else that is not a storable number raises ValueError."""
+    value = (value or "").strip()
+    if not value:
         return None
+    price = float(value)
+    if not -PRICE_LIMIT < price < PRICE_LIMIT:
+        raise ValueError(f"price out of range {value!r}")
+    return price
+
+
+def format_products_csv(rows: Iterable, batch_size: int = 1000) -> Iterator[str]:
+    """
+    Render product rows as CSV text in the layout ``chunk_products`` reads.
+
+    ``rows`` yields objects with ``PRODUCT_COLUMNS`` attributes; output is
+    emitted in batches of ``batch_size`` rows, header first.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(PRODUCT_COLUMNS)
+    pending = 0
+    for row in rows:
+        active = row.active
+        writer.writerow(
+            (row.sku, row.name, row.description, row.price, None if active is None else ("true" if active else "false"))
+        )
+        pending += 1
+        if pending >= batch_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue()
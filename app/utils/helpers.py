@@ -1,7 +1,13 @@
 """Shared helper utilities."""
 
+import base64
+import binascii
+import json
+from decimal import Decimal
 from math import ceil
-from typing import List, Optional, Tuple
+from typing import Any, List, Optional, Tuple
+
+import orjson
 
 
 def normalize_sku(sku: str) -> str:
@@ -16,10 +22,31 @@ def paginate(total_count: int, page: int, limit: int) -> Tuple[int, int, int]:
     return page, total_pages, offset
 
 
-def apply_pagination(query, page: int, limit: int):
-    """Apply pagination to a SQLAlchemy query."""
-    if limit:
-        query = query.limit(limit)
-    if page and limit:
-        query = query.offset((page - 1) * limit)
-    return query
+def encode_cursor(last_id: int) -> str:
+    """Encode a keyset position as an opaque, URL-safe cursor."""
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    """Decode a cursor produced by ``encode_cursor``; raise ValueError if invalid."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        last_id = position["id"]
+    except (binascii.Error, ValueError, TypeError, KeyError) as exc:
+        raise ValueError("Invalid cursor.") from exc
+    if not isinstance(last_id, int):
+        raise ValueError("Invalid cursor.")
+    return last_id
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def json_bytes(content: Any) -> bytes:
+    """Serialize plain dicts/lists (as built by the lean read paths) to JSON in one orjson pass."""
+    return orjson.dumps(content, default=_json_default)
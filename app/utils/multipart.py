@@ -0,0 +1,97 @@
+"""Incremental multipart/form-data parsing for streamed uploads."""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, Optional
+
+from python_multipart.multipart import MultipartParseError, MultipartParser, parse_options_header
+
+
+class MultipartError(ValueError):
+    """Raised when an upload body is not usable multipart/form-data."""
+
+
+class MultipartFileReceiver:
+    """
+    Parse a multipart/form-data body chunk by chunk.
+
+    The first part named ``field`` that carries a filename is handed to the
+    callbacks as it arrives: ``on_start(filename)`` once, then
+    ``on_data(chunk)`` for each piece of its content. Other parts are
+    skipped. Nothing is spooled, so callbacks can reject a file (by raising)
+    before the rest of the body has been received.
+    """
+
+    def __init__(
+        self,
+        content_type: Optional[str],
+        field: str,
+        on_start: Callable[[str], None],
+        on_data: Callable[[bytes], None],
+    ):
+        mimetype, options = parse_options_header(content_type)
+        if mimetype != b"multipart/form-data" or not options.get(b"boundary"):
+            raise MultipartError("Expected a multipart/form-data body.")
+        self.field = field
+        self.filename: Optional[str] = None
+        self._on_start = on_start
+        self._on_data = on_data
+        self._headers: Dict[bytes, bytes] = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._receiving = False
+        self._parser = MultipartParser(
+            options[b"boundary"],
+            {
+                "on_part_begin": self._part_begin,
+                "on_header_field": self._header_field_data,
+                "on_header_value": self._header_value_data,
+                "on_header_end": self._header_end,
+                "on_headers_finished": self._headers_finished,
+                "on_part_data": self._part_data,
+                "on_part_end": self._part_end,
+            },
+        )
+
+    def _part_begin(self) -> None:
+        self._headers = {}
+
+    def _header_field_data(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _header_value_data(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _header_end(self) -> None:
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = self._header_value = b""
+
+    def _headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition"))
+        name = options.get(b"name", b"").decode("utf-8", "replace")
+        if self.filename is None and name == self.field and b"filename" in options:
+            self.filename = options[b"filename"].decode("utf-8", "replace")
+            self._receiving = True
+            self._on_start(self.filename)
+
+    def _part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._receiving:
+            self._on_data(bytes(data[start:end]))
+
+    def _part_end(self) -> None:
+        self._receiving = False
+
+    def feed(self, chunk: bytes) -> None:
+        try:
+            self._parser.write(chunk)
+        except MultipartParseError as exc:
+            raise MultipartError(f"Malformed multipart body: {exc}") from exc
+
+    def close(self) -> None:
+        """Finish parsing; raises MultipartError when no file field was found."""
+        try:
+            self._parser.finalize()
+        except MultipartParseError as exc:
+            raise MultipartError(f"Malformed multipart body: {exc}") from exc
+        if self.filename is None:
+            raise MultipartError(f"Missing file field {self.field!r}.")
@@ -0,0 +1,127 @@
+"""Shared helpers for benchmark scripts."""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+# Scratch databases and CSVs live outside the repo tree unless BENCH_DIR is set.
+BENCH_DIR = Path(os.environ.get("BENCH_DIR") or Path(tempfile.gettempdir()) / "product-importer-bench")
+
+
+def configure_database(name: str) -> str:
+    """Point the app at a throwaway SQLite file unless DATABASE_URL is set.
+
+    Celery runs on an in-memory broker and result backend, and progress and
+    the listing cache stay in-process, unless ``CELERY_BROKER_URL``,
+    ``CELERY_RESULT_BACKEND`` or ``REDIS_URL`` are set. Must run before any
+    ``app`` module is imported, since settings and the engine are created
+    at import time.
+    """
+    BENCH_DIR.mkdir(parents=True, exist_ok=True)
+    os.environ.setdefault("CELERY_BROKER_URL", "memory://")
+    os.environ.setdefault("CELERY_RESULT_BACKEND", "cache+memory://")
+    os.environ.setdefault("REDIS_URL", "")
+    default = f"sqlite:///{BENCH_DIR / name}.db"
+    return os.environ.setdefault("DATABASE_URL", default)
+
+
+def write_catalogue_csv(path: Path, rows: int, offset: int = 0) -> Path:
+    """Write a ``sample.csv``-style file with ``rows`` products."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["sku", "name", "description", "price", "active"])
+        for i in range(offset + 1, offset + rows + 1):
+            active = "true" if i % 2 else "false"
+            writer.writerow([f"SKU{i:07d}", f"Product {i}", f"Description for product {i}", f"{i % 1000}.99", active])
+    return path
+
+
+def seed_catalogue(rows: int, batch: int = 10_000) -> None:
+    """Make ``products`` hold exactly the first ``rows`` generated products (``benchmarks.generate``).
+
+    A table that already has ``rows`` products is kept as is (seeding is
+    slow); any other count is emptied and seeded again.
+    """
+    from sqlalchemy import delete, func, select
+
+    from app.database import SessionLocal, engine, init_db
+    from app.models import Product
+    from app.services.bulk_upsert import upsert_products
+    from app.services.search import ensure_search_indexes
+    from benchmarks.generate import catalogue_rows
+
+    init_db()
+    ensure_search_indexes(engine)
+    with SessionLocal() as session:
+        if session.execute(select(func.count(Product.id))).scalar_one() == rows:
+            return
+        session.execute(delete(Product))
+        session.commit()
+    chunk = []
+    for index, (sku, name, description, price, active) in enumerate(catalogue_rows(rows), 1):
+        chunk.append((sku.lower(), name, description, float(price), active == "true"))
+        if len(chunk) >= batch or index == rows:
+            with SessionLocal() as session:
+                upsert_products(session, chunk)
+                session.commit()
+            chunk = []
+
+
+@contextmanager
+def timed() -> Iterator[dict]:
+    """Measure wall-clock seconds into ``result["seconds"]``."""
+    result = {"seconds": 0.0}
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result["seconds"] = time.perf_counter() - start
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(path: Optional[str], benchmark: str, params: Dict, results: Dict) -> None:
+    """Write one benchmark run as JSON to ``path`` (nothing when None).
+
+    ``params`` are the run's arguments (a ``json`` entry, the output path
+    itself, is dropped). Besides them and ``results``, the document records the database
+    backend, git commit, Python version, host and time, so runs can be
+    compared over time.
+    """
+    if not path:
+        return
+    from sqlalchemy.engine import make_url
+
+    # None for benchmarks that never configure a database.
+    url = make_url(os.environ["DATABASE_URL"]) if "DATABASE_URL" in os.environ else None
+    document = {
+        "benchmark": benchmark,
+        "database": url.get_backend_name() if url else None,
+        "database_url": url.render_as_string(hide_password=True) if url else None,
+        "commit": _commit(),
+        "python": sys.version.split()[0],
+        "host": {"platform": platform.platform(), "cpus": os.cpu_count()},
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "params": {key: value for key, value in params.items() if key != "json"},
+        "results": results,
+    }
+    Path(path).write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
@@ -0,0 +1,186 @@
+"""Load-test the product listing on sync routes vs the async stack.
+
+Usage::
+
+    python -m benchmarks.bench_async_api --rows 50000 --requests 5000 --concurrency 200
+
+Seeds ``--rows`` products, then serves the API from a uvicorn subprocess
+twice: ``sync_app`` below (a ``def`` route on the sync ``get_db``, run in
+FastAPI's threadpool, issuing the same listing queries as the async
+service) and
+``app.main:app`` (``async def`` routes on ``AsyncProductService``). Each is
+driven with ``--requests`` ``GET /products`` calls over random pages up to
+``--max-page`` (a fifth of them filtered by ``active``) from
+``--concurrency`` concurrent clients, reporting requests/s and latency
+percentiles, plus the CPU the server process spent per request (Linux).
+The load generator and database share the machine, so compare the two runs
+rather than reading the absolute numbers; when the host is saturated, the
+CPU per request is the fairer measure of the server itself.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from benchmarks._common import configure_database
+
+configure_database("api")
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI, Query  # noqa: E402
+from sqlalchemy import func, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.database import SessionLocal, get_db, init_db  # noqa: E402
+from app.models import Product  # noqa: E402
+from app.services.bulk_upsert import upsert_products  # noqa: E402
+from app.services.product_service import _listing  # noqa: E402
+
+APPS = {
+    "sync": "benchmarks.bench_async_api:sync_app",
+    "async": "app.main:app",
+}
+
+sync_app = FastAPI()
+
+
+@sync_app.get("/products")
+def list_products_sync(
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100),
+    active: Optional[bool] = Query(None),
+    db: Session = Depends(get_db),
+):
+    """The listing as it was served before the async stack."""
+    listing = _listing(db.get_bind().dialect.name, None, None, active, None, page, limit, None, True, None)
+    rows, total = db.execute(listing.page).all(), db.execute(listing.count).scalar_one()
+    items, total, total_pages, _ = listing.result(rows, total, page, limit, None)
+    return {"items": items, "total": total, "page": page, "total_pages": total_pages, "limit": limit}
+
+
+def _seed(rows: int, batch: int = 10_000) -> None:
+    with SessionLocal() as session:
+        existing = session.execute(select(func.count(Product.id))).scalar_one()
+    for start in range(existing, rows, batch):
+        chunk = [
+            (f"sku{i:08d}", f"Product {i}", f"Description {i}", (i % 500) + 0.99, bool(i % 3))
+            for i in range(start, min(start + batch, rows))
+        ]
+        with SessionLocal() as session:
+            upsert_products(session, chunk)
+            session.commit()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _serve(target: str, port: int) -> subprocess.Popen:
+    # Queued clients can sit idle longer than uvicorn's default 5s keep-alive.
+    command = [sys.executable, "-m", "uvicorn", target, "--port", str(port), "--log-level", "warning"]
+    command += ["--timeout-keep-alive", "120"]
+    server = subprocess.Popen(command, env=os.environ.copy())
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/products?limit=1").status_code == 200:
+                return server
+        except httpx.TransportError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f"{target} did not start")
+
+
+def _cpu_seconds(pid: int) -> Optional[float]:
+    """User + system CPU time of a process, from ``/proc`` (None elsewhere)."""
+    stat = Path(f"/proc/{pid}/stat")
+    if not stat.exists():
+        return None
+    fields = stat.read_text().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+async def _load(base_url: str, requests: int, concurrency: int, pages: int) -> tuple:
+    latencies: List[float] = []
+    errors = 0
+    queue: asyncio.Queue = asyncio.Queue()
+    rng = random.Random(7)
+    for _ in range(requests):
+        params = {"page": rng.randint(1, pages), "limit": 20}
+        if rng.random() < 0.2:
+            params["active"] = "true"
+        queue.put_nowait(params)
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        nonlocal errors
+        while not queue.empty():
+            params = queue.get_nowait()
+            start = time.perf_counter()
+            try:
+                response = await client.get("/products", params=params)
+                response.raise_for_status()
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        seconds = time.perf_counter() - started
+    return latencies, errors, seconds
+
+
+def _report(label: str, latencies: List[float], errors: int, seconds: float, cpu: Optional[float]) -> None:
+    ordered = sorted(latencies) or [0.0]
+    p99 = ordered[int(0.99 * (len(ordered) - 1))]
+    cpu_ms = f"{cpu * 1000 / max(len(latencies), 1):.2f}" if cpu is not None else "n/a"
+    print(
+        f"{label:<6} {len(latencies) / seconds:>8.0f} req/s  p50 {statistics.median(ordered):>8.1f} ms"
+        f"  p99 {p99:>8.1f} ms  server cpu {cpu_ms} ms/req  errors={errors}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--max-page", type=int, default=50)
+    parser.add_argument("--apps", nargs="+", choices=list(APPS), default=list(APPS))
+    args = parser.parse_args()
+
+    init_db()
+    _seed(args.rows)
+    pages = max(min(args.max_page, args.rows // 20), 1)
+    for label in args.apps:
+        port = _free_port()
+        server = _serve(APPS[label], port)
+        try:
+            cpu_before = _cpu_seconds(server.pid)
+            latencies, errors, seconds = asyncio.run(
+                _load(f"http://127.0.0.1:{port}", args.requests, args.concurrency, pages)
+            )
+            cpu_after = _cpu_seconds(server.pid)
+        finally:
+            server.terminate()
+            server.wait()
+        cpu = cpu_after - cpu_before if cpu_before is not None and cpu_after is not None else None
+        _report(label, latencies, errors, seconds, cpu)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Time ``import_products_task`` end to end, run eagerly in process.
+
+Usage::
+
+    python -m benchmarks.bench_import --rows 100000 --duplicate-ratio 0.05 --invalid-ratio 0.01 --json import.json
+
+Generates a catalogue (``benchmarks.generate``), empties ``products`` and
+runs the Celery import task eagerly (``apply``, no broker or worker) twice
+per ``--modes`` entry: into the empty table, then again over the same file,
+where every row is unchanged. Reports rows/s and the task's
+inserted/updated/unchanged/rejected counts. ``copy`` and ``parallel`` run as
+``batch`` on SQLite; ``parallel`` is not benchmarked here, since its shards
+need a worker.
+
+Runs against ``DATABASE_URL`` when set (its ``products`` table is emptied),
+otherwise a scratch SQLite file.
+"""
+
+from __future__ import annotations
+
+import argparse
+import uuid
+from dataclasses import asdict
+
+from benchmarks._common import BENCH_DIR, configure_database, timed, write_results
+from benchmarks.generate import add_catalogue_arguments, generate_catalogue
+
+configure_database("import")
+
+from sqlalchemy import delete  # noqa: E402
+
+from app.database import SessionLocal, engine, init_db  # noqa: E402
+from app.models import Product  # noqa: E402
+from app.tasks.importer import import_products_task  # noqa: E402
+
+
+def _import(path: str, rows: int, chunk_size: int, mode: str) -> dict:
+    with timed() as t:
+        result = import_products_task.apply(
+            args=(path,), kwargs={"total_rows": rows, "chunk_size": chunk_size, "mode": mode}, task_id=str(uuid.uuid4())
+        ).get()
+    counts = {key: result.get(key) for key in ("processed", "inserted", "updated", "unchanged", "rejected")}
+    return {"seconds": round(t["seconds"], 4), "rows_per_second": round(rows / t["seconds"]), **counts}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--modes", nargs="+", choices=["batch", "copy"], default=["batch", "copy"])
+    parser.add_argument("--json", help="write the results to this file")
+    add_catalogue_arguments(parser)
+    args = parser.parse_args()
+
+    init_db()
+    path = BENCH_DIR / f"import_{args.rows}_{args.seed}.csv"
+    stats = generate_catalogue(
+        path, args.rows, args.duplicate_ratio, args.description_length, args.invalid_ratio, args.seed
+    )
+    results = {}
+    for mode in args.modes:
+        effective = mode if engine.dialect.name == "postgresql" else "batch"
+        with SessionLocal() as session:
+            session.execute(delete(Product))
+            session.commit()
+        for run in ("fresh", "reimport"):
+            result = _import(str(path), args.rows, args.chunk_size, mode)
+            results[f"{mode}/{run}"] = {"effective_mode": effective, **result}
+            print(
+                f"{mode:<6} {run:<9} {result['rows_per_second']:>9} rows/s  {result['seconds']:8.2f}s  "
+                f"inserted={result['inserted']} updated={result['updated']} "
+                f"unchanged={result['unchanged']} rejected={result['rejected']}"
+            )
+    write_results(args.json, "import", {**vars(args), "catalogue": asdict(stats)}, results)
+
+
+if __name__ == "__main__":
+    main()
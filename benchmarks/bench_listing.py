@@ -0,0 +1,97 @@
+"""Time ``GET /products`` under each filter and at deep pages.
+
+Usage::
+
+    python -m benchmarks.bench_listing --rows 200000 --repeat 50 --json listing.json
+
+Seeds ``--rows`` generated products (``benchmarks.generate``), then calls
+the real app in process (httpx ``ASGITransport``, so no server or network)
+with the listing cache disabled, timing each scenario ``--repeat`` times:
+the first page, every filter and ``q``, and the page at 50% and 90% of the
+catalogue both by ``page`` (OFFSET) and by keyset ``cursor``. Reports the
+median and p95 latency per scenario.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from typing import Dict, List
+
+from benchmarks._common import configure_database, seed_catalogue, write_results
+
+configure_database("listing")
+os.environ["PRODUCT_CACHE_TTL_SECONDS"] = "0"
+
+import httpx  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+
+from app.database import SessionLocal, async_engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Product  # noqa: E402
+from app.utils.helpers import encode_cursor  # noqa: E402
+
+LIMIT = 20
+
+
+def _scenarios() -> Dict[str, Dict]:
+    with SessionLocal() as session:
+        # Ids in listing order (newest first); a deep page's cursor is the id just before it.
+        ordered = session.execute(select(Product.id).order_by(Product.id.desc())).scalars().all()
+    scenarios = {
+        "first page": {},
+        "sku": {"sku": "sku0001"},
+        "name": {"name": "product 12"},
+        "description": {"description": "waterproof"},
+        "active": {"active": "false"},
+        "q": {"q": "wireless"},
+        "first page, no total": {"include_total": "false"},
+    }
+    for share in (50, 90):
+        position = min(len(ordered) * share // 100, max(len(ordered) - LIMIT, 0))
+        scenarios[f"page at {share}%"] = {"page": position // LIMIT + 1}
+        if position:
+            scenarios[f"cursor at {share}%"] = {"cursor": encode_cursor(ordered[position - 1])}
+    return scenarios
+
+
+async def _time(scenarios: Dict[str, Dict], repeat: int) -> Dict[str, Dict]:
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, params in scenarios.items():
+            samples: List[float] = []
+            for _ in range(repeat + 1):
+                start = time.perf_counter()
+                response = await client.get("/products", params={"limit": LIMIT, **params})
+                response.raise_for_status()
+                samples.append((time.perf_counter() - start) * 1000)
+            samples = sorted(samples[1:])  # the first call warms the statement cache
+            results[name] = {
+                "params": params,
+                "items": len(response.json()["items"]),
+                "p50_ms": round(statistics.median(samples), 3),
+                "p95_ms": round(samples[int(0.95 * (len(samples) - 1))], 3),
+            }
+            print(f"{name:<22} {results[name]['p50_ms']:>9.2f} ms p50  {results[name]['p95_ms']:>9.2f} ms p95")
+    await async_engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    seed_catalogue(args.rows)
+    results = asyncio.run(_time(_scenarios(), args.repeat))
+    write_results(args.json, "listing", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
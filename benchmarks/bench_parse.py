@@ -0,0 +1,65 @@
+"""Compare the dict and tuple CSV parsers used for imports.
+
+Usage::
+
+    python -m benchmarks.bench_parse --rows 100000 500000 --invalid-ratio 0.01 --json parse.json
+
+Parses generated catalogues (``benchmarks.generate``) without touching the
+database: the reference ``chunk_products`` (``csv.DictReader`` plus a dict
+per row) against ``chunk_product_rows`` (``csv.reader`` into tuples).
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from benchmarks._common import BENCH_DIR, timed, write_results
+from benchmarks.generate import add_catalogue_arguments, generate_catalogue
+
+from app.utils.csv_parser import chunk_product_rows, chunk_products
+
+PARSERS = {
+    "dict": lambda path, chunk_size: chunk_products(path, chunk_size=chunk_size),
+    "tuple": lambda path, chunk_size: (chunk for chunk, _ in chunk_product_rows(path, chunk_size=chunk_size)),
+}
+
+
+def _parse(parser, path: str, chunk_size: int) -> int:
+    return sum(len(chunk) for chunk in parser(path, chunk_size))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 500_000])
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3, help="best of N runs")
+    parser.add_argument("--json", help="write the results to this file")
+    add_catalogue_arguments(parser)
+    args = parser.parse_args()
+
+    results = {}
+    for rows in args.rows:
+        path = BENCH_DIR / f"parse_{rows}_{args.seed}.csv"
+        generate_catalogue(path, rows, args.duplicate_ratio, args.description_length, args.invalid_ratio, args.seed)
+        baseline = None
+        for name, parse in PARSERS.items():
+            best = float("inf")
+            for _ in range(args.repeat):
+                with timed() as t:
+                    parsed = _parse(parse, str(path), args.chunk_size)
+                best = min(best, t["seconds"])
+            baseline = baseline or best
+            results[f"{rows}/{name}"] = {
+                "parsed": parsed,
+                "seconds": round(best, 4),
+                "rows_per_second": round(parsed / best),
+            }
+            print(
+                f"{rows:>7} rows  {name:<5} {parsed:>8} parsed  {best:8.3f}s  "
+                f"{parsed / best:>10.0f} rows/s  {baseline / best:5.2f}x"
+            )
+    write_results(args.json, "parse", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Measure product search latency with and without the search indexes.
+
+Usage::
+
+    python -m benchmarks.bench_search --rows 1000000
+
+Seeds ``--rows`` synthetic products (skipped when the table already holds at
+least that many), then times each filter through ``AsyncProductService.list_products``.
+On Postgres every query runs twice: with the search indexes dropped, then
+after ``ensure_search_indexes`` + ``ANALYZE``. Other backends only report the
+unindexed fallback.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks._common import configure_database
+
+configure_database("search")
+
+from sqlalchemy import func, select, text  # noqa: E402
+
+from app.database import AsyncSessionLocal, SessionLocal, async_engine, engine, init_db  # noqa: E402
+from app.models import Product  # noqa: E402
+from app.services.bulk_upsert import upsert_products  # noqa: E402
+from app.services.product_service import AsyncProductService  # noqa: E402
+from app.services.search import SEARCH_INDEXES, ensure_search_indexes  # noqa: E402
+
+WORDS = ["steel", "cotton", "walnut", "ceramic", "linen", "copper", "bamboo", "wool", "glass", "oak"]
+
+QUERIES = {
+    "sku substring": {"sku": "00123"},
+    "name substring": {"name": "walnut lamp"},
+    "description substring": {"description": "hand finished copper"},
+    "q full-text": {"q": "ceramic vase"},
+}
+
+def _seed(rows: int, batch: int = 10_000) -> None:
+    with SessionLocal() as session:
+        existing = session.execute(select(func.count(Product.id))).scalar_one()
+    for start in range(existing, rows, batch):
+        chunk = []
+        for i in range(start, min(start + batch, rows)):
+            a, b, c = WORDS[i % 10], WORDS[(i // 10) % 10], WORDS[(i // 100) % 10]
+            chunk.append(
+                (
+                    f"sku{i:08d}",
+                    f"{a} {b} lamp {i}",
+                    f"Hand finished {c} and {a} {b} vase, item {i}.",
+                    (i % 500) + 0.99,
+                    bool(i % 3),
+                )
+            )
+        with SessionLocal() as session:
+            upsert_products(session, chunk)
+            session.commit()
+
+
+async def _time_query(filters: dict, repeat: int) -> float:
+    samples = []
+    async with AsyncSessionLocal() as session:
+        service = AsyncProductService(session)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            await service.list_products(
+                filters.get("sku"), filters.get("name"), None, filters.get("description"), 1, 20, q=filters.get("q")
+            )
+            samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def _time_queries(label: str, repeat: int) -> None:
+    for name, filters in QUERIES.items():
+        print(f"{label:<10} {name:<22} {await _time_query(filters, repeat):>10.2f} ms (median of {repeat})")
+    # Pooled connections belong to this event loop; the next run starts a new one.
+    await async_engine.dispose()
+
+
+def _run(label: str, repeat: int) -> None:
+    asyncio.run(_time_queries(label, repeat))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    init_db()
+    _seed(args.rows)
+
+    if engine.dialect.name != "postgresql":
+        _run("fallback", args.repeat)
+        return
+
+    with engine.begin() as conn:
+        for index in SEARCH_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {index}"))
+        conn.execute(text("ANALYZE products"))
+    _run("no index", args.repeat)
+
+    trigram = ensure_search_indexes(engine)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE products"))
+    _run("indexed" if trigram else "fts only", args.repeat)
+
+
+if __name__ == "__main__":
+    main()
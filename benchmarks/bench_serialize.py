@@ -0,0 +1,126 @@
+"""Compare CPU per listing response: ORM entities + Pydantic vs column rows + orjson.
+
+Usage::
+
+    python -m benchmarks.bench_serialize --rows 50000 --limit 100 --requests 500
+
+Seeds ``--rows`` products and ``--webhooks`` webhooks, then builds the JSON
+body of ``--requests`` ``GET /products`` pages (random pages of ``--limit``)
+and of ``GET /webhooks`` both ways, in process: ``orm`` is the original path
+(``select(Product)`` entities, ``ProductRead.model_validate`` per row, then
+``jsonable_encoder`` and ``JSONResponse`` as FastAPI does for a ``dict``
+response model), ``lean`` the current one (the listing's column rows as
+dicts, ``json_bytes``), both on a sync session. Reports the process CPU
+time per response, which includes the query and, on SQLite, the database
+itself; on Postgres the server's time is not counted.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Callable
+
+from benchmarks._common import configure_database
+
+configure_database("serialize")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from sqlalchemy import func, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.database import SessionLocal, init_db  # noqa: E402
+from app.models import Product, Webhook  # noqa: E402
+from app.schemas import ProductRead, WebhookRead  # noqa: E402
+from app.services.bulk_upsert import upsert_products  # noqa: E402
+from app.services.product_service import _listing  # noqa: E402
+from app.services.webhook_service import _LIST_QUERY  # noqa: E402
+from app.utils.helpers import json_bytes  # noqa: E402
+
+
+def _seed(rows: int, webhooks: int, batch: int = 10_000) -> None:
+    with SessionLocal() as session:
+        existing = session.execute(select(func.count(Product.id))).scalar_one()
+        hooks = session.execute(select(func.count(Webhook.id))).scalar_one()
+        session.add_all(
+            Webhook(url=f"https://example.com/hooks/{i}", event_type="product.updated", active=True)
+            for i in range(hooks, webhooks)
+        )
+        session.commit()
+    for start in range(existing, rows, batch):
+        chunk = [
+            (f"sku{i:08d}", f"Product {i}", f"Description {i}", (i % 500) + 0.99, bool(i % 3))
+            for i in range(start, min(start + batch, rows))
+        ]
+        with SessionLocal() as session:
+            upsert_products(session, chunk)
+            session.commit()
+
+
+def _orm_products(db: Session, page: int, limit: int) -> bytes:
+    query = select(Product).order_by(Product.id.desc()).offset((page - 1) * limit).limit(limit + 1)
+    products = db.execute(query).scalars().all()
+    total = db.execute(select(func.count(Product.id))).scalar_one()
+    items = [ProductRead.model_validate(product) for product in products[:limit]]
+    response = {"items": items, "total": total, "page": page, "limit": limit}
+    return JSONResponse(jsonable_encoder(response)).body
+
+
+def _lean_products(db: Session, page: int, limit: int) -> bytes:
+    listing = _listing(db.get_bind().dialect.name, None, None, None, None, page, limit, None, True, None)
+    rows, total = db.execute(listing.page).all(), db.execute(listing.count).scalar_one()
+    items, total, _, _ = listing.result(rows, total, page, limit, None)
+    return json_bytes({"items": items, "total": total, "page": page, "limit": limit})
+
+
+def _orm_webhooks(db: Session, page: int, limit: int) -> bytes:
+    webhooks = db.execute(select(Webhook).order_by(Webhook.id.desc())).scalars().all()
+    return JSONResponse(jsonable_encoder([WebhookRead.model_validate(webhook) for webhook in webhooks])).body
+
+
+def _lean_webhooks(db: Session, page: int, limit: int) -> bytes:
+    return json_bytes([row._asdict() for row in db.execute(_LIST_QUERY)])
+
+
+ROUTES = {
+    "products": {"orm": _orm_products, "lean": _lean_products},
+    "webhooks": {"orm": _orm_webhooks, "lean": _lean_webhooks},
+}
+
+
+def _cpu_per_response(build: Callable[[Session, int, int], bytes], requests: int, pages: int, limit: int) -> float:
+    rng = random.Random(7)
+    with SessionLocal() as db:
+        build(db, 1, limit)  # warm the statement caches
+        start = time.process_time()
+        for _ in range(requests):
+            build(db, rng.randint(1, pages), limit)
+            # A fresh identity map per response, as with a session per request.
+            db.expunge_all()
+        return (time.process_time() - start) * 1000 / requests
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--webhooks", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--max-page", type=int, default=50)
+    args = parser.parse_args()
+
+    init_db()
+    _seed(args.rows, args.webhooks)
+    pages = max(min(args.max_page, args.rows // args.limit), 1)
+    for route, paths in ROUTES.items():
+        baseline = None
+        for name, build in paths.items():
+            cpu_ms = _cpu_per_response(build, args.requests, pages, args.limit)
+            baseline = baseline or cpu_ms
+            print(f"{route:<9} {name:<5} {cpu_ms:8.3f} ms cpu/response  {baseline / cpu_ms:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
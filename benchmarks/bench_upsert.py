@@ -0,0 +1,82 @@
+"""Compare row-by-row and set-based product upserts.
+
+Usage::
+
+    python -m benchmarks.bench_upsert --rows 50000
+
+Runs against ``DATABASE_URL`` when set, otherwise a scratch SQLite file.
+Each strategy imports the file twice: once into an empty table (inserts) and
+once more on top of itself, where every row is unchanged (no-op updates).
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from benchmarks._common import BENCH_DIR, configure_database, timed, write_catalogue_csv
+
+configure_database("upsert")
+
+from sqlalchemy import delete, select  # noqa: E402
+
+from app.database import SessionLocal, init_db  # noqa: E402
+from app.models import Product  # noqa: E402
+from app.tasks.importer import _upsert_products  # noqa: E402
+from app.utils.csv_parser import PRODUCT_COLUMNS, chunk_product_rows  # noqa: E402
+
+
+def _row_by_row_upsert(session, products_chunk) -> None:
+    """The original per-row SELECT + ORM dirty tracking implementation."""
+    for row in products_chunk:
+        product_data = dict(zip(PRODUCT_COLUMNS, row))
+        sku = product_data["sku"].lower()
+        existing = session.execute(select(Product).where(Product.sku == sku)).scalars().first()
+        if existing:
+            existing.name = product_data.get("name", existing.name)
+            existing.description = product_data.get("description", existing.description)
+            if product_data.get("price") is not None:
+                existing.price = product_data["price"]
+            if product_data.get("active") is not None:
+                existing.active = product_data["active"]
+        else:
+            session.add(Product(**product_data))
+    session.commit()
+
+
+STRATEGIES = {
+    "row_by_row": _row_by_row_upsert,
+    "set_based": _upsert_products,
+}
+
+
+def _import(path: str, upsert, chunk_size: int) -> int:
+    processed = 0
+    for chunk, _ in chunk_product_rows(path, chunk_size=chunk_size):
+        with SessionLocal() as session:
+            upsert(session, chunk)
+        processed += len(chunk)
+    return processed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    init_db()
+    path = str(write_catalogue_csv(BENCH_DIR / f"upsert_{args.rows}.csv", args.rows))
+
+    for name, upsert in STRATEGIES.items():
+        with SessionLocal() as session:
+            session.execute(delete(Product))
+            session.commit()
+        for phase in ("insert", "no-op"):
+            with timed() as t:
+                processed = _import(path, upsert, args.chunk_size)
+            rate = processed / t["seconds"]
+            print(f"{name:<11} {phase:<6} {processed:>8} rows  {t['seconds']:8.2f}s  {rate:>10.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Compare per-request webhook POSTs with the pooled delivery engine.
+
+Usage::
+
+    python -m benchmarks.bench_webhooks --deliveries 2000 --latency-ms 20
+
+Starts a local HTTP/1.1 receiver that sleeps ``--latency-ms`` per request,
+then sends the same deliveries twice: one blocking ``httpx.post`` at a time
+(the original sender) and through ``WebhookDeliveryEngine`` in batches of
+``--per-task`` (one ``deliver_webhooks_task`` each).
+"""
+
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from app.services.webhook_delivery import WebhookDeliveryEngine
+from benchmarks._common import timed
+
+
+def _start_receiver(latency: float) -> ThreadingHTTPServer:
+    class Receiver(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, so pooled connections are reused
+
+        def do_POST(self):  # noqa: N802
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if latency:
+                time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Receiver)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _report(label: str, count: int, seconds: float, failed: int) -> None:
+    print(f"{label:<12} {count:>7} deliveries {seconds:>8.2f}s {count / seconds:>10.0f}/s  failed={failed}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--deliveries", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--per-task", type=int, default=100)
+    parser.add_argument("--per-host", type=int, default=10)
+    args = parser.parse_args()
+
+    server = _start_receiver(args.latency_ms / 1000)
+    url = f"http://127.0.0.1:{server.server_address[1]}/hook"
+    payload = {"event": "product.imported", "skus": [f"sku{i:07d}" for i in range(100)]}
+    deliveries = [{"webhook_id": 1, "url": url, "payload": payload} for _ in range(args.deliveries)]
+
+    failed = 0
+    with timed() as elapsed:
+        for delivery in deliveries:
+            try:
+                httpx.post(delivery["url"], json=delivery["payload"], timeout=10).raise_for_status()
+            except httpx.HTTPError:
+                failed += 1
+    _report("per-request", len(deliveries), elapsed["seconds"], failed)
+
+    engine = WebhookDeliveryEngine(timeout=10, max_connections=100, per_host_limit=args.per_host)
+    failed = 0
+    with timed() as elapsed:
+        for start in range(0, len(deliveries), args.per_task):
+            results = engine.deliver(deliveries[start:start + args.per_task])
+            failed += sum(1 for result in results if result["status_code"] != 200)
+    _report("pooled", len(deliveries), elapsed["seconds"], failed)
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
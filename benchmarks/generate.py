@@ -0,0 +1,135 @@
+"""Generate a deterministic synthetic product catalogue CSV.
+
+Usage::
+
+    python -m benchmarks.generate catalogue.csv --rows 1000000 --duplicate-ratio 0.05 --invalid-ratio 0.01
+
+The same arguments (and ``--seed``) always produce the same bytes. Rows
+follow ``sample.csv``'s layout; ``--duplicate-ratio`` of them repeat an
+earlier SKU (in different case, with a new price, so the last row wins on
+import), ``--invalid-ratio`` fail import validation (missing SKU,
+non-numeric price or unknown ``active`` value) and descriptions are about
+``--description-length`` characters of filler words.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import random
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterator, List
+
+WORDS = (
+    "steel", "cotton", "compact", "wireless", "premium", "classic", "outdoor", "ergonomic", "organic", "modular",
+    "portable", "vintage", "smart", "heavy", "duty", "lightweight", "waterproof", "handmade", "deluxe", "eco",
+)
+INVALID_KINDS = ("missing sku", "invalid price", "invalid active")
+
+
+@dataclass
+class CatalogueStats:
+    rows: int = 0
+    unique_skus: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    bytes: int = 0
+
+
+def _description(rng: random.Random, length: int) -> str:
+    if length <= 0:
+        return ""
+    words: List[str] = []
+    size = -1
+    while size < length:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)[:length]
+
+
+def catalogue_rows(
+    rows: int,
+    duplicate_ratio: float = 0.0,
+    description_length: int = 40,
+    invalid_ratio: float = 0.0,
+    seed: int = 0,
+    stats: CatalogueStats | None = None,
+) -> Iterator[List[str]]:
+    """Yield ``rows`` CSV records (``sku, name, description, price, active`` cells, header excluded)."""
+    rng = random.Random(seed)
+    stats = stats if stats is not None else CatalogueStats()
+    for index in range(rows):
+        draw = rng.random()
+        if draw < invalid_ratio:
+            kind = INVALID_KINDS[index % len(INVALID_KINDS)]
+            sku = "" if kind == "missing sku" else f"BAD{index:08d}"
+            price = "n/a" if kind == "invalid price" else "1.00"
+            active = "maybe" if kind == "invalid active" else "true"
+            stats.invalid += 1
+            yield [sku, f"Broken {index}", "", price, active]
+        else:
+            if stats.unique_skus and draw < invalid_ratio + duplicate_ratio:
+                number = rng.randrange(stats.unique_skus)
+                sku = f"sku{number:08d}"  # same SKU after normalization
+                stats.duplicates += 1
+            else:
+                number = stats.unique_skus
+                sku = f"SKU{number:08d}"
+                stats.unique_skus += 1
+            yield [
+                sku,
+                f"Product {number}",
+                _description(rng, description_length),
+                f"{rng.randrange(100, 100_000) / 100:.2f}",
+                "true" if rng.random() < 0.75 else "false",
+            ]
+        stats.rows += 1
+
+
+def generate_catalogue(
+    path: Path,
+    rows: int,
+    duplicate_ratio: float = 0.0,
+    description_length: int = 40,
+    invalid_ratio: float = 0.0,
+    seed: int = 0,
+) -> CatalogueStats:
+    """Write a catalogue CSV (see ``catalogue_rows``) to ``path`` and return what it contains."""
+    if not 0 <= duplicate_ratio + invalid_ratio <= 1:
+        raise ValueError("duplicate_ratio + invalid_ratio must be between 0 and 1")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    stats = CatalogueStats()
+    with path.open("w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["sku", "name", "description", "price", "active"])
+        writer.writerows(catalogue_rows(rows, duplicate_ratio, description_length, invalid_ratio, seed, stats))
+    stats.bytes = path.stat().st_size
+    return stats
+
+
+def add_catalogue_arguments(parser: argparse.ArgumentParser) -> None:
+    """The generator options, shared by the benchmarks that import or parse a catalogue."""
+    parser.add_argument("--duplicate-ratio", type=float, default=0.0, help="share of rows repeating an earlier SKU")
+    parser.add_argument("--invalid-ratio", type=float, default=0.0, help="share of rows failing validation")
+    parser.add_argument("--description-length", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--rows", type=int, default=100_000)
+    add_catalogue_arguments(parser)
+    args = parser.parse_args()
+
+    stats = generate_catalogue(
+        args.path, args.rows, args.duplicate_ratio, args.description_length, args.invalid_ratio, args.seed
+    )
+    print(json.dumps(asdict(stats)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""Replay a JSONL log of API requests and report latency per route.
+
+Usage::
+
+    python -m benchmarks.replay workload.jsonl --generate 2000   # write a deterministic workload
+    python -m benchmarks.replay workload.jsonl --json replay.json
+    python -m benchmarks.replay workload.jsonl --base-url http://localhost:8000
+
+Each line is one request::
+
+    {"method": "GET", "path": "/products", "params": {"active": "true"}, "json": null}
+
+Lines without ``method`` and ``path`` (blank lines, other JSONL formats) are
+skipped and counted. Requests are sent in file order from ``--concurrency``
+clients, by default to the app in process (httpx ``ASGITransport``; the
+catalogue is first seeded with ``--rows`` generated products), or to a
+running server with ``--base-url``. Latencies are grouped by method and
+path, with numeric path segments folded into ``{id}``.
+
+``--generate N`` writes N requests instead: listings with random filters and
+pages, webhook listings and SKU-keyed batch price updates of the seeded
+products, so the same file replays the same work on any database.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import statistics
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks._common import configure_database, seed_catalogue, write_results
+
+configure_database("replay")
+
+import httpx  # noqa: E402
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+_FILTERS = {
+    "sku": ("sku0000", "sku0001"),
+    "name": ("product 1", "product 42"),
+    "description": ("steel", "wireless"),
+    "active": ("true", "false"),
+    "q": ("premium", "outdoor steel"),
+}
+
+
+def generate_workload(path: Path, requests: int, rows: int, seed: int = 0) -> None:
+    """Write ``requests`` deterministic requests against a catalogue of ``rows`` generated products."""
+    rng = random.Random(seed)
+    with path.open("w", encoding="utf-8") as fh:
+        for _ in range(requests):
+            draw = rng.random()
+            if draw < 0.8:
+                params = {"page": rng.randint(1, max(rows // 20, 1)), "limit": rng.choice((20, 50, 100))}
+                if rng.random() < 0.3:
+                    field = rng.choice(sorted(_FILTERS))
+                    params[field] = rng.choice(_FILTERS[field])
+                line = {"method": "GET", "path": "/products", "params": params}
+            elif draw < 0.9:
+                line = {"method": "GET", "path": "/webhooks"}
+            else:
+                operations = [
+                    {"op": "update", "sku": f"sku{rng.randrange(rows):08d}", "data": {"price": rng.randint(1, 99)}}
+                    for _ in range(rng.randint(1, 20))
+                ]
+                line = {"method": "POST", "path": "/products/batch", "json": {"operations": operations}}
+            fh.write(json.dumps(line) + "\n")
+
+
+def load_requests(path: Path) -> Tuple[List[Dict], int]:
+    """Return the replayable requests in ``path`` and the number of lines skipped."""
+    requests, skipped = [], 0
+    with path.open(encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                skipped += 1
+                continue
+            if isinstance(entry, dict) and entry.get("method") and entry.get("path"):
+                requests.append(entry)
+            else:
+                skipped += 1
+    return requests, skipped
+
+
+def _route(entry: Dict) -> str:
+    return f"{entry['method'].upper()} {_ID_SEGMENT.sub('/{id}', entry['path'].split('?')[0])}"
+
+
+async def _replay(requests: List[Dict], concurrency: int, base_url: Optional[str]) -> Tuple[Dict, float]:
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    failures: Dict[str, Dict[str, int]] = defaultdict(lambda: {"client_errors": 0, "server_errors": 0})
+    pending = iter(requests)
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        for entry in pending:
+            route = _route(entry)
+            start = time.perf_counter()
+            try:
+                response = await client.request(
+                    entry["method"], entry["path"], params=entry.get("params"), json=entry.get("json")
+                )
+            except httpx.TransportError:
+                failures[route]["server_errors"] += 1
+                continue
+            latencies[route].append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 500:
+                failures[route]["server_errors"] += 1
+            elif response.status_code >= 400:
+                failures[route]["client_errors"] += 1
+
+    if base_url:
+        client = httpx.AsyncClient(base_url=base_url, timeout=60)
+    else:
+        from app.main import app
+
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://replay")
+    async with client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        seconds = time.perf_counter() - started
+    if not base_url:
+        from app.database import async_engine
+
+        await async_engine.dispose()
+
+    routes = {}
+    for route, samples in sorted(latencies.items()):
+        ordered = sorted(samples)
+        routes[route] = {
+            "requests": len(ordered),
+            "p50_ms": round(statistics.median(ordered), 3),
+            "p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))], 3),
+            **failures.pop(route, {"client_errors": 0, "server_errors": 0}),
+        }
+    for route, counts in failures.items():
+        routes[route] = {"requests": 0, "p50_ms": None, "p95_ms": None, **counts}
+    return routes, seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--generate", type=int, metavar="N", help="write N generated requests to PATH and exit")
+    parser.add_argument("--rows", type=int, default=10_000, help="products to seed (and to target when generating)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--base-url", help="replay against a running server instead of the app in process")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    if args.generate:
+        generate_workload(args.path, args.generate, args.rows, args.seed)
+        print(f"wrote {args.generate} requests to {args.path}")
+        return
+
+    requests, skipped = load_requests(args.path)
+    if not args.base_url:
+        seed_catalogue(args.rows)
+    routes, seconds = asyncio.run(_replay(requests, args.concurrency, args.base_url))
+    for route, result in routes.items():
+        print(
+            f"{route:<26} {result['requests']:>6} req  p50 {result['p50_ms'] or 0:>8.2f} ms  "
+            f"p95 {result['p95_ms'] or 0:>8.2f} ms  4xx={result['client_errors']} 5xx={result['server_errors']}"
+        )
+    rate = len(requests) / seconds if seconds else 0.0
+    print(f"{len(requests)} requests in {seconds:.2f}s ({rate:.0f} req/s), {skipped} lines skipped")
+    results = {
+        "requests": len(requests),
+        "skipped_lines": skipped,
+        "seconds": round(seconds, 4),
+        "requests_per_second": round(rate, 1),
+        "routes": routes,
+    }
+    write_results(args.json, "replay", {**vars(args), "path": str(args.path)}, results)
+
+
+if __name__ == "__main__":
+    main()
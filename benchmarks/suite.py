@@ -0,0 +1,98 @@
+"""Run the benchmark suite against each database and collect one JSON report.
+
+Usage::
+
+    python -m benchmarks.suite --databases sqlite postgresql+psycopg2://bench@localhost/bench --output runs/today.json
+    python -m benchmarks.suite --quick   # small sizes, for a smoke run
+
+Runs ``bench_import``, ``bench_listing`` and ``replay`` once per
+``--databases`` entry (``sqlite`` is a fresh scratch file per benchmark; any
+other value is a SQLAlchemy URL of a scratch database, whose ``products``
+table is emptied), and ``bench_parse`` once, since it never touches the
+database. Each benchmark runs in its own process, as the app reads
+``DATABASE_URL`` at import time. The report lists every run's JSON document
+(see ``benchmarks._common.write_results``), ready to diff against earlier
+reports.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from benchmarks._common import BENCH_DIR
+from benchmarks.replay import generate_workload
+
+# Rows per benchmark; replay seeds replay_rows products and sends replay_requests requests.
+SIZES = {
+    "full": {"import": 100_000, "parse": 500_000, "listing": 200_000, "replay_rows": 10_000, "replay_requests": 2000},
+    "quick": {"import": 10_000, "parse": 50_000, "listing": 20_000, "replay_rows": 2000, "replay_requests": 300},
+}
+BENCHMARKS = ("import", "parse", "listing", "replay")
+
+
+def _commands(sizes: Dict[str, int], workload: Path) -> Dict[str, List[str]]:
+    return {
+        "import": [
+            "benchmarks.bench_import",
+            *("--rows", str(sizes["import"]), "--duplicate-ratio", "0.05", "--invalid-ratio", "0.01"),
+        ],
+        "parse": ["benchmarks.bench_parse", "--rows", str(sizes["parse"]), "--invalid-ratio", "0.01"],
+        "listing": ["benchmarks.bench_listing", "--rows", str(sizes["listing"])],
+        "replay": ["benchmarks.replay", str(workload), "--rows", str(sizes["replay_rows"])],
+    }
+
+
+def _run(name: str, command: List[str], database: Optional[str]) -> Dict:
+    env = os.environ.copy()
+    if database is None:
+        env.pop("DATABASE_URL", None)
+    elif database == "sqlite":
+        scratch = BENCH_DIR / f"suite_{name}.db"
+        scratch.unlink(missing_ok=True)
+        env["DATABASE_URL"] = f"sqlite:///{scratch}"
+    else:
+        env["DATABASE_URL"] = database
+    with tempfile.TemporaryDirectory() as scratch_dir:
+        output = Path(scratch_dir) / "result.json"
+        print(f"== {name} ({database or 'no database'})", flush=True)
+        subprocess.run([sys.executable, "-m", *command, "--json", str(output)], env=env, check=True)
+        return json.loads(output.read_text(encoding="utf-8"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--databases", nargs="+", default=["sqlite"], help="'sqlite' or SQLAlchemy URLs")
+    parser.add_argument("--benchmarks", nargs="+", choices=BENCHMARKS, default=list(BENCHMARKS))
+    parser.add_argument("--quick", action="store_true", help="small sizes, for a smoke run")
+    parser.add_argument("--output", type=Path, help="report path (default: a timestamped file in BENCH_DIR)")
+    args = parser.parse_args()
+
+    started = datetime.now(timezone.utc)
+    sizes = SIZES["quick" if args.quick else "full"]
+    BENCH_DIR.mkdir(parents=True, exist_ok=True)
+    workload = BENCH_DIR / f"workload_{sizes['replay_requests']}_{sizes['replay_rows']}.jsonl"
+    generate_workload(workload, sizes["replay_requests"], sizes["replay_rows"])
+    commands = _commands(sizes, workload)
+
+    runs = []
+    for name in args.benchmarks:
+        for database in [None] if name == "parse" else args.databases:
+            runs.append(_run(name, commands[name], database))
+
+    output = args.output or BENCH_DIR / f"suite_{started:%Y%m%dT%H%M%SZ}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    report = {"suite": "quick" if args.quick else "full", "sizes": sizes, "runs": runs}
+    output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(f"wrote {output}")
+
+
+if __name__ == "__main__":
+    main()
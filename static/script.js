@@ -21,10 +21,34 @@ async function handleResponse(res, fallbackMessage = "Request failed") {
 }
 
 const api = {
-  async uploadFile(file) {
+  async uploadFile(file, dryRun = false) {
     const form = new FormData();
     form.append("file", file);
-    const res = await fetch(`${API_BASE}/upload`, { method: "POST", body: form });
+    const res = await fetch(`${API_BASE}/upload?dry_run=${dryRun}`, { method: "POST", body: form });
+    return handleResponse(res, "Upload failed");
+  },
+  async createUploadSession(payload) {
+    const res = await fetch(`${API_BASE}/upload/sessions`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify(payload),
+    });
+    return handleResponse(res, "Upload failed");
+  },
+  async getUploadSession(uploadId) {
+    const res = await fetch(`${API_BASE}/upload/sessions/${uploadId}`);
+    return handleResponse(res, "Upload failed");
+  },
+  async uploadPart(uploadId, number, body, sha256) {
+    const res = await fetch(`${API_BASE}/upload/sessions/${uploadId}/parts/${number}`, {
+      method: "PUT",
+      headers: { "X-Content-SHA256": sha256 },
+      body,
+    });
+    return handleResponse(res, `Part ${number} failed`);
+  },
+  async completeUploadSession(uploadId, dryRun = false) {
+    const res = await fetch(`${API_BASE}/upload/sessions/${uploadId}/complete?dry_run=${dryRun}`, { method: "POST" });
     return handleResponse(res, "Upload failed");
   },
   async uploadStatus(taskId) {
@@ -56,8 +80,9 @@ const api = {
     const res = await fetch(`${API_BASE}/products/${id}`, { method: "DELETE" });
     return handleResponse(res, "Failed to delete product");
   },
-  async deleteAllProducts() {
-    const res = await fetch(`${API_BASE}/products?confirm=true`, { method: "DELETE" });
+  async deleteProducts(filters = {}) {
+    const query = new URLSearchParams({ ...filters, confirm: "true" });
+    const res = await fetch(`${API_BASE}/products?${query.toString()}`, { method: "DELETE" });
     return handleResponse(res, "Delete failed");
   },
   async listWebhooks() {
@@ -90,6 +115,36 @@ const api = {
   },
 };
 
+// Files above this size go through the resumable parts protocol.
+const CHUNKED_UPLOAD_THRESHOLD = 16 * 1024 * 1024;
+const PART_UPLOAD_ROUNDS = 3;
+
+async function sha256Hex(buffer) {
+  const digest = await crypto.subtle.digest("SHA-256", buffer);
+  return Array.from(new Uint8Array(digest), (byte) => byte.toString(16).padStart(2, "0")).join("");
+}
+
+async function uploadInParts(file, onProgress, dryRun = false) {
+  const session = await api.createUploadSession({ filename: file.name, size: file.size });
+  const { upload_id: uploadId, part_size: partSize, part_count: partCount } = session;
+  let missing = session.missing_parts;
+  // Failed parts are retried in later rounds; the server reports what is still missing.
+  for (let round = 0; missing.length && round < PART_UPLOAD_ROUNDS; round += 1) {
+    for (const number of missing) {
+      const body = await file.slice((number - 1) * partSize, number * partSize).arrayBuffer();
+      try {
+        await api.uploadPart(uploadId, number, body, await sha256Hex(body));
+      } catch {
+        continue;
+      }
+      onProgress(`Uploaded part ${number} of ${partCount}`);
+    }
+    missing = (await api.getUploadSession(uploadId)).missing_parts;
+  }
+  if (missing.length) throw new Error(`Upload incomplete: ${missing.length} part(s) failed`);
+  return api.completeUploadSession(uploadId, dryRun);
+}
+
 function qs(selector) {
   return document.querySelector(selector);
 }
@@ -136,8 +191,12 @@ function initUploadPage() {
   const statusMessage = qs("#status-message");
   const taskLabel = qs("#task-id-label");
   const errorBox = qs("#error-box");
+  const dryRunInput = qs("#dry-run-input");
+  const rejectedCount = qs("#rejected-count");
+  const rejectsLink = qs("#rejects-link");
   let pollTimeout = null;
   let polling = false;
+  let eventSource = null;
   let inFlight = false;
   let currentTask = null;
   let lastStatus = null;
@@ -149,6 +208,9 @@ function initUploadPage() {
     total.textContent = data.total;
     statusLabel.textContent = data.status;
     statusMessage.textContent = data.message || "";
+    rejectedCount.textContent = data.rejected || 0;
+    rejectsLink.href = `${API_BASE}/upload/${currentTask}/rejects`;
+    toggle(rejectsLink, data.rejected > 0);
     if (data.status !== lastStatus) {
       stalePolls = 0;
       lastStatus = data.status;
@@ -161,7 +223,41 @@ function initUploadPage() {
     // }
   }
 
+  function closeStream() {
+    if (eventSource) {
+      eventSource.close();
+      eventSource = null;
+    }
+  }
+
+  function watchStatus() {
+    // Server-pushed updates; fall back to polling when EventSource is
+    // unavailable or the stream drops before the import finishes.
+    if (!window.EventSource) {
+      schedulePoll();
+      return;
+    }
+    closeStream();
+    const source = new EventSource(`${API_BASE}/upload/stream/${currentTask}`);
+    eventSource = source;
+    source.addEventListener("progress", (e) => {
+      const data = JSON.parse(e.data);
+      updateStatus(data);
+      if (data.status === "error") {
+        toggle(errorBox, true);
+        errorBox.textContent = data.message || "Import failed";
+      }
+      if (["completed", "error"].includes(data.status)) closeStream();
+    });
+    source.onerror = () => {
+      if (eventSource !== source) return;
+      closeStream();
+      if (lastStatus !== "completed" && lastStatus !== "error") schedulePoll();
+    };
+  }
+
   function stopPolling() {
+    closeStream();
     if (pollTimeout) {
       clearTimeout(pollTimeout);
       pollTimeout = null;
@@ -204,19 +300,34 @@ function initUploadPage() {
   form.addEventListener("submit", async (e) => {
     e.preventDefault();
     if (!input.files.length) return;
+    const file = input.files[0];
+    const dryRun = dryRunInput.checked;
     try {
-      const { task_id } = await api.uploadFile(input.files[0]);
+      // crypto.subtle only exists in secure contexts (https or localhost).
+      const chunked = file.size > CHUNKED_UPLOAD_THRESHOLD && window.crypto && crypto.subtle;
+      const { task_id } = chunked
+        ? await uploadInParts(
+            file,
+            (message) => {
+              toggle(statusCard, true);
+              statusMessage.textContent = message;
+            },
+            dryRun,
+          )
+        : await api.uploadFile(file, dryRun);
       currentTask = task_id;
       taskLabel.textContent = `Task ID: ${task_id}`;
       toggle(statusCard, true);
       toggle(errorBox, false);
       stopPolling();
-      await fetchStatus();
-      schedulePoll();
+      lastStatus = null;
+      watchStatus();
     } catch (err) {
       progressBar.style.width = "0%";
       processed.textContent = "0";
       total.textContent = "0";
+      rejectedCount.textContent = "0";
+      toggle(rejectsLink, false);
       statusLabel.textContent = "error";
       statusMessage.textContent = err.message || "Upload failed";
       errorBox.textContent = err.message || "Upload failed";
@@ -379,24 +490,48 @@ function initAdminPage() {
   const btn = qs("#delete-all");
   const confirm = qs("#confirm-delete");
   const result = qs("#delete-result");
+  const filters = qs("#delete-filters");
+  const progress = qs("#delete-progress");
+  const progressBar = qs("#delete-progress-bar");
   if (!btn) return;
 
+  function showResult(message, kind) {
+    result.textContent = message;
+    result.className = `alert alert--${kind}`;
+    toggle(result, true);
+  }
+
+  // The delete runs as a background task reporting through the upload status endpoint.
+  async function watchDelete(taskId) {
+    try {
+      const data = await api.uploadStatus(taskId);
+      progressBar.style.width = `${data.percent}%`;
+      showResult(data.message || data.status, "warning");
+      if (data.status !== "completed") {
+        setTimeout(() => watchDelete(taskId), 500);
+        return;
+      }
+    } catch (err) {
+      showResult(err.message, "error");
+    }
+    btn.disabled = false;
+  }
+
   btn.addEventListener("click", async () => {
     if (!confirm.checked) {
-      result.textContent = "Please confirm before deleting.";
-      result.className = "alert alert--warning";
-      toggle(result, true);
+      showResult("Please confirm before deleting.", "warning");
       return;
     }
     try {
-      const res = await api.deleteAllProducts();
-      result.textContent = `Deleted ${res.deleted} products.`;
-      result.className = "alert alert--warning";
-      toggle(result, true);
+      btn.disabled = true;
+      const res = await api.deleteProducts(pruneEmptyParams(getFormData(filters)));
+      progressBar.style.width = "0%";
+      toggle(progress, true);
+      showResult("Delete queued", "warning");
+      watchDelete(res.task_id);
     } catch (err) {
-      result.textContent = err.message;
-      result.className = "alert alert--error";
-      toggle(result, true);
+      btn.disabled = false;
+      showResult(err.message, "error");
     }
   });
 }
@@ -0,0 +1,127 @@
+"""Tests for the asyncio product and webhook services."""
+
+import asyncio
+
+import orjson
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import WebhookDelivery
+from app.schemas import ProductCreate, ProductRead, ProductUpdate, WebhookCreate
+from app.services import product_cache, product_service
+from app.services.product_service import AsyncProductService
+from app.services.webhook_service import AsyncWebhookService
+from app.utils.helpers import json_bytes
+
+
+@pytest.fixture
+def emitted(monkeypatch):
+    events = []
+    monkeypatch.setattr(product_cache, "get_redis", lambda: None)
+    monkeypatch.setattr(product_service, "emit_product_event", lambda event, items: events.append((event, items)))
+    return events
+
+
+def _run(test, tmp_path):
+    """Run ``test(async_session)`` against a SQLite file created with the sync engine."""
+    url = f"sqlite:///{tmp_path / 'catalogue.db'}"
+    Base.metadata.create_all(create_engine(url))
+
+    async def main():
+        async_engine = create_async_engine(url.replace("sqlite", "sqlite+aiosqlite"), poolclass=StaticPool)
+        try:
+            async with async_sessionmaker(async_engine, expire_on_commit=False)() as db:
+                await test(db)
+        finally:
+            await async_engine.dispose()
+
+    asyncio.run(main())
+
+
+def test_product_crud_round_trip_emits_events(tmp_path, emitted):
+    async def scenario(db: AsyncSession):
+        service = AsyncProductService(db)
+        created = await service.create_product(ProductCreate(sku="AB-1", name="Widget", price=2.5))
+        assert (created.sku, created.active) == ("ab-1", True)
+
+        updated = await service.update_product(created.id, ProductUpdate(name="Gadget"))
+        assert (updated.name, updated.price) == ("Gadget", 2.5)
+        assert await service.update_product(created.id + 1, ProductUpdate(name="x")) is None
+
+        assert await service.delete_product(created.id)
+        assert not await service.delete_product(created.id)
+        assert [event for event, _ in emitted] == ["product.created", "product.updated", "product.deleted"]
+        assert emitted[-1][1] == [{"id": created.id, "sku": "ab-1"}]
+
+    _run(scenario, tmp_path)
+
+
+def test_listing_pages_filters_and_cursors(tmp_path, emitted):
+    async def scenario(db: AsyncSession):
+        service = AsyncProductService(db)
+        for index in range(7):
+            await service.create_product(ProductCreate(sku=f"SKU{index}", name=f"Item {index}", active=index % 2 == 0))
+
+        def page(listing):
+            items, total, total_pages, next_cursor = listing
+            return [item["id"] for item in items], total, total_pages, next_cursor
+
+        args = dict(sku=None, name=None, active=None, description=None, page=1, limit=3)
+        assert page(await service.list_products(**args)) == ([7, 6, 5], 7, 3, 5)
+        assert page(await service.list_products(**{**args, "page": 3})) == ([1], 7, 3, None)
+        assert page(await service.list_products(**{**args, "active": True})) == ([7, 5, 3], 4, 2, 3)
+        # Keyset pages report no total pages; without a total, no count either.
+        assert page(await service.list_products(**{**args, "cursor": 5})) == ([4, 3, 2], 7, None, 2)
+        assert page(await service.list_products(**{**args, "cursor": 2, "include_total": False})) == (
+            [1],
+            None,
+            None,
+            None,
+        )
+
+        items, total, total_pages, next_cursor = await service.list_products(None, "item", None, None, 1, 3)
+        assert ([item["sku"] for item in items], total, total_pages) == (["sku6", "sku5", "sku4"], 7, 3)
+        assert next_cursor == items[-1]["id"]
+        assert await service.estimate_total() is None
+
+    _run(scenario, tmp_path)
+
+
+def test_listing_rows_serialize_like_product_read(tmp_path, emitted):
+    async def scenario(db: AsyncSession):
+        service = AsyncProductService(db)
+        created = [
+            await service.create_product(ProductCreate(sku="A1", name="A", price=12.5)),
+            await service.create_product(ProductCreate(sku="A2", description="d", price=3, active=False)),
+            await service.create_product(ProductCreate(sku="A3")),
+        ]
+        items = (await service.list_products(None, None, None, None, 1, 10))[0]
+        expected = [product.model_dump() for product in reversed(created)]
+        assert orjson.loads(json_bytes(items)) == expected
+        assert [ProductRead.model_validate(item) for item in items] == list(reversed(created))
+
+    _run(scenario, tmp_path)
+
+
+def test_webhook_service_round_trip_and_delivery_stats(tmp_path):
+    async def scenario(db: AsyncSession):
+        service = AsyncWebhookService(db)
+        webhook = await service.create_webhook(WebhookCreate(url="https://example.com/hook", event_type="*"))
+        db.add_all(
+            WebhookDelivery(webhook_id=webhook.id, attempt=1, status=status, elapsed_ms=elapsed)
+            for status, elapsed in (("delivered", 10), ("failed", 30), ("delivered", 20))
+        )
+        await db.commit()
+
+        log = await service.list_deliveries(webhook.id)
+        assert (log.stats.attempts, log.stats.success_rate, log.stats.p50_ms) == (3, 0.6667, 20)
+        assert [item.elapsed_ms for item in log.items] == [20, 30, 10]  # newest first
+        assert await service.list_webhooks() == [{**webhook.model_dump(), "url": str(webhook.url)}]
+
+        assert await service.delete_webhook(webhook.id)
+        assert await service.get_webhook(webhook.id) is None
+
+    _run(scenario, tmp_path)
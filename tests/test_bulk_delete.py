@@ -0,0 +1,60 @@
+"""Tests for the batched, filtered product delete."""
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models import Product
+from app.services import product_cache, product_service
+from app.services.bulk_upsert import upsert_products
+from app.services.product_service import ProductService
+
+ROWS = [(f"SKU{index}", f"Product {index}", None, 1.0, index % 3 != 0) for index in range(20)]
+
+
+@pytest.fixture
+def session(monkeypatch):
+    monkeypatch.setattr(product_cache, "get_redis", lambda: None)
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        upsert_products(session, ROWS)
+        session.commit()
+        yield session
+
+
+@pytest.fixture
+def emitted(monkeypatch):
+    events = []
+    monkeypatch.setattr(product_service, "has_subscribers", lambda event_type: True)
+    monkeypatch.setattr(product_service, "emit_product_event", lambda event, items: events.append((event, items)))
+    return events
+
+
+def test_filtered_delete_runs_in_batches_and_announces_each(session, emitted):
+    progress = []
+    service = ProductService(session)
+    assert service.count_products(active=False) == 7
+    assert service.delete_products(active=False, batch_size=3, on_progress=progress.append) == 7
+
+    assert progress == [3, 6, 7]
+    assert [len(items) for _, items in emitted] == [3, 3, 1]
+    assert {item["sku"] for _, items in emitted for item in items} == {f"sku{i}" for i in range(0, 20, 3)}
+    remaining = session.execute(select(Product.active)).scalars().all()
+    assert len(remaining) == 13 and all(remaining)
+
+
+def test_delete_without_filters_or_subscribers_removes_everything(session, monkeypatch):
+    monkeypatch.setattr(product_service, "has_subscribers", lambda event_type: False)
+    service = ProductService(session)
+    assert service.delete_products(batch_size=8) == 20
+    assert service.count_products() == 0
+    assert service.delete_products() == 0
+
+
+def test_batches_skip_rows_that_do_not_match(session, emitted):
+    service = ProductService(session)
+    assert service.delete_products(name="product 1", batch_size=2) == 11  # 1, 10-19
+    assert service.count_products() == 9
+    assert service.count_products(name="product 1") == 0
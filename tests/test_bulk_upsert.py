@@ -0,0 +1,45 @@
+"""Tests for the set-based import upsert."""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models import Product
+from app.services.bulk_upsert import UpsertCounts, diff_products, upsert_products
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+ROWS = [(f"SKU{index}", f"Product {index}", None, 9.99, None if index % 3 else True) for index in range(30)]
+
+
+def test_reimporting_unchanged_rows_writes_nothing(session):
+    assert upsert_products(session, ROWS) == UpsertCounts(inserted=30)
+    session.commit()
+    assert upsert_products(session, ROWS) == UpsertCounts(unchanged=30)
+
+
+def test_counts_split_inserts_updates_and_no_ops(session):
+    upsert_products(session, ROWS[:10])
+    session.commit()
+    rows = ROWS[:10] + [("sku3", "Renamed", None, None, None), ("SKU99", "New", None, None, False)]
+    assert upsert_products(session, rows) == UpsertCounts(inserted=1, updated=1, unchanged=9)
+    session.commit()
+    renamed = session.query(Product).filter_by(sku="sku3").one()
+    assert (renamed.name, float(renamed.price)) == ("Renamed", 9.99)
+
+
+def test_dry_run_diff_predicts_the_upsert(session):
+    upsert_products(session, ROWS[:10])
+    session.commit()
+    rows = ROWS[5:15] + [("sku6", "Renamed", None, None, None), ("SKU7", "Product 7", None, 1.25, None)]
+    expected = diff_products(session, rows)
+    assert expected == UpsertCounts(inserted=5, updated=2, unchanged=3)
+    assert upsert_products(session, rows) == expected
@@ -0,0 +1,61 @@
+"""Tests for compressed CSV uploads."""
+
+import gzip
+
+import pytest
+
+from app.utils.compression import CompressionError, StreamDecompressor, compression_for, zstandard
+from app.utils.csv_parser import CsvRowCounter, chunk_products_with_offsets, iter_products
+
+DATA = b"sku,name,description\n" + b"".join(b'sku%d,name %d,"two\nlines"\n' % (index, index) for index in range(500))
+
+
+def _stream(blob: bytes, compression: str, size: int = 97) -> bytes:
+    received = []
+    decompressor = StreamDecompressor(compression, received.append)
+    for position in range(0, len(blob), size):
+        decompressor.write(blob[position:position + size])
+    decompressor.close()
+    return b"".join(received)
+
+
+def test_compression_is_detected_from_the_file_name():
+    assert compression_for("Feed.CSV.GZ") == "gzip"
+    assert compression_for("feed.csv.zst") == "zstd"
+    assert compression_for("feed.csv") is None
+
+
+def test_gzip_streams_across_members_and_detects_truncation():
+    blob = gzip.compress(DATA[:1000]) + gzip.compress(DATA[1000:])
+    assert _stream(blob, "gzip") == DATA
+    with pytest.raises(CompressionError):
+        _stream(blob[:-20], "gzip")
+    with pytest.raises(CompressionError):
+        _stream(b"plain text, not gzip", "gzip")
+
+
+def test_row_counter_sees_decompressed_rows():
+    counter = CsvRowCounter()
+    decompressor = StreamDecompressor("gzip", counter.feed)
+    decompressor.write(gzip.compress(DATA))
+    decompressor.close()
+    assert counter.close() == 500
+
+
+@pytest.mark.parametrize("suffix", [".csv.gz", ".csv.zst"])
+def test_compressed_files_parse_and_resume_like_plain_ones(suffix, tmp_path):
+    if suffix == ".csv.zst":
+        if zstandard is None:
+            pytest.skip("zstandard is not installed")
+        blob = zstandard.ZstdCompressor().compress(DATA)
+    else:
+        blob = gzip.compress(DATA)
+    plain, packed = tmp_path / "feed.csv", tmp_path / f"feed{suffix}"
+    plain.write_bytes(DATA)
+    packed.write_bytes(blob)
+
+    assert list(iter_products(str(packed))) == list(iter_products(str(plain)))
+    chunks = list(chunk_products_with_offsets(str(packed), chunk_size=120))
+    assert chunks == list(chunk_products_with_offsets(str(plain), chunk_size=120))
+    resumed = [row for chunk, _ in chunk_products_with_offsets(str(packed), 50, start=chunks[1][1]) for row in chunk]
+    assert resumed == list(iter_products(str(plain)))[240:]
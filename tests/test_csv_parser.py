@@ -0,0 +1,187 @@
+"""Regression tests for the incremental CSV parsers in app.utils.csv_parser."""
+
+import csv
+import io
+import random
+
+import pytest
+
+from app.utils.csv_parser import (
+    PRODUCT_COLUMNS,
+    CsvRowCounter,
+    CsvValidationError,
+    chunk_product_rows,
+    chunk_products_with_offsets,
+    iter_products,
+    iter_product_rows,
+    split_csv,
+)
+
+STRAY_QUOTES = ['55" screen', 'a"b"c', 'inch"', '"closed"tail', '"x""y"z', ' "spaced"']
+FIELDS = ["plain", "with, comma", 'say "hi"', "two\nlines", "crlf\r\ninside", "", "trailing\n", "ünïcödé"]
+
+
+def _random_csv(rng: random.Random, rows: int) -> str:
+    buffer = io.StringIO(newline="")
+    writer = csv.writer(buffer, lineterminator=rng.choice(["\n", "\r\n"]))
+    writer.writerow(["sku", "name", "description", "price", "active"])
+    for index in range(rows):
+        if rng.random() < 0.1:
+            buffer.write(rng.choice(["\n", "\r\n"]))  # blank line
+        if rng.random() < 0.1:
+            # Quotes that do not open a quoted field: literal mid-field, or trailing a closed one.
+            buffer.write(f'sku{index},{rng.choice(STRAY_QUOTES)},{rng.choice(STRAY_QUOTES)},1.50,true\n')
+            continue
+        writer.writerow([f"sku{index}", rng.choice(FIELDS), rng.choice(FIELDS), "1.50", "true"])
+    return buffer.getvalue()
+
+
+def _chunks(data: bytes, rng: random.Random):
+    position = 0
+    while position < len(data):
+        size = rng.choice([1, 2, 3, 7, 64, 1000])
+        yield data[position:position + size]
+        position += size
+
+
+def _dict_reader_rows(text: str) -> int:
+    return sum(1 for _ in csv.DictReader(io.StringIO(text, newline="")))
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_row_counter_matches_dict_reader_for_any_chunking(seed):
+    rng = random.Random(seed)
+    text = _random_csv(rng, rng.randint(0, 60))
+    counter = CsvRowCounter()
+    for chunk in _chunks(text.encode("utf-8"), rng):
+        counter.feed(chunk)
+    assert counter.close() == _dict_reader_rows(text)
+    assert counter.header == ["sku", "name", "description", "price", "active"]
+
+
+def test_stray_quote_does_not_swallow_the_rows_after_it(tmp_path):
+    data = b"sku,name,description,price,active\n" + b'TV1,55" screen,,1,true\n' + b"sku,name,,1,true\n" * 1000
+    counter = CsvRowCounter()
+    counter.feed(data)
+    assert counter.close() == 1001
+
+    path = tmp_path / "products.csv"
+    path.write_bytes(data)
+    assert len(split_csv(str(path), 4)) == 4
+
+def test_row_counter_rejects_missing_required_column():
+    counter = CsvRowCounter()
+    with pytest.raises(CsvValidationError):
+        counter.feed(b"name,price\nx,1\n")
+
+
+def test_row_counter_rejects_non_utf8():
+    counter = CsvRowCounter()
+    with pytest.raises(CsvValidationError):
+        counter.feed(b"sku,name\nabc,\xff\xfe\n")
+        counter.close()
+
+
+def test_row_counter_rejects_empty_file():
+    with pytest.raises(CsvValidationError):
+        CsvRowCounter().close()
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_split_ranges_reassemble_the_full_parse(seed, tmp_path):
+    rng = random.Random(seed)
+    text = _random_csv(rng, rng.randint(0, 80))
+    path = tmp_path / "products.csv"
+    path.write_bytes(text.encode("utf-8"))
+
+    full = list(iter_products(str(path)))
+    expected_skus = [row["sku"] for row in csv.DictReader(io.StringIO(text, newline="")) if row["sku"].strip()]
+    assert [row["sku"] for row in full] == expected_skus
+
+    for parts in (1, 2, 3, 7, 50):
+        ranges = split_csv(str(path), parts)
+        assert len(ranges) <= parts
+        assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+        sharded = [row for start, end in ranges for row in iter_products(str(path), start, end)]
+        assert sharded == full
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_chunk_offsets_resume_with_the_next_row(seed, tmp_path):
+    rng = random.Random(seed)
+    text = _random_csv(rng, rng.randint(1, 80))
+    path = tmp_path / "products.csv"
+    path.write_bytes(text.encode("utf-8"))
+    full = list(iter_products(str(path)))
+
+    consumed = 0
+    for chunk, offset in chunk_products_with_offsets(str(path), chunk_size=rng.randint(1, 10)):
+        consumed += len(chunk)
+        resumed = chunk_products_with_offsets(str(path), chunk_size=7, start=offset)
+        assert [row for rest, _ in resumed for row in rest] == full[consumed:]
+
+
+CELLS = ["", " ", "1.5", " 2 ", "abc", "-3.25", "TRUE", " no ", "Y", "off", "maybe", "sku", "  padded  "] + FIELDS
+
+
+def _messy_csv(rng: random.Random, rows: int) -> str:
+    """Shuffled, duplicated or missing columns, ragged rows and arbitrary cell values."""
+    columns = rng.sample(list(PRODUCT_COLUMNS) + ["extra", "sku"], rng.randint(1, 7))
+    if "sku" not in columns:
+        columns.append("sku")
+    buffer = io.StringIO(newline="")
+    writer = csv.writer(buffer, lineterminator=rng.choice(["\n", "\r\n"]))
+    writer.writerow(columns)
+    for _ in range(rows):
+        if rng.random() < 0.05:
+            buffer.write("\n")
+        width = len(columns) + rng.choice([-2, -1, 0, 0, 0, 1])
+        writer.writerow([rng.choice(CELLS) for _ in range(max(width, 1))])
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_tuple_parser_matches_dict_parser(seed, tmp_path):
+    rng = random.Random(seed)
+    path = tmp_path / "products.csv"
+    path.write_bytes(_messy_csv(rng, rng.randint(0, 80)).encode("utf-8"))
+    chunk_size = rng.randint(1, 12)
+
+    reference = [
+        ([tuple(row[column] for column in PRODUCT_COLUMNS) for row in chunk], offset)
+        for chunk, offset in chunk_products_with_offsets(str(path), chunk_size=chunk_size)
+    ]
+    assert list(chunk_product_rows(str(path), chunk_size=chunk_size)) == reference
+    for start, end in split_csv(str(path), 3):
+        expected = [tuple(row[column] for column in PRODUCT_COLUMNS) for row in iter_products(str(path), start, end)]
+        assert [row for chunk, _ in chunk_product_rows(str(path), 5, start, end) for row in chunk] == expected
+
+
+def test_invalid_rows_are_rejected_with_their_line_and_reason(tmp_path):
+    path = tmp_path / "products.csv"
+    path.write_bytes(
+        b"sku,name,description,price,active\n"
+        b"a,ok,,1.5,yes\n"
+        b",no sku,,1,true\n"
+        b'b,,"two\nlines",abc,\n'
+        b"\n"
+        b"c,,,1e9,\n"
+        b"d,,,nan,\n"
+        b"e,,,2, maybe \n"
+        b"f,, ,  ,\n"
+    )
+    rejected = []
+    rows = list(iter_product_rows(str(path), on_reject=lambda *args: rejected.append(args)))
+    assert rows == [("a", "ok", None, 1.5, True), ("f", None, None, None, None)]
+    assert rejected == [
+        (3, "missing sku", ("", "no sku", "", "1", "true")),
+        (4, "invalid price 'abc'", ("b", "", "two\nlines", "abc", "")),
+        (7, "price out of range '1e9'", ("c", "", "", "1e9", "")),
+        (8, "price out of range 'nan'", ("d", "", "", "nan", "")),
+        (9, "invalid active value 'maybe'", ("e", "", "", "2", " maybe ")),
+    ]
+
+    resumed = []
+    start = next(offset for _, offset in chunk_product_rows(str(path), chunk_size=1))
+    list(chunk_product_rows(str(path), start=start, on_reject=lambda *args: resumed.append(args)))
+    assert resumed == rejected
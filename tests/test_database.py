@@ -0,0 +1,62 @@
+"""Tests for engine pool configuration and pool metrics."""
+
+import sqlite3
+import threading
+
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import NullPool
+
+from app.config import Settings
+from app.database import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    async_database_url,
+    engine_options,
+    pool_stats,
+)
+
+PG_URL = "postgresql+psycopg2://app:app@db:5432/product_importer"
+
+
+def test_pool_settings_reach_the_engine():
+    options = engine_options(Settings(database_url=PG_URL, db_pool_size=3, db_statement_timeout_ms=500))
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert (options["pool_size"], options["pool_pre_ping"]) == (3, True)
+    assert options["connect_args"] == {"options": "-c statement_timeout=500"}
+
+
+def test_null_pool_leaves_pooling_and_startup_options_to_pgbouncer():
+    options = engine_options(Settings(database_url=PG_URL, db_null_pool=True, db_statement_timeout_ms=500))
+    assert options["poolclass"] is NullPool
+    assert "pool_size" not in options and "connect_args" not in options
+
+
+def test_async_engine_uses_the_asyncio_driver_and_its_own_pool():
+    config = Settings(database_url=PG_URL, db_statement_timeout_ms=500)
+    assert async_database_url(config).drivername == "postgresql+asyncpg"
+    assert async_database_url(Settings(database_url="sqlite:///./x.db")).drivername == "sqlite+aiosqlite"
+    options = engine_options(config, asynchronous=True)
+    assert options["poolclass"] is InstrumentedAsyncQueuePool
+    assert options["connect_args"] == {"server_settings": {"statement_timeout": "500"}}
+
+
+def test_async_null_pool_disables_asyncpg_statement_caches():
+    options = engine_options(Settings(database_url=PG_URL, db_null_pool=True), asynchronous=True)
+    assert options["poolclass"] is NullPool
+    assert options["connect_args"] == {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+
+
+def test_exhausted_pool_counts_waits_and_timeouts():
+    pool = InstrumentedQueuePool(lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=0, timeout=0.2)
+    before = pool_stats.snapshot()
+    held = pool.connect()
+    with pytest.raises(PoolTimeoutError):
+        pool.connect()
+
+    threading.Timer(0.02, held.close).start()
+    pool.connect().close()
+    after = pool_stats.snapshot()
+    assert after["waits"] - before["waits"] == 2
+    assert after["timeouts"] - before["timeouts"] == 1
+    assert after["wait_seconds"] - before["wait_seconds"] >= 0.2
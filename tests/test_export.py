@@ -0,0 +1,75 @@
+"""Tests for the streamed product export."""
+
+import asyncio
+import csv
+import io
+import json
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Product
+from app.routers import products
+from app.utils.csv_parser import PRODUCT_COLUMNS
+
+
+@pytest.fixture
+def catalogue(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'catalogue.db'}")
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(engine)
+    with session_factory() as session:
+        session.add_all(
+            Product(sku=f"sku{i}", name=f"Lamp {i}" if i % 2 else f"Vase {i}", price=i + 0.5, active=i % 3 != 0)
+            for i in range(1, 10)
+        )
+        session.add(Product(sku="bare", name="Lamp without price"))
+        session.commit()
+    monkeypatch.setattr(products, "SessionLocal", session_factory)
+
+
+def _export(**params) -> tuple:
+    response = products.export_products(
+        **{"export_format": "csv", "sku": None, "name": None, "active": None, "description": None, "q": None, **params}
+    )
+
+    async def body():
+        return "".join([chunk async for chunk in response.body_iterator])
+
+    return response, asyncio.run(body())
+
+
+def test_csv_export_streams_the_filtered_catalogue(catalogue):
+    response, body = _export(name="lamp", active=True)
+    assert response.media_type == "text/csv"
+    assert response.headers["content-disposition"] == 'attachment; filename="products.csv"'
+
+    rows = list(csv.reader(io.StringIO(body)))
+    assert rows[0] == list(PRODUCT_COLUMNS)
+    # Lamps are the odd ids; multiples of 3 are inactive. In id order.
+    assert [row[0] for row in rows[1:]] == ["sku1", "sku5", "sku7", "bare"]
+    assert rows[1] == ["sku1", "Lamp 1", "", "1.50", "true"]
+    assert rows[-1] == ["bare", "Lamp without price", "", "", "true"]
+
+
+def test_ndjson_export_streams_one_object_per_product(catalogue):
+    response, body = _export(export_format="ndjson", sku="SKU", active=False)
+    assert response.media_type == "application/x-ndjson"
+    assert response.headers["content-disposition"] == 'attachment; filename="products.ndjson"'
+
+    lines = [json.loads(line) for line in body.splitlines()]
+    assert [line["sku"] for line in lines] == ["sku3", "sku6", "sku9"]
+    assert lines[0] == {"id": 3, "sku": "sku3", "name": "Lamp 3", "description": None, "price": 3.5, "active": False}
+
+
+def test_ndjson_lines_are_batched_without_losing_rows():
+    rows = [
+        SimpleNamespace(id=i, sku=f"sku{i}", name=None, description=None, price=None, active=True) for i in range(5)
+    ]
+    chunks = list(products._ndjson_lines(rows, batch_size=2))
+    assert [chunk.count("\n") for chunk in chunks] == [2, 2, 1]
+    assert [json.loads(line)["id"] for chunk in chunks for line in chunk.splitlines()] == [0, 1, 2, 3, 4]
+    assert list(products._ndjson_lines([])) == []
@@ -0,0 +1,89 @@
+"""Tests for resuming imports after the time limit and guarding manual resumes."""
+
+import uuid
+
+import pytest
+from celery.exceptions import SoftTimeLimitExceeded
+from fastapi import HTTPException
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Product
+from app.routers import upload
+from app.services import product_cache
+from app.services.checkpoints import get_checkpoint
+from app.services.progress import ProgressStore
+from app.tasks import importer
+from app.tasks.importer import import_products_task
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'catalogue.db'}")
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(engine)
+    store = ProgressStore()
+    monkeypatch.setattr(importer, "SessionLocal", session_factory)
+    monkeypatch.setattr(importer, "progress_store", store)
+    monkeypatch.setattr(importer, "publish_progress", lambda task_id, message: None)
+    monkeypatch.setattr(importer, "has_subscribers", lambda event_type: False)
+    monkeypatch.setattr(product_cache, "get_redis", lambda: None)
+    path = tmp_path / "products.csv"
+    path.write_text("sku,name,price\n" + "".join(f"sku{i},Item {i},1.5\n" for i in range(5)))
+    return session_factory, store, str(path)
+
+
+def test_batch_import_requeues_itself_at_the_soft_time_limit(env, monkeypatch):
+    session_factory, store, path = env
+    task_id = str(uuid.uuid4())
+    chunk_product_rows = importer.chunk_product_rows
+
+    def one_chunk_then_time_limit(*args, **kwargs):
+        chunks = chunk_product_rows(*args, **kwargs)
+        yield next(chunks)
+        raise SoftTimeLimitExceeded()
+
+    requeued = []
+    monkeypatch.setattr(importer, "chunk_product_rows", one_chunk_then_time_limit)
+    monkeypatch.setattr(import_products_task, "apply_async", lambda **options: requeued.append(options))
+    import_products_task.apply(args=(path, 5), kwargs={"chunk_size": 2, "mode": "batch"}, task_id=task_id)
+
+    assert requeued == [{"args": (path, 5), "kwargs": {"chunk_size": 2, "mode": "batch"}, "task_id": task_id}]
+    record = store.get(task_id)
+    assert (record["status"], record["processed"]) == ("processing", 2)
+    with session_factory() as session:
+        assert get_checkpoint(session, task_id).processed == 2
+
+    # The requeued run continues after the committed chunk.
+    monkeypatch.setattr(importer, "chunk_product_rows", chunk_product_rows)
+    result = import_products_task.apply(args=(path, 5), kwargs={"chunk_size": 2, "mode": "batch"}, task_id=task_id)
+    assert (result.get()["processed"], result.get()["inserted"]) == (5, 5)  # counts carry over the checkpoint
+    with session_factory() as session:
+        assert session.execute(select(func.count(Product.id))).scalar_one() == 5
+
+
+def test_time_limit_fails_imports_that_cannot_resume(env, monkeypatch):
+    _, store, path = env
+    task_id = str(uuid.uuid4())
+
+    def time_limit(*args, **kwargs):
+        raise SoftTimeLimitExceeded()
+
+    monkeypatch.setattr(importer, "diff_products", time_limit)
+    result = import_products_task.apply(args=(path, 5), kwargs={"dry_run": True}, task_id=task_id)
+    assert isinstance(result.result, SoftTimeLimitExceeded)
+    assert store.get(task_id)["status"] == "error"
+
+
+@pytest.mark.parametrize("running, expected", [(True, 409), (False, 404)])
+def test_resume_is_refused_while_the_import_runs(monkeypatch, running, expected):
+    store = ProgressStore()
+    store.update_progress("task-1", 10, 100, "Processed 10 rows")
+    monkeypatch.setattr(upload, "progress_store", store)
+    monkeypatch.setattr(upload, "_import_running", lambda task_id: running)
+    # A stopped import gets past the guard (and then finds no checkpoint here).
+    monkeypatch.setattr(upload, "get_checkpoint", lambda db, task_id: None)
+    with pytest.raises(HTTPException) as raised:
+        upload.resume_upload("task-1", db=None)
+    assert raised.value.status_code == expected
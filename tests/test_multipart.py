@@ -0,0 +1,36 @@
+"""Tests for the streaming multipart receiver used by POST /upload."""
+
+import pytest
+
+from app.utils.multipart import MultipartError, MultipartFileReceiver
+
+BODY = (
+    b"--XyZ\r\n"
+    b'Content-Disposition: form-data; name="note"\r\n\r\n'
+    b"ignored\r\n"
+    b"--XyZ\r\n"
+    b'Content-Disposition: form-data; name="file"; filename="products.csv"\r\n'
+    b"Content-Type: text/csv\r\n\r\n"
+    b"sku,name\r\nabc,\"multi\r\nline\"\r\n"
+    b"\r\n--XyZ--\r\n"
+)
+
+
+@pytest.mark.parametrize("size", [1, 2, 5, 17, len(BODY)])
+def test_receiver_extracts_file_for_any_chunk_size(size):
+    started, received = [], []
+    receiver = MultipartFileReceiver("multipart/form-data; boundary=XyZ", "file", started.append, received.append)
+    for position in range(0, len(BODY), size):
+        receiver.feed(BODY[position:position + size])
+    receiver.close()
+    assert started == ["products.csv"]
+    assert b"".join(received) == b"sku,name\r\nabc,\"multi\r\nline\"\r\n"
+
+
+def test_receiver_requires_multipart_and_file_field():
+    with pytest.raises(MultipartError):
+        MultipartFileReceiver("text/csv", "file", print, print)
+    receiver = MultipartFileReceiver("multipart/form-data; boundary=XyZ", "upload", print, print)
+    receiver.feed(BODY)
+    with pytest.raises(MultipartError):
+        receiver.close()
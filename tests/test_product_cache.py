@@ -0,0 +1,158 @@
+"""Tests for the product listing cache and catalogue version."""
+
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.schemas import ProductBatchOperation, ProductCreate, ProductUpdate
+from app.services import product_cache, product_service
+from app.services.product_cache import CatalogueVersion, PageCache, etag_matches, page_key
+from app.services.product_service import ProductService
+
+
+class FakeRedis:
+    """The Redis commands the catalogue version and page cache use, on one dict like a shared server."""
+
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, nx=False, px=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value if isinstance(value, bytes) else str(value).encode()
+        return True
+
+    def incr(self, key):
+        self.values[key] = str(int(self.values[key]) + 1).encode()
+
+    def pipeline(self):
+        redis, commands = self, []
+
+        class Pipeline:
+            def __getattr__(self, name):
+                return lambda *args, **kwargs: commands.append((name, args, kwargs))
+
+            def execute(self):
+                return [getattr(redis, name)(*args, **kwargs) for name, args, kwargs in commands]
+
+        return Pipeline()
+
+
+class FakeAsyncRedis:
+    def __init__(self, redis: FakeRedis):
+        self.redis = redis
+
+    async def get(self, key):
+        return self.redis.get(key)
+
+    async def set(self, key, value, nx=False, px=None):
+        return self.redis.set(key, value, nx=nx, px=px)
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    server = FakeRedis()
+    monkeypatch.setattr(product_cache, "get_redis", lambda: server)
+    monkeypatch.setattr(product_cache, "get_async_redis", lambda: FakeAsyncRedis(server))
+    return server
+
+
+@pytest.fixture
+def version(monkeypatch, redis):
+    # Counter in the (fake) shared Redis; no subscribers, so writes emit nothing.
+    monkeypatch.setattr(product_service, "has_subscribers", lambda event_type: False)
+    monkeypatch.setattr(product_service, "emit_product_event", lambda event, items: None)
+    version = CatalogueVersion()
+    monkeypatch.setattr(product_service, "catalogue_version", version)
+    return version
+
+
+def _current(version: CatalogueVersion) -> str:
+    return asyncio.run(version.current())
+
+
+def test_every_committed_write_bumps_the_version(version):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        service = ProductService(session)
+        seen = [_current(version)]
+        created = service.create_product(ProductCreate(sku="A1", name="A"))
+        seen.append(_current(version))
+        service.update_product(created.id, ProductUpdate(name="B"))
+        seen.append(_current(version))
+        service.apply_batch([ProductBatchOperation(op="create", sku="A2", data={"name": "C"})])
+        seen.append(_current(version))
+        service.delete_product(created.id)
+        seen.append(_current(version))
+        service.delete_products()
+        seen.append(_current(version))
+    assert len(set(seen)) == len(seen)
+
+    # Failed writes leave cached pages valid.
+    assert service.update_product(created.id, ProductUpdate(name="x")) is None
+    assert _current(version) == seen[-1]
+
+
+def test_a_write_in_another_process_invalidates_cached_pages(version, monkeypatch):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    cache = PageCache(ttl=60, max_entries=10)
+    params = (None, None, None, None, None, 1, 20, None, True)
+    cached = page_key(_current(version), params)
+    asyncio.run(cache.put(cached, b"[]"))
+
+    # A worker has its own CatalogueVersion (and LRU); only Redis is shared.
+    monkeypatch.setattr(product_service, "catalogue_version", CatalogueVersion())
+    with Session(engine) as session:
+        ProductService(session).create_product(ProductCreate(sku="A1", name="A"))
+
+    current = page_key(_current(version), params)
+    assert current != cached
+    assert asyncio.run(cache.get(current)) is None
+
+
+def test_without_redis_listings_are_not_versioned(monkeypatch):
+    # A per-process counter would miss other processes' writes, so there is no version at all.
+    monkeypatch.setattr(product_cache, "get_redis", lambda: None)
+    monkeypatch.setattr(product_cache, "get_async_redis", lambda: None)
+    version = CatalogueVersion()
+    version.bump()
+    assert _current(version) is None
+
+
+def test_page_cache_evicts_least_recently_used_and_expired_pages(monkeypatch):
+    monkeypatch.setattr(product_cache, "get_async_redis", lambda: None)
+    cache = PageCache(ttl=60, max_entries=2)
+
+    async def scenario():
+        await cache.put("1-a", b"a")
+        await cache.put("1-b", b"b")
+        assert await cache.get("1-a") == b"a"
+        await cache.put("1-c", b"c")
+        return [await cache.get(key) for key in ("1-a", "1-b", "1-c")]
+
+    assert asyncio.run(scenario()) == [b"a", None, b"c"]
+
+    cache.ttl = 0.01
+    asyncio.run(cache.put("2-a", b"a"))
+    time.sleep(0.02)
+    assert asyncio.run(cache.get("2-a")) is None
+
+
+def test_page_keys_and_etags():
+    params = ("sku1", None, None, True, None, 1, 20, None, True)
+    assert page_key("7", params) == page_key("7", params)
+    assert page_key("7", params) != page_key("8", params)
+    etag = f'"{page_key("7", params)}"'
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag) and not etag_matches(None, etag)
@@ -0,0 +1,54 @@
+"""Tests for the progress store backends."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.progress import ProgressRecord, ProgressStore
+
+
+def test_store_tracks_progress_through_completion():
+    store = ProgressStore()
+    assert store.get("task") is None
+    store.update_progress("task", 25, 100, "Processed 25 rows", "copy")
+    assert store.get("task") == {
+        "status": "processing",
+        "processed": 25,
+        "total": 100,
+        "percent": 25.0,
+        "message": "Processed 25 rows",
+        "error": None,
+        "phase": "copy",
+        "rejected": 0,
+        "inserted": None,
+        "updated": None,
+        "unchanged": None,
+    }
+    store.mark_complete("task", 100, 0, {"inserted": 60, "updated": 30, "unchanged": 10})
+    assert store.get("task")["status"] == "completed"
+    assert store.get("task")["unchanged"] == 10
+    assert store.get("task")["percent"] == 100.0
+    store.mark_error("task", 10, 100, "boom")
+    assert store.get("task")["error"] == "boom"
+
+
+def test_increment_is_atomic_across_threads():
+    store = ProgressStore()
+    store.update_progress("root", 0, 4000, "Importing 4 shards", "copy")
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda _: [store.increment("root", 1) for _ in range(1000)], range(4)))
+    assert store.get("root")["processed"] == 4000
+    assert store.get("root")["percent"] == 100.0
+
+
+def test_rejected_rows_count_towards_percent():
+    store = ProgressStore()
+    store.update_progress("task", 30, 100, "Processed 30 rows", rejected=10)
+    store.increment("task", 10, "rejected")
+    assert store.get("task")["rejected"] == 20
+    assert store.get("task")["percent"] == 50.0
+
+
+def test_record_round_trips_through_hash_fields():
+    record = ProgressRecord("completed", 9, 9, "Completed", inserted=5, updated=0, unchanged=4)
+    fields = {key.encode(): value.encode() for key, value in record.to_fields().items()}
+    assert "phase" not in record.to_fields() and "error" not in record.to_fields()
+    assert ProgressRecord.from_fields(fields).as_dict() == record.as_dict()
@@ -0,0 +1,46 @@
+"""Tests for reject files."""
+
+import csv
+
+import pytest
+
+from app.services.rejects import REJECT_COLUMNS, RejectWriter, reject_path
+
+ROW = ("", "name", "", "1", "true")
+
+
+def _records(path):
+    with open(path, newline="", encoding="utf-8") as fh:
+        return list(csv.reader(fh))
+
+
+def test_writer_creates_the_file_only_once_a_row_is_rejected(tmp_path):
+    path = tmp_path / "rejects.csv"
+    writer = RejectWriter(path)
+    assert writer.close() == 0 and not path.exists()
+
+
+def test_reopening_drops_rows_written_after_the_checkpoint(tmp_path):
+    path = tmp_path / "rejects.csv"
+    writer = RejectWriter(path)
+    writer(2, "missing sku", ROW)
+    checkpoint = (writer.count, writer.flush())
+    writer(5, "missing sku", ROW)  # part of a chunk that never committed
+    writer.close()
+
+    resumed = RejectWriter(path, *checkpoint)
+    resumed(5, "missing sku", ROW)
+    resumed(9, 'invalid price "x"', ROW)
+    resumed.close()
+    assert resumed.count == 3
+    assert _records(path) == [
+        list(REJECT_COLUMNS),
+        ["2", "missing sku", *ROW],
+        ["5", "missing sku", *ROW],
+        ["9", 'invalid price "x"', *ROW],
+    ]
+
+
+def test_reject_path_only_accepts_task_uuids():
+    with pytest.raises(LookupError):
+        reject_path("../../etc/passwd")
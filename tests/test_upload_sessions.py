@@ -0,0 +1,56 @@
+"""Tests for chunked upload sessions."""
+
+import asyncio
+import hashlib
+
+import pytest
+
+from app.services import upload_sessions
+
+DATA = b"sku,name\n" + b"".join(b"sku%d,name %d\n" % (index, index) for index in range(50))
+
+
+async def _body(data: bytes, size: int = 7):
+    for position in range(0, len(data), size):
+        yield data[position:position + size]
+
+
+def _send(root, manifest, number: int, data: bytes, sha256: str = None) -> None:
+    digest = sha256 or hashlib.sha256(data).hexdigest()
+    asyncio.run(upload_sessions.write_part(root, manifest, number, _body(data), digest))
+
+
+def test_parts_assemble_in_any_order(tmp_path):
+    manifest = upload_sessions.create_session(tmp_path, "../products.csv", len(DATA), 100)
+    parts = [DATA[position:position + 100] for position in range(0, len(DATA), 100)]
+    assert manifest["filename"] == "products.csv"
+    assert manifest["part_count"] == len(parts)
+
+    for number in reversed(range(2, len(parts) + 1)):
+        _send(tmp_path, manifest, number, parts[number - 1])
+    assert upload_sessions.missing_parts(tmp_path, manifest) == [1]
+    with pytest.raises(upload_sessions.UploadSessionError):
+        upload_sessions.complete_session(tmp_path, manifest["upload_id"])
+
+    _send(tmp_path, manifest, 1, parts[0])
+    _, path = upload_sessions.complete_session(tmp_path, manifest["upload_id"])
+    assert path.read_bytes() == DATA
+    with pytest.raises(upload_sessions.UploadSessionNotFound):
+        upload_sessions.complete_session(tmp_path, manifest["upload_id"])
+
+
+def test_bad_parts_are_not_recorded(tmp_path):
+    manifest = upload_sessions.create_session(tmp_path, "products.csv", len(DATA), 100)
+    with pytest.raises(upload_sessions.UploadSessionError):
+        _send(tmp_path, manifest, 1, DATA[:100], sha256="0" * 64)
+    with pytest.raises(upload_sessions.UploadSessionError):
+        _send(tmp_path, manifest, 1, DATA[:99])
+    with pytest.raises(upload_sessions.UploadSessionError):
+        _send(tmp_path, manifest, manifest["part_count"] + 1, b"x")
+    assert 1 in upload_sessions.missing_parts(tmp_path, manifest)
+
+
+def test_unknown_or_malformed_ids_are_not_found(tmp_path):
+    for upload_id in ("0" * 32, "../etc", "not-a-uuid"):
+        with pytest.raises(upload_sessions.UploadSessionNotFound):
+            upload_sessions.load_session(tmp_path, upload_id)
@@ -0,0 +1,205 @@
+"""Tests for webhook event fan-out, the circuit breaker and the retry schedule."""
+
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.config import get_settings
+from app.database import Base
+from app.models import Webhook
+from app.services import events, webhook_delivery
+from app.services.events import PRODUCT_DELETED, PRODUCT_UPDATED, SubscriptionCache
+from app.services.webhook_delivery import CircuitBreaker, RedisCircuitBreaker
+from app.tasks import webhook_sender
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    settings = get_settings()
+
+    def override(**values):
+        for name, value in values.items():
+            monkeypatch.setattr(settings, name, value)
+
+    return override
+
+
+def test_an_event_fans_out_to_every_matching_webhook(tmp_path, monkeypatch, settings):
+    engine = create_engine(f"sqlite:///{tmp_path / 'webhooks.db'}")
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(engine)
+    with session_factory() as session:
+        session.add_all(
+            [
+                Webhook(url="https://a.example/hook", event_type=PRODUCT_UPDATED),
+                Webhook(url="https://b.example/hook", event_type="*"),
+                Webhook(url="https://c.example/hook", event_type="product.created"),
+                Webhook(url="https://d.example/hook", event_type=PRODUCT_UPDATED, active=False),
+            ]
+        )
+        session.commit()
+    tasks = []
+    monkeypatch.setattr(events, "SessionLocal", session_factory)
+    monkeypatch.setattr(events, "subscriptions", SubscriptionCache(ttl=60))
+    monkeypatch.setattr(events, "deliver_webhooks_task", SimpleNamespace(delay=tasks.append))
+    settings(webhook_batch_size=2, webhook_deliveries_per_task=3)
+
+    products = [{"id": i, "sku": f"sku{i}"} for i in range(3)]
+    assert events.emit_product_event(PRODUCT_UPDATED, products) == 4
+
+    # Two payloads (batches of 2 products) to each of the two subscribers, three deliveries per task.
+    assert [len(task) for task in tasks] == [3, 1]
+    deliveries = [delivery for task in tasks for delivery in task]
+    assert sorted({d["url"] for d in deliveries}) == ["https://a.example/hook", "https://b.example/hook"]
+    for url in ("https://a.example/hook", "https://b.example/hook"):
+        payloads = [d["payload"] for d in deliveries if d["url"] == url]
+        assert [p["products"] for p in payloads] == [products[:2], products[2:]]
+        assert {p["event"] for p in payloads} == {PRODUCT_UPDATED}
+
+    # The wildcard webhook hears every event; nobody hears events without subscribers.
+    assert events.has_subscribers(PRODUCT_DELETED)
+    monkeypatch.setattr(events, "subscriptions", SubscriptionCache(ttl=60))
+    with session_factory() as session:
+        session.query(Webhook).filter(Webhook.event_type == "*").delete()
+        session.commit()
+    assert not events.has_subscribers(PRODUCT_DELETED)
+    assert events.emit_product_event(PRODUCT_DELETED, products) == 0
+
+
+class FakeRedis:
+    """The Redis commands ``RedisCircuitBreaker`` uses, without expiry."""
+
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, nx=False, px=None, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = str(value).encode()
+        return True
+
+    def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+    def incr(self, key):
+        self.values[key] = str(int(self.values.get(key, 0)) + 1).encode()
+        return int(self.values[key])
+
+    def expire(self, key, seconds):
+        return True
+
+    def pipeline(self):
+        redis, commands = self, []
+
+        class Pipeline:
+            def __getattr__(self, name):
+                return lambda *args: commands.append((name, args))
+
+            def execute(self):
+                return [getattr(redis, name)(*args) for name, args in commands]
+
+        return Pipeline()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1_000.0)
+    monkeypatch.setattr(webhook_delivery, "time", SimpleNamespace(time=lambda: now.value))
+    return now
+
+
+@pytest.mark.parametrize(
+    "make_breaker",
+    [
+        lambda: CircuitBreaker(threshold=3, cooldown=60),
+        lambda: RedisCircuitBreaker(FakeRedis(), threshold=3, cooldown=60),
+    ],
+    ids=["memory", "redis"],
+)
+def test_breaker_opens_after_consecutive_failures_and_closes_after_a_probe(make_breaker, clock):
+    breaker = make_breaker()
+    breaker.record(1, ok=False)
+    breaker.record(1, ok=False)
+    breaker.record(1, ok=True)  # a success resets the streak
+    breaker.record(1, ok=False)
+    breaker.record(1, ok=False)
+    assert breaker.allow(1) and breaker.retry_after(1) == 0
+
+    breaker.record(1, ok=False)
+    assert not breaker.allow(1)
+    assert breaker.retry_after(1) == 60
+    assert breaker.allow(2)  # per webhook
+
+    # After the cooldown exactly one probe gets through; its failure reopens the circuit.
+    clock.value += 61
+    assert breaker.allow(1)
+    assert not breaker.allow(1)
+    breaker.record(1, ok=False)
+    assert not breaker.allow(1)
+    assert breaker.retry_after(1) == 60
+
+    clock.value += 61
+    assert breaker.allow(1)
+    breaker.record(1, ok=True)
+    assert breaker.allow(1) and breaker.allow(1)
+    assert breaker.retry_after(1) == 0
+
+
+def test_retry_backoff_doubles_up_to_the_cap_with_jitter(monkeypatch, settings):
+    settings(webhook_retry_base_seconds=2, webhook_retry_max_seconds=60)
+    monkeypatch.setattr(webhook_sender.random, "uniform", lambda low, high: (low, high))
+    assert [webhook_sender._backoff(attempt) for attempt in range(1, 8)] == [
+        (1, 2),
+        (2, 4),
+        (4, 8),
+        (8, 16),
+        (16, 32),
+        (30, 60),
+        (30, 60),
+    ]
+
+
+def test_failed_deliveries_are_retried_with_backoff_until_the_circuit_opens(monkeypatch, settings, clock):
+    settings(webhook_retry_base_seconds=2, webhook_retry_max_seconds=60, webhook_max_attempts=5)
+    breaker = CircuitBreaker(threshold=2, cooldown=60)
+    logged, scheduled = [], []
+    monkeypatch.setattr(webhook_sender, "get_circuit_breaker", lambda: breaker)
+    monkeypatch.setattr(webhook_sender, "_record", logged.extend)
+    monkeypatch.setattr(webhook_sender.random, "uniform", lambda low, high: high)
+    monkeypatch.setattr(
+        webhook_sender.deliver_webhooks_task,
+        "apply_async",
+        lambda args, countdown: scheduled.append((args[0], countdown)),
+    )
+    engine = SimpleNamespace(
+        deliver=lambda deliveries: [
+            {"webhook_id": d["webhook_id"], "status_code": 503, "elapsed_ms": 1.0, "error": None} for d in deliveries
+        ]
+    )
+    monkeypatch.setattr(webhook_sender, "get_delivery_engine", lambda: engine)
+    delivery = {"webhook_id": 7, "url": "https://a.example/hook", "payload": {"event": PRODUCT_UPDATED}}
+
+    webhook_sender._deliver([delivery])
+    assert [(row["attempt"], row["status"]) for row in logged] == [(1, "retrying")]
+    [(pending, countdown)] = scheduled
+    assert (pending[0]["attempt"], countdown) == (2, 2)
+
+    # The second failure opens the circuit: the retry waits for the cooldown, not the 4 s backoff.
+    scheduled.clear()
+    webhook_sender._deliver(pending)
+    assert logged[-1]["status"] == "retrying"
+    [(pending, countdown)] = scheduled
+    assert (pending[0]["attempt"], countdown) == (3, 60)
+
+    # While it is open, deliveries are skipped without a request and rescheduled.
+    scheduled.clear()
+    webhook_sender._deliver(pending)
+    assert (logged[-1]["status"], logged[-1]["error"]) == ("skipped", "circuit open")
+    [(pending, countdown)] = scheduled
+    assert pending[0]["attempt"] == 4